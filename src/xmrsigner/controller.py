@@ -16,7 +16,7 @@ from xmrsigner.helpers.wallet import MoneroWalletRPCManager
 from xmrsigner.helpers.monero import TxDescription
 from xmrsigner.models.seed import Seed
 from xmrsigner.models.seed_storage import SeedJar
-from xmrsigner.models.settings import Settings
+from xmrsigner.models.settings import Settings, SettingsConstants
 from xmrsigner.models.singleton import Singleton
 from xmrsigner.views.view import RemoveMicroSDWarningView
 
@@ -146,6 +146,10 @@ class Controller(Singleton):
         controller.microsd = MicroSD.get_instance()
         controller.microsd.start_detection()
 
+        if not disable_hardware and controller.settings.get_value(SettingsConstants.SETTING__QR_DECODER) == SettingsConstants.QR_DECODER__AUTO:
+            from xmrsigner.helpers.scan.calibration import DecoderCalibrationThread
+            DecoderCalibrationThread().start()
+
         # Store one working incomming data in memory
         controller.outputs = None
         controller.transaction = None
@@ -1,20 +1,28 @@
-from time import sleep
 
 from dataclasses import dataclass
+from logging import getLogger
+from os import path
+from queue import Empty
 from typing import Tuple
 from PIL import Image, ImageDraw
 
 from xmrsigner.gui import renderer
 from xmrsigner.hardware.buttons import HardwareButtonsConstants
 from xmrsigner.hardware.camera import Camera
-from xmrsigner.models.decode_qr import DecodeQR, DecodeQRStatus
-from xmrsigner.models.threads import BaseThread
-from xmrsigner.helpers.cake_wallet_qr_scanner import LiveQRScanner
+from xmrsigner.models.decode_qr import DecodeQR
+from xmrsigner.models.threads import BaseThread, RateMeter
+from xmrsigner.helpers.live_qr_scanner import LiveQRScanner, LiveQRScanEngine
+from xmrsigner.helpers.scan.recorder import ScanRecorder
+from xmrsigner.helpers.scan.telemetry import ScanTelemetry
+from xmrsigner.models.settings import Settings
 
 from xmrsigner.gui.screens.screen import BaseScreen, ButtonListScreen
 from xmrsigner.gui.components import GUIConstants, Fonts, TextArea
 
 
+logger = getLogger(__name__)
+
+
 @dataclass
 class ScanScreen(BaseScreen):
     """
@@ -38,6 +46,12 @@ class ScanScreen(BaseScreen):
     here (e.g. higher res w/no performance impact? Lower res w/same decoding but faster
     performance? etc).
 
+    The decoder and the live preview each wait for new camera frames on their own
+    thread and only share the latest frame and scan progress, so a slow decode does
+    not freeze the preview and a slow display push does not hold up decoding. Each
+    can be capped with its own rate target (`decode_fps`, `preview_fps`; None runs
+    at the camera's pace) and measures the rate it achieves.
+
     Note: This is quite a lot of important tasks for a Screen to be managing; much of
     this should probably be refactored into the Controller.
     """
@@ -46,6 +60,12 @@ class ScanScreen(BaseScreen):
     resolution: Tuple[int,int] = (480, 480)
     framerate: int = 10  # Increased framerate for better QR scanning experience
     render_rect: Tuple[int,int,int,int] = None
+    decode_fps: float = None
+    preview_fps: float = None
+
+    # Longest wait for a new camera frame before the threads check whether they
+    # should stop or the user pressed a button.
+    FRAME_WAIT_TIMEOUT = 0.1
 
     def __post_init__(self):
         from xmrsigner.hardware.camera import Camera
@@ -55,26 +75,43 @@ class ScanScreen(BaseScreen):
         self.camera = Camera.get_instance()
         self.camera.start_video_stream_mode(resolution=self.resolution, framerate=self.framerate, format="rgb")
         
-        # Initialize the live QR scanner following Cake Wallet approach
-        self.live_qr_scanner = LiveQRScanner()
-        
-        self.threads.append(ScanScreen.LivePreviewThread(
+        # The one decoder of the scan: decodes each camera frame once on its own
+        # thread and publishes the progress to the overlay and to _run()
+        self.live_qr_scanner = LiveQRScanner(decoder=self.decoder)
+        # Debug builds record the scanned frames for offline replay and show the
+        # scan telemetry over the preview
+        debug = Settings.get_instance().debug
+        self.recorder = ScanRecorder() if debug else None
+        if self.recorder:
+            self.threads.append(self.recorder)
+        self.scan_engine = LiveQRScanEngine(
+            self.live_qr_scanner,
             camera=self.camera,
-            decoder=self.decoder,
-            live_qr_scanner=self.live_qr_scanner,
+            max_fps=self.decode_fps,
+            frame_wait_timeout=ScanScreen.FRAME_WAIT_TIMEOUT,
+            recorder=self.recorder)
+        self.threads.append(self.scan_engine)
+        self.scan_updates = self.scan_engine.bus.subscribe()
+
+        self.preview_thread = ScanScreen.LivePreviewThread(
+            camera=self.camera,
+            scan_engine=self.scan_engine,
             renderer=self.renderer,
             instructions_text=self.instructions_text,
             render_rect=self.render_rect,
-        ))
+            max_fps=self.preview_fps,
+            telemetry=self.scan_engine.telemetry if debug else None,
+        )
+        self.threads.append(self.preview_thread)
 
 
     class LivePreviewThread(BaseThread):
 
-        def __init__(self, camera: Camera, decoder: DecodeQR, live_qr_scanner: LiveQRScanner, 
-                     renderer: renderer.Renderer, instructions_text: str, render_rect: Tuple[int,int,int,int]):
+        def __init__(self, camera: Camera, scan_engine: LiveQRScanEngine,
+                     renderer: renderer.Renderer, instructions_text: str, render_rect: Tuple[int,int,int,int],
+                     max_fps: float = None, telemetry: ScanTelemetry = None):
             self.camera = camera
-            self.decoder = decoder
-            self.live_qr_scanner = live_qr_scanner
+            self.scan_engine = scan_engine
             self.renderer = renderer
             self.instructions_text = instructions_text
             if render_rect:
@@ -83,30 +120,43 @@ class ScanScreen(BaseScreen):
                 self.render_rect = (0, 0, self.renderer.canvas_width, self.renderer.canvas_height)
             self.render_width = self.render_rect[2] - self.render_rect[0]
             self.render_height = self.render_rect[3] - self.render_rect[1]
+            self.max_fps = max_fps
+            # Drawn over the preview when set
+            self.telemetry = telemetry
+            self.fps = RateMeter()
+            # Camera frames captured while the previous one was still being shown
+            self.frames_dropped = 0
+            # Frames left out to stay within max_fps
+            self.frames_skipped = 0
             super().__init__()
 
         def run(self):
             from timeit import default_timer as timer
             instructions_font = Fonts.get_font(GUIConstants.BODY_FONT_NAME, GUIConstants.BUTTON_FONT_SIZE)
+            telemetry_font = Fonts.get_font(GUIConstants.FIXED_WIDTH_FONT_NAME, GUIConstants.LABEL_FONT_SIZE)
             print("DEBUG: LivePreviewThread started")
-            frame_count = 0
+            last_seq = 0
+            last_shown = None
             while self.keep_running:
+                if self.camera._video_stream is None:
+                    break
                 start = timer()
-                frame = self.camera.read_video_stream(as_image=True)
-                if frame is not None:
-                    frame_count += 1
-                    print(f"DEBUG: Frame {frame_count} captured - size: {frame.size}, mode: {frame.mode}")
-                    
-                    # Scan the frame with our Cake Wallet-style live QR scanner for progress tracking
-                    is_complete, progress, status = self.live_qr_scanner.scan_frame(frame)
+                # Wakes up as soon as the camera captured a new frame
+                video_frame = self.camera.read_next_video_frame(last_seq, timeout=ScanScreen.FRAME_WAIT_TIMEOUT, as_image=True)
+                if video_frame is not None:
+                    if last_seq:
+                        self.frames_dropped += video_frame.seq - last_seq - 1
+                    last_seq = video_frame.seq
+                    if self.max_fps and last_shown is not None and start - last_shown < 1 / self.max_fps:
+                        self.frames_skipped += 1
+                        continue
+                    last_shown = start
+                    frame = video_frame.image
+                    print(f"DEBUG: Frame {video_frame.seq} captured - size: {frame.size}, mode: {frame.mode}")
                     
-                    # Occasionally save a frame for debugging
-                    if frame_count % 30 == 0:  # Save every 30th frame
-                        try:
-                            frame.save(f"/tmp/debug_frame_{frame_count}.png")
-                            print(f"DEBUG: Saved debug frame {frame_count} to /tmp/debug_frame_{frame_count}.png")
-                        except Exception as e:
-                            print(f"DEBUG: Failed to save debug frame: {e}")
+                    # The scan engine decodes frames on its own; show its latest progress
+                    scan_progress = self.scan_engine.progress
+                    is_complete, progress, status = scan_progress.is_complete, scan_progress.progress, scan_progress.message
                     
                     # Determine what text to display based on scanning progress
                     scan_text = self.instructions_text
@@ -146,10 +196,16 @@ class ScanScreen(BaseScreen):
                                      fill=GUIConstants.BODY_FONT_COLOR,
                                      font=instructions_font,
                                      anchor="ms")
+                        if self.telemetry:
+                            draw.multiline_text(
+                                xy=(GUIConstants.EDGE_PADDING, GUIConstants.EDGE_PADDING),
+                                text="\n".join(self.telemetry.overlay_lines()),
+                                fill=GUIConstants.BODY_FONT_COLOR,
+                                font=telemetry_font,
+                                stroke_width=1,
+                                stroke_fill="black")
                         self.renderer.show_image(frame, show_direct=True)
-                sleep(0.01) # Reduced sleep for faster QR scanning
-                if self.camera._video_stream is None:
-                    break
+                    self.fps.tick()
 
 
     def _run(self):
@@ -160,16 +216,52 @@ class ScanScreen(BaseScreen):
         """
         print("DEBUG: Starting scan screen loop")
         while True:
-            frame = self.camera.read_video_stream()
-            if frame is not None:
-                print("DEBUG: Frame captured, processing...")
-                status = self.decoder.add_image(frame)
-                print(f"DEBUG: Decoder status: {status}")
-                if status in (DecodeQRStatus.COMPLETE, DecodeQRStatus.INVALID):
-                    print(f"DEBUG: Scan completed with status: {status}")
-                    self.camera.stop_video_stream_mode()
-                    break
-                if self.hw_inputs.check_for_low(HardwareButtonsConstants.KEY_RIGHT) or self.hw_inputs.check_for_low(HardwareButtonsConstants.KEY_LEFT):
-                    print("DEBUG: User cancelled scan")
-                    self.camera.stop_video_stream_mode()
+            try:
+                progress = self.scan_updates.get(timeout=ScanScreen.FRAME_WAIT_TIMEOUT)
+            except Empty:
+                progress = None
+            if progress is not None:
+                print(f"DEBUG: Decoder status: {progress.status}")
+                if progress.is_final:
+                    print(f"DEBUG: Scan completed with status: {progress.status}")
+                    self._stop_scan()
+                    if progress.error is not None:
+                        raise progress.error
                     break
+            if self.hw_inputs.check_for_low(HardwareButtonsConstants.KEY_RIGHT) or self.hw_inputs.check_for_low(HardwareButtonsConstants.KEY_LEFT):
+                print("DEBUG: User cancelled scan")
+                self._stop_scan()
+                break
+        logger.debug('frame rates: %s', self.get_frame_rates())
+        logger.debug('scan telemetry: %s', self.get_telemetry())
+        if self.recorder:
+            self.scan_engine.telemetry.export(
+                path.join(self.recorder.directory, f"scan-{self.recorder.session}-telemetry.json"))
+
+    def _stop_scan(self):
+        # The view reads the decoder once we return; let the engine finish the
+        # frame it is decoding (it closes the decoder on exit)
+        self.scan_engine.stop()
+        self.scan_engine.join()
+        self.camera.stop_video_stream_mode()
+
+    def get_frame_rates(self) -> dict:
+        """
+        Frames per second decoded and shown over the last seconds of the scan, and
+        the frames each worker dropped or skipped.
+        """
+        return {
+            'decode_fps': self.scan_engine.fps.rate(),
+            'decode_frames_dropped': self.scan_engine.frames_dropped,
+            'decode_frames_skipped': self.scan_engine.frames_skipped,
+            'preview_fps': self.preview_thread.fps.rate(),
+            'preview_frames_dropped': self.preview_thread.frames_dropped,
+            'preview_frames_skipped': self.preview_thread.frames_skipped,
+        }
+
+    def get_telemetry(self) -> dict:
+        """
+        Fragments, redundancy, frames without a QR and latency of the scan so far,
+        and what limited it (see ScanTelemetry).
+        """
+        return self.scan_engine.telemetry.snapshot()
@@ -1,7 +1,8 @@
 from numpy import array as NumpyArray
 from PIL.Image import Image
+from xmrsigner.hardware.frames import VideoFrame
 from xmrsigner.hardware.interfaces import CameraInterface
-from typing import Tuple, Union
+from typing import Optional, Tuple, Union
 try:
     import picamera2
     from xmrsigner.hardware.picamera2.camera import Camera as CameraImplementation
@@ -30,6 +31,14 @@ class Camera(CameraInterface):
     def read_video_stream(self, as_image: bool = False) -> Union[Image, NumpyArray]:
         pass
 
+    def read_next_video_frame(
+        self,
+        after_seq: int = 0,
+        timeout: Optional[float] = None,
+        as_image: bool = False
+    ) -> Optional[VideoFrame]:
+        pass
+
     def stop_video_stream_mode(self) -> None:
         pass
 
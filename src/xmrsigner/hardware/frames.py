@@ -0,0 +1,70 @@
+from threading import Condition
+from time import monotonic
+from typing import Any, NamedTuple, Optional
+
+
+class VideoFrame(NamedTuple):
+    """
+    A captured video frame, numbered in capture order; `timestamp` is the
+    `time.monotonic()` at capture.
+    """
+    seq: int
+    timestamp: float
+    image: Any
+
+    @property
+    def age(self) -> float:
+        """
+        Seconds since the frame was captured.
+        """
+        return monotonic() - self.timestamp
+
+
+class FrameBuffer:
+    """
+    Holds the most recent frame of a video stream.
+
+    The capture thread `put()`s every frame; readers either take the latest
+    frame or block in `read_next()` until one newer than the last they
+    processed exists, so no frame is handled twice and none waits for a poll.
+    The gap in `seq` between two frames a reader got is the number of frames
+    it dropped.
+    """
+
+    def __init__(self):
+        self._ready = Condition()
+        self.latest: Optional[VideoFrame] = None
+        self.seq = 0
+        self.closed = False
+
+    def put(self, image: Any, timestamp: Optional[float] = None) -> VideoFrame:
+        with self._ready:
+            self.seq += 1
+            self.latest = VideoFrame(self.seq, monotonic() if timestamp is None else timestamp, image)
+            self._ready.notify_all()
+            return self.latest
+
+    def read(self) -> Optional[VideoFrame]:
+        return self.latest
+
+    def read_next(self, after_seq: int = 0, timeout: Optional[float] = None) -> Optional[VideoFrame]:
+        """
+        Returns the latest frame once its `seq` is greater than `after_seq`,
+        waiting up to `timeout` seconds (forever if None) for it to be captured.
+        Returns None on timeout or when the stream was closed.
+        """
+        with self._ready:
+            if not self._ready.wait_for(lambda: self.seq > after_seq or self.closed, timeout):
+                return None
+            if self.seq <= after_seq:
+                return None
+            return self.latest
+
+    def close(self) -> None:
+        """
+        Wakes up all readers; `read_next()` returns None from now on unless a
+        newer frame is already there.
+        """
+        with self._ready:
+            self.closed = True
+            self._ready.notify_all()
@@ -1,7 +1,8 @@
 from PIL.Image import Image
 from numpy import array as NumpyArray
-from typing import Tuple, Union
+from typing import Optional, Tuple, Union
 
+from xmrsigner.hardware.frames import VideoFrame
 from xmrsigner.models.singleton import Singleton
 
 
@@ -22,6 +23,14 @@ class CameraInterface(Singleton):
     def read_video_stream(self, as_image: bool = False) -> Union[Image, NumpyArray]:
         pass
 
+    def read_next_video_frame(
+        self,
+        after_seq: int = 0,
+        timeout: Optional[float] = None,
+        as_image: bool = False
+    ) -> Optional[VideoFrame]:
+        pass
+
     def stop_video_stream_mode(self) -> None:
         pass
 
@@ -52,5 +61,11 @@ class PiVideoStreamInterface:
     def read(self) -> NumpyArray:
         pass
 
+    def read_frame(self) -> Optional[VideoFrame]:
+        pass
+
+    def read_next(self, after_seq: int = 0, timeout: Optional[float] = None) -> Optional[VideoFrame]:
+        pass
+
     def stop(self) -> None:
         pass
@@ -4,10 +4,11 @@ from picamera import PiCamera
 from PIL.Image import Image
 from PIL.Image import fromarray as image_from_array
 from PIL.Image import open as image_open
+from xmrsigner.hardware.frames import VideoFrame
 from xmrsigner.hardware.interfaces import CameraInterface
 from xmrsigner.hardware.picamera.pivideostream import PiVideoStream
 from xmrsigner.models.settings import Settings, SettingsConstants
-from typing import Tuple, Union
+from typing import Optional, Tuple, Union
 
 
 class Camera(CameraInterface):
@@ -45,6 +46,19 @@ class Camera(CameraInterface):
             return None
         return image_from_array(frame.astype('uint8'), 'RGB').rotate(90 + self._camera_rotation)
 
+    def read_next_video_frame(
+        self,
+        after_seq: int = 0,
+        timeout: Optional[float] = None,
+        as_image: bool = False
+    ) -> Optional[VideoFrame]:
+        if not self._video_stream:
+            raise Exception("Must call start_video_stream first.")
+        frame = self._video_stream.read_next(after_seq, timeout)
+        if frame is None or not as_image:
+            return frame
+        return frame._replace(image=image_from_array(frame.image.astype('uint8'), 'RGB').rotate(90 + self._camera_rotation))
+
     def stop_video_stream_mode(self) -> None:
         if self._video_stream is not None:
             self._video_stream.stop()
@@ -2,8 +2,9 @@ from picamera.array import PiRGBArray
 from picamera import PiCamera
 from threading import Thread
 from time import sleep
-from typing import Tuple
+from typing import Optional, Tuple
 
+from xmrsigner.hardware.frames import FrameBuffer, VideoFrame
 from xmrsigner.hardware.interfaces import PiVideoStreamInterface
 
 
@@ -27,7 +28,7 @@ class PiVideoStream(PiVideoStreamInterface):
 
         # initialize the frame and the variable used to indicate
         # if the thread should be stopped
-        self.frame = None
+        self.frames = FrameBuffer()
         self.should_stop = False
         self.is_stopped = True
 
@@ -43,7 +44,7 @@ class PiVideoStream(PiVideoStreamInterface):
         for f in self.stream:
             # grab the frame from the stream and clear the stream in
             # preparation for the next frame
-            self.frame = f.array
+            self.frames.put(f.array)
             self.rawCapture.truncate(0)
 
             # if the thread indicator variable is set, stop the thread
@@ -59,11 +60,20 @@ class PiVideoStream(PiVideoStreamInterface):
 
     def read(self):
         # return the frame most recently read
-        return self.frame
+        frame = self.frames.read()
+        return frame.image if frame else None
+
+    def read_frame(self) -> Optional[VideoFrame]:
+        return self.frames.read()
+
+    def read_next(self, after_seq: int = 0, timeout: Optional[float] = None) -> Optional[VideoFrame]:
+        # block until a frame newer than `after_seq` was captured
+        return self.frames.read_next(after_seq, timeout)
 
     def stop(self) -> None:
         # indicate that the thread should be stopped
         self.should_stop = True
+        self.frames.close()
 
         # Block in this thread until stopped
         while not self.is_stopped:
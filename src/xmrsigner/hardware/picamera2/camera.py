@@ -1,7 +1,8 @@
 from picamera2 import Picamera2
 from PIL.Image import Image
-from typing import Tuple, Union
+from typing import Optional, Tuple, Union
 from numpy import array as NumpyArray
+from xmrsigner.hardware.frames import VideoFrame
 from xmrsigner.hardware.interfaces import CameraInterface
 from xmrsigner.models.settings import Settings, SettingsConstants
 from xmrsigner.hardware.picamera2.pivideostream import PiVideoStream2
@@ -40,6 +41,19 @@ class Camera(CameraInterface):
             return None
         return Image.fromarray(frame.astype('uint8'), 'RGB').rotate(90 + self._camera_rotation)
 
+    def read_next_video_frame(
+        self,
+        after_seq: int = 0,
+        timeout: Optional[float] = None,
+        as_image: bool = False
+    ) -> Optional[VideoFrame]:
+        if not self._video_stream:
+            raise Exception("Must call start_video_stream first.")
+        frame = self._video_stream.read_next(after_seq, timeout)
+        if frame is None or not as_image:
+            return frame
+        return frame._replace(image=Image.fromarray(frame.image.astype('uint8'), 'RGB').rotate(90 + self._camera_rotation))
+
     def stop_video_stream_mode(self) -> None:
         if self._video_stream is not None:
             self._video_stream.stop()
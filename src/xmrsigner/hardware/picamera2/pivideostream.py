@@ -1,6 +1,8 @@
 from picamera2 import Picamera2, MappedArray
 from threading import Thread
-from time import sleep
+from time import monotonic, sleep
+from typing import Optional
+from xmrsigner.hardware.frames import FrameBuffer, VideoFrame
 from xmrsigner.hardware.interfaces import CameraInterface
 
 class PiVideoStream2:
@@ -9,7 +11,7 @@ class PiVideoStream2:
         self.camera = Picamera2()
         video_config = self.camera.create_video_configuration(main={"size": resolution, "format": format})
         self.camera.configure(video_config)
-        self.frame = None
+        self.frames = FrameBuffer()
         self.should_stop = False
         self.is_stopped = True
 
@@ -23,7 +25,8 @@ class PiVideoStream2:
     def update(self):
         while not self.should_stop:
             with MappedArray(self.camera) as m:
-                self.frame = m.array.copy()
+                captured = monotonic()
+                self.frames.put(m.array.copy(), captured)
             sleep(1 / self.camera.framerate)
             if self.should_stop:
                 self.camera.stop()
@@ -31,9 +34,17 @@ class PiVideoStream2:
                 self.is_stopped = True
 
     def read(self):
-        return self.frame
+        frame = self.frames.read()
+        return frame.image if frame else None
+
+    def read_frame(self) -> Optional[VideoFrame]:
+        return self.frames.read()
+
+    def read_next(self, after_seq: int = 0, timeout: Optional[float] = None) -> Optional[VideoFrame]:
+        return self.frames.read_next(after_seq, timeout)
 
     def stop(self):
         self.should_stop = True
+        self.frames.close()
         while not self.is_stopped:
             sleep(0.01)
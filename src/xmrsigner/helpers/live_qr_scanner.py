@@ -1,204 +1,313 @@
-import re
-import time
-from collections import OrderedDict
-from typing import List, Tuple, Optional, Dict, Any
-from PIL import Image
+from dataclasses import dataclass
+from logging import getLogger
+from queue import Full, Queue
+from threading import Condition, Lock
+from time import monotonic
+from typing import Any, Callable, List, Optional
 
+from xmrsigner.hardware.frames import VideoFrame
+from xmrsigner.helpers.scan.recorder import ScanRecorder
+from xmrsigner.helpers.scan.telemetry import ScanTelemetry
+from xmrsigner.models.base_decoder import DecodeQRStatus
 from xmrsigner.models.decode_qr import DecodeQR
 from xmrsigner.models.qr_type import QRType
-from xmrsigner.hardware.camera import Camera
-from xmrsigner.models.threads import BaseThread
-from xmrsigner.models.base_decoder import DecodeQRStatus
+from xmrsigner.models.settings import SettingsConstants
+from xmrsigner.models.threads import BaseThread, RateMeter
+
+
+logger = getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ScanProgress:
+    """
+    State of a live scan after a frame was decoded.
+    """
+    is_complete: bool = False
+    progress: float = 0.0
+    message: str = "Scanning..."
+    status: Optional[DecodeQRStatus] = None
+    frames: int = 0
+    error: Optional[Exception] = None
+
+    @property
+    def is_invalid(self) -> bool:
+        return self.status == DecodeQRStatus.INVALID
+
+    @property
+    def is_final(self) -> bool:
+        """
+        The scan is over: complete, not a recognized QR code, or decoding failed.
+        """
+        return self.is_complete or self.is_invalid or self.error is not None
+
+
+class ScanProgressBus:
+    """
+    Hands every ScanProgress of a scan to all its subscribers: callbacks are
+    called on the decoding thread, queues are filled for other threads to
+    consume. `latest` always holds the most recent update.
+    """
+
+    def __init__(self):
+        self.latest = ScanProgress()
+        self._callbacks: List[Callable[[ScanProgress], None]] = []
+        self._queues: List[Queue] = []
+        self._lock = Lock()
+
+    def subscribe(self, callback: Optional[Callable[[ScanProgress], None]] = None, queue: Optional[Queue] = None) -> Optional[Queue]:
+        """
+        Registers `callback` and/or `queue`; without either, creates and returns a
+        new queue.
+        """
+        if callback is None and queue is None:
+            queue = Queue()
+        with self._lock:
+            if callback is not None:
+                self._callbacks.append(callback)
+            if queue is not None:
+                self._queues.append(queue)
+        return queue
+
+    def publish(self, progress: ScanProgress) -> None:
+        self.latest = progress
+        with self._lock:
+            callbacks, queues = list(self._callbacks), list(self._queues)
+        for callback in callbacks:
+            callback(progress)
+        for queue in queues:
+            try:
+                queue.put_nowait(progress)
+            except Full:
+                pass
+
 
 class LiveQRScanner:
     """
-    Implements a live QR scanner that can handle animated QR codes (UR format) with progress tracking,
-    similar to how Cake Wallet handles fast QR changes.
+    Feeds camera frames to a DecodeQR and describes the progress of the scan,
+    including the fragments of animated (UR) QR codes received so far.
+
+    Frames are decoded as they are given; pacing is up to the caller (see
+    LiveQRScanEngine), there is no cooldown between frames.
     """
-    
-    def __init__(self, wordlist_language_code: str = "english"):
+
+    def __init__(
+            self,
+            wordlist_language_code: str = SettingsConstants.WORDLIST_LANGUAGE__ENGLISH,
+            decoder: Optional[DecodeQR] = None):
         self.wordlist_language_code = wordlist_language_code
-        self.decoder = DecodeQR(wordlist_language_code=wordlist_language_code)
-        self.ur_parts = OrderedDict()  # Store unique UR parts by their index
-        self.total_parts = None
-        self.bytes_tag = None
-        self.progress = 0.0
-        self.is_complete = False
-        self.last_scan_time = 0
-        self.scan_cooldown = 0.1  # Minimum time between scans (100ms)
-        self.last_ur_data = None
-        
-    def scan_frame(self, frame: Image) -> Tuple[bool, float, str]:
+        self.decoder = decoder or DecodeQR(wordlist_language_code=wordlist_language_code)
+        self.frames = 0
+        self.last_progress = ScanProgress()
+
+    @property
+    def is_complete(self) -> bool:
+        return self.decoder.is_complete
+
+    def scan_frame(self, frame: Any) -> ScanProgress:
         """
-        Scan a single frame for QR codes.
-        
-        Returns:
-            Tuple[bool, float, str]: (is_complete, progress, status_message)
+        Decodes one frame (PIL image or numpy array) and returns the scan progress.
         """
-        current_time = time.time()
-        if current_time - self.last_scan_time < self.scan_cooldown:
-            return self.is_complete, self.progress, "Scanning too fast"
-        
-        self.last_scan_time = current_time
-        
-        # Try to decode QR from frame
+        self.frames += 1
         status = self.decoder.add_image(frame)
-        
-        if status == DecodeQRStatus.INVALID:
-            return self.is_complete, self.progress, "Invalid QR code"
-            
+        self.last_progress = self._progress(status)
+        return self.last_progress
+
+    def _progress(self, status: DecodeQRStatus) -> ScanProgress:
+        decoder = self.decoder
+        if decoder.is_complete:
+            return ScanProgress(True, 1.0, "Complete", status, self.frames)
+        if status == DecodeQRStatus.INVALID or decoder.is_invalid:
+            return ScanProgress(False, 0.0, "Invalid QR code", DecodeQRStatus.INVALID, self.frames)
+        if decoder.is_ur and decoder.decoder:
+            progress = decoder.decoder.estimated_percent_complete()
+            received, total = self.fragments()
+            if total:
+                message = f"Scanning... {received}/{total}"
+            else:
+                message = f"Scanning... {int(progress * 100)}%"
+            return ScanProgress(False, progress, message, status, self.frames)
         if status == DecodeQRStatus.FALSE:
-            return self.is_complete, self.progress, "No QR code detected"
-            
-        # Check if we have a complete non-UR QR code
-        if self.decoder.is_complete and not self.decoder.is_ur:
-            self.is_complete = True
-            self.progress = 1.0
-            return self.is_complete, self.progress, "Complete"
-            
-        # Handle UR format QR codes
-        if self.decoder.is_ur:
-            return self._handle_ur_qr()
-            
-        return self.is_complete, self.progress, "Processing..."
-    
-    def _handle_ur_qr(self) -> Tuple[bool, float, str]:
+            return ScanProgress(False, self.last_progress.progress, "Scanning...", status, self.frames)
+        return ScanProgress(False, decoder.get_percent_complete() / 100, "Processing...", status, self.frames)
+
+    @property
+    def ur_decoder(self) -> Any:
         """
-        Handle UR format QR codes with progress tracking.
-        
-        Returns:
-            Tuple[bool, float, str]: (is_complete, progress, status_message)
+        The URDecoder when scanning an animated UR, else None.
         """
-        # For UR formats, we need to parse the raw UR string to track progress
-        # This requires accessing the underlying UR decoder in the DecodeQR object
-        
-        try:
-            # Check if we have a UR decoder
-            if hasattr(self.decoder, 'decoder') and self.decoder.decoder:
-                # Try to get progress information from the UR decoder
-                if hasattr(self.decoder.decoder, 'estimated_percent_complete'):
-                    self.progress = self.decoder.decoder.estimated_percent_complete()
-                    
-                    # Try to get total parts information
-                    if hasattr(self.decoder.decoder, 'expected_part_count'):
-                        self.total_parts = self.decoder.decoder.expected_part_count
-                    
-                    # Check if complete
-                    if hasattr(self.decoder.decoder, 'is_complete'):
-                        self.is_complete = self.decoder.decoder.is_complete()
-                        
-                        if self.is_complete:
-                            return self.is_complete, self.progress, f"Complete"
-                        elif self.total_parts:
-                            scanned = int(self.progress * self.total_parts)
-                            return self.is_complete, self.progress, f"Scanning... {scanned}/{self.total_parts}"
-                        else:
-                            return self.is_complete, self.progress, f"Scanning... {int(self.progress * 100)}%"
-                
-            # Fallback: use the decoder's built-in progress method
-            percent_complete = self.decoder.get_percent_complete()
-            self.progress = percent_complete / 100.0
-            
-            if self.decoder.is_complete:
-                self.is_complete = True
-                return self.is_complete, self.progress, "Complete"
-            else:
-                return self.is_complete, self.progress, f"Scanning... {percent_complete}%"
-                
-        except Exception as e:
-            return self.is_complete, self.progress, f"Error: {str(e)}"
-    
-    def reset(self):
-        """Reset the scanner state."""
-        self.decoder = DecodeQR(wordlist_language_code=self.wordlist_language_code)
-        self.ur_parts.clear()
-        self.total_parts = None
-        self.bytes_tag = None
-        self.progress = 0.0
-        self.is_complete = False
-        self.last_scan_time = 0
-        self.last_ur_data = None
-    
-    def get_decoded_data(self):
+        return self.decoder.decoder if self.decoder.is_ur else None
+
+    def fragments(self) -> tuple:
         """
-        Get the fully decoded data when scanning is complete.
-        
-        Returns:
-            The decoded data or None if not complete
+        (fragments recovered, fragments in the message) of an animated UR; (0, 0)
+        before the first part was received.
+        """
+        ur_decoder = self.ur_decoder
+        if ur_decoder is None or ur_decoder.fountain_decoder.expected_part_indexes is None:
+            return 0, 0
+        return len(ur_decoder.received_part_indexes()), ur_decoder.expected_part_count()
+
+    def get_decoded_data(self) -> Any:
+        """
+        The decoded transaction, outputs or QR data once the scan is complete.
         """
         if not self.is_complete:
             return None
-            
-        # For UR formats, get the decoded data from the UR decoder
-        if self.decoder.is_ur:
-            if self.decoder.qr_type == QRType.XMR_TX_UNSIGNED_UR:
-                return self.decoder.get_tx()
-            elif self.decoder.qr_type == QRType.XMR_OUTPUT_UR:
-                return self.decoder.get_output()
-            # Add other UR types as needed
-                
-        # For other formats, return the direct decode result
+        if self.decoder.qr_type == QRType.XMR_TX_UNSIGNED_UR:
+            return self.decoder.get_tx()
+        if self.decoder.qr_type == QRType.XMR_OUTPUT_UR:
+            return self.decoder.get_output()
         return self.decoder.get_qr_data()
 
+    def reset(self) -> None:
+        self.close()
+        self.decoder = DecodeQR(wordlist_language_code=self.wordlist_language_code)
+        self.frames = 0
+        self.last_progress = ScanProgress()
 
-class LiveQRScannerThread(BaseThread):
+    def close(self) -> None:
+        self.decoder.close()
+
+
+class LiveQRScanEngine(BaseThread):
     """
-    Thread for continuously scanning QR codes from camera frames.
+    Decodes camera frames on its own thread as fast as the CPU allows.
+
+    With a `camera` the engine waits for each new frame of its video stream
+    itself, independent of whoever else (e.g. the live preview) reads the
+    stream; otherwise it sleeps until a frame is handed to it with `feed()`.
+    Either way, when frames arrive faster than they can be decoded only the
+    newest is decoded (latest frame wins). `max_fps` optionally caps the decode
+    rate to leave CPU to other threads. Decoded frames and their outcome are
+    passed on to `recorder`, if any, and counted in `telemetry`.
+
+    After every decoded frame the ScanProgress is published on `bus` (and so to
+    `callback` and/or `progress_queue`); `progress` is the latest one. The engine
+    stops by itself once the scan is over (`ScanProgress.is_final`) and closes
+    the scanner on exit.
     """
-    
-    def __init__(self, camera: Camera, scanner: LiveQRScanner, callback=None):
-        self.camera = camera
-        self.scanner = scanner
-        self.callback = callback  # Callback function to report progress
-        self.running = True
+
+    def __init__(
+            self,
+            scanner: LiveQRScanner,
+            callback: Optional[Callable[[ScanProgress], None]] = None,
+            progress_queue: Optional[Queue] = None,
+            camera: Any = None,
+            max_fps: Optional[float] = None,
+            frame_wait_timeout: float = 0.1,
+            recorder: Optional[ScanRecorder] = None):
         super().__init__()
-        
-    def run(self):
-        """Main scanning loop."""
-        while self.running and self.keep_running:
+        self.scanner = scanner
+        self.bus = ScanProgressBus()
+        if callback is not None or progress_queue is not None:
+            self.bus.subscribe(callback, progress_queue)
+        self.camera = camera
+        self.max_fps = max_fps
+        self.frame_wait_timeout = frame_wait_timeout
+        self.recorder = recorder
+        self.keep_running = False
+        self.fps = RateMeter()
+        self.telemetry = ScanTelemetry()
+        self._frame_ready = Condition()
+        self._frame = None
+        self._last_seq = 0
+        self._last_decode = None
+        self.frames_fed = 0
+        self.frames_scanned = 0
+        self.frames_dropped = 0
+        self.frames_skipped = 0
+
+    def feed(self, frame: Any) -> None:
+        """
+        Hands a new camera frame to the engine; never blocks on decoding.
+        """
+        if frame is None:
+            return
+        with self._frame_ready:
+            if self._frame is not None:
+                self.frames_dropped += 1
+            self.frames_fed += 1
+            self._frame = VideoFrame(self.frames_fed, monotonic(), frame)
+            self._frame_ready.notify()
+
+    def _next_frame(self) -> Optional[VideoFrame]:
+        if self.camera is not None:
+            return self._next_camera_frame()
+        with self._frame_ready:
+            while self._frame is None and self.keep_running:
+                self._frame_ready.wait()
+            frame, self._frame = self._frame, None
+            return frame
+
+    def _next_camera_frame(self) -> Optional[VideoFrame]:
+        while self.keep_running:
             try:
-                # Capture frame from camera
-                frame = self.camera.read_video_stream(as_image=True)
-                if frame is not None:
-                    # Scan the frame
-                    is_complete, progress, status = self.scanner.scan_frame(frame)
-                    
-                    # Report progress via callback if provided
-                    if self.callback:
-                        self.callback(is_complete, progress, status)
-                        
-                    # If complete, stop scanning
-                    if is_complete:
-                        self.running = False
-                        
-                # Small delay to prevent excessive CPU usage
-                time.sleep(0.05)
-                
+                video_frame = self.camera.read_next_video_frame(self._last_seq, timeout=self.frame_wait_timeout)
             except Exception as e:
-                if self.callback:
-                    self.callback(False, 0.0, f"Error: {str(e)}")
-                time.sleep(0.1)
-                
+                # The video stream was stopped
+                logger.debug('live scan camera stream ended: %s', e)
+                return None
+            if video_frame is None:
+                continue
+            if self._last_seq:
+                self.frames_dropped += video_frame.seq - self._last_seq - 1
+            self._last_seq = video_frame.seq
+            return video_frame
+        return None
+
+    def _is_due(self) -> bool:
+        if not self.max_fps or self._last_decode is None:
+            return True
+        return monotonic() - self._last_decode >= 1 / self.max_fps
+
+    def run(self):
+        try:
+            while self.keep_running:
+                frame = self._next_frame()
+                if frame is None:
+                    break
+                if not self._is_due():
+                    self.frames_skipped += 1
+                    continue
+                self._last_decode = monotonic()
+                try:
+                    progress = self.scanner.scan_frame(frame.image)
+                except Exception as e:
+                    logger.warning('live scan failed on frame: %s', e)
+                    progress = ScanProgress(False, self.progress.progress, f"Error: {e}", None, self.scanner.frames, e)
+                decoded_at = monotonic()
+                self.frames_scanned += 1
+                self.fps.tick(decoded_at)
+                self.telemetry.record_frame(
+                    frame.seq, frame.timestamp, decoded_at - self._last_decode, progress.status,
+                    self.scanner.ur_decoder, decoded_at)
+                if self.recorder:
+                    self.recorder.record(frame.image, frame.seq, frame.timestamp, progress.status, decoded_at - self._last_decode)
+                self.bus.publish(progress)
+                if progress.is_final:
+                    break
+        finally:
+            self.scanner.close()
+
     def stop(self):
-        """Stop the scanning thread."""
-        self.running = False
         super().stop()
+        with self._frame_ready:
+            self._frame_ready.notify_all()
+
+    @property
+    def progress(self) -> ScanProgress:
+        return self.bus.latest
 
+    @property
+    def is_complete(self) -> bool:
+        return self.progress.is_complete
 
-# Example usage:
-# scanner = LiveQRScanner()
-# camera = Camera.get_instance()
-# camera.start_video_stream_mode(resolution=(480, 480), framerate=5)
-#
-# def progress_callback(is_complete, progress, status):
-#     print(f"Progress: {progress:.1%} - {status}")
-#     if is_complete:
-#         data = scanner.get_decoded_data()
-#         print(f"Decoded data: {data}")
-#
-# scanner_thread = LiveQRScannerThread(camera, scanner, progress_callback)
-# scanner_thread.start()
-#
-# # To stop scanning:
-# # scanner_thread.stop()
-# # camera.stop_video_stream_mode()
\ No newline at end of file
+    def stats(self) -> dict:
+        return {
+            'frames_fed': self.frames_fed,
+            'frames_scanned': self.frames_scanned,
+            'frames_dropped': self.frames_dropped,
+            'frames_skipped': self.frames_skipped,
+            'fps': self.fps.rate(),
+        }
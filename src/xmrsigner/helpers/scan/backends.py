@@ -0,0 +1,162 @@
+from logging import getLogger
+from typing import Any, Dict, List, Optional, Type
+
+import numpy as np
+
+from xmrsigner.helpers.scan.strategy import DecodeStrategy, Symbol
+
+
+logger = getLogger(__name__)
+
+
+class DecoderBackend:
+    """
+    A QR decoding library.
+
+    A backend is instantiated once per scan session and contributes one or more
+    DecodeStrategy; the first one is its primary strategy, the one timed during
+    calibration. Anything expensive to set up (scanners, detectors) is created in
+    `__init__` so it is not paid on every frame.
+    """
+    name: str = None
+    display_name: str = None
+
+    @classmethod
+    def is_available(cls) -> bool:
+        raise NotImplementedError()
+
+    def strategies(self, is_binary: bool = False) -> List[DecodeStrategy]:
+        raise NotImplementedError()
+
+
+BACKENDS: Dict[str, Type[DecoderBackend]] = {}
+
+
+def register_backend(backend: Type[DecoderBackend]) -> Type[DecoderBackend]:
+    BACKENDS[backend.name] = backend
+    return backend
+
+
+def available_backends() -> List[str]:
+    """
+    Names of the registered backends whose library can be loaded, in registration
+    order.
+    """
+    available = []
+    for name, backend in BACKENDS.items():
+        try:
+            if backend.is_available():
+                available.append(name)
+        except Exception as e:
+            logger.debug('decoder backend %s unavailable: %s', name, e)
+    return available
+
+
+def create_strategies(is_binary: bool = False, preferred: Optional[str] = None) -> List[DecodeStrategy]:
+    """
+    Strategies of all available backends, the `preferred` backend's first and the
+    others after it as fallbacks.
+    """
+    names = available_backends()
+    if preferred in names:
+        names.remove(preferred)
+        names.insert(0, preferred)
+    strategies = []
+    for name in names:
+        strategies.extend(BACKENDS[name]().strategies(is_binary))
+    return strategies
+
+
+@register_backend
+class ZbarBackend(DecoderBackend):
+    name = 'zbar'
+    display_name = 'ZBar'
+
+    @classmethod
+    def is_available(cls) -> bool:
+        try:
+            from xmrsigner.helpers.scan.zbar import ZbarScanner
+        except ImportError:
+            return False
+        return True
+
+    def strategies(self, is_binary: bool = False) -> List[DecodeStrategy]:
+        from xmrsigner.helpers.scan.zbar import ZbarScanner
+        return [
+            DecodeStrategy('zbar', ZbarScanner(binary=is_binary)),
+            DecodeStrategy('zbar density=2', ZbarScanner(binary=is_binary, density=2)),
+            DecodeStrategy('zbar density=3', ZbarScanner(binary=is_binary, density=3)),
+            DecodeStrategy('zbar binary=False', ZbarScanner(binary=False)),
+            DecodeStrategy('zbar binary=False, density=2', ZbarScanner(binary=False, density=2)),
+            DecodeStrategy('zbar all symbols', ZbarScanner(symbols=None, binary=is_binary)),
+        ]
+
+
+@register_backend
+class OpenCVBackend(DecoderBackend):
+    name = 'opencv'
+    display_name = 'OpenCV'
+
+    @classmethod
+    def is_available(cls) -> bool:
+        try:
+            import cv2
+        except ImportError:
+            return False
+        return hasattr(cv2, 'QRCodeDetector')
+
+    def __init__(self):
+        import cv2
+        self.cv2 = cv2
+        self.detector = cv2.QRCodeDetector()
+
+    def decode(self, image: Any) -> List[Symbol]:
+        if not hasattr(image, 'shape'):
+            image = np.asarray(image.convert('L'))
+        data, bbox, straight_qrcode = self.detector.detectAndDecode(image)
+        if not data:
+            return []
+        rect = None
+        if bbox is not None:
+            rect = tuple(self.cv2.boundingRect(bbox.reshape(-1, 2).astype(np.float32)))
+        return [Symbol(data.encode('utf-8'), rect)]
+
+    def strategies(self, is_binary: bool = False) -> List[DecodeStrategy]:
+        return [DecodeStrategy('opencv', self.decode)]
+
+
+@register_backend
+class ZxingBackend(DecoderBackend):
+    name = 'zxing'
+    display_name = 'zxing-cpp'
+
+    @classmethod
+    def is_available(cls) -> bool:
+        try:
+            import zxingcpp
+        except ImportError:
+            return False
+        return True
+
+    def __init__(self):
+        import zxingcpp
+        self.zxingcpp = zxingcpp
+        self.formats = zxingcpp.BarcodeFormat.QRCode
+
+    def decode(self, image: Any) -> List[Symbol]:
+        if not hasattr(image, 'shape'):
+            image = np.asarray(image.convert('L'))
+        symbols = []
+        for barcode in self.zxingcpp.read_barcodes(image, formats=self.formats):
+            data = barcode.bytes
+            if not data:
+                continue
+            position = barcode.position
+            corners = (position.top_left, position.top_right, position.bottom_right, position.bottom_left)
+            xs = [p.x for p in corners]
+            ys = [p.y for p in corners]
+            symbols.append(Symbol(data, (min(xs), min(ys), max(xs) - min(xs), max(ys) - min(ys))))
+        return symbols
+
+    def strategies(self, is_binary: bool = False) -> List[DecodeStrategy]:
+        return [DecodeStrategy('zxing', self.decode)]
@@ -0,0 +1,163 @@
+from dataclasses import dataclass
+from logging import getLogger
+from time import perf_counter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from PIL import Image, ImageFilter
+from qrcode import QRCode
+from qrcode.constants import ERROR_CORRECT_L
+
+from xmrsigner.helpers.scan.backends import BACKENDS, available_backends
+from xmrsigner.models.threads import BaseThread
+
+
+logger = getLogger(__name__)
+
+
+# Payloads typical for what is scanned on the device: a SeedQR, an address and
+# UR parts at the low/medium/high animated QR densities.
+SAMPLE_PAYLOADS = (
+    '0010133800040045189802111917099011121433154511321001072813731612167111180424',
+    '4AdUndXHHZ6cfufTMvppY6JwXNouMBzSkbLYfpAV5Usx3skxNgYeYTRj5UzqtReoS44qo9mtmXCqY45DJ852K5Jv2684Rge',
+    'ur:xmr-txunsigned/12-40/lpbbcsdkcywdtkotrfhdcwjyaswpjkiaidpkbkmtsbbzfzmksbbtbwsgfeaeadadadad',
+    'ur:xmr-txunsigned/12-40/lpbbcsdkcywdtkotrfhdemjyaswpjkiaidpkbkmtsbbzfzmksbbtbwsgfeaeadadadadfztkdpehtbaytbktnnnnhlbbjsdpgsbgdefzdkgd',
+    'ur:xmr-txunsigned/12-40/lpbbcsdkcywdtkotrfhdfejyaswpjkiaidpkbkmtsbbzfzmksbbtbwsgfeaeadadadadfztkdpehtbaytbktnnnnhlbbjsdpgsbgdefzdkgdgyhdbtmkwtmwpfnbytpjtddwkpdntoetlpchrkcpjzztdmqzgmjfpfecpdhkelprmohpmylbsfhzwnlmswtdpsbbnndmdkpnlfjpelnwmwkotyhyftotnbwdrnegwnksgmdhbkrnwzdm',
+)
+# (QR size in the frame, blur radius, noise sigma): sharp and close, far, and a
+# slightly defocused noisy low light frame.
+SAMPLE_CONDITIONS = ((360, 0.0, 0.0), (240, 0.0, 4.0), (320, 1.0, 8.0))
+
+
+def sample_frames(size: Tuple[int, int] = (480, 480), seed: int = 0) -> List[Tuple[np.ndarray, bytes]]:
+    """
+    The calibration set: every sample payload rendered under every condition as
+    an RGB camera sized frame, paired with the payload it must decode to.
+
+    Frames are rendered deterministically (fixed noise seed) so calibrations on
+    different devices are comparable.
+    """
+    rng = np.random.default_rng(seed)
+    frames = []
+    for payload in SAMPLE_PAYLOADS:
+        qr = QRCode(error_correction=ERROR_CORRECT_L, border=2)
+        qr.add_data(payload)
+        qr.make(fit=True)
+        code = qr.make_image().convert('L')
+        for qr_size, blur, noise in SAMPLE_CONDITIONS:
+            frame = Image.new('L', size, 150)
+            frame.paste(code.resize((qr_size, qr_size), Image.NEAREST), ((size[0] - qr_size) // 2, (size[1] - qr_size) // 2))
+            if blur:
+                frame = frame.filter(ImageFilter.GaussianBlur(blur))
+            pixels = np.asarray(frame, dtype=np.float32)
+            if noise:
+                pixels = pixels + rng.normal(0, noise, pixels.shape)
+            pixels = np.clip(pixels, 0, 255).astype(np.uint8)
+            frames.append((np.repeat(pixels[:, :, None], 3, axis=2), payload.encode()))
+    return frames
+
+
+@dataclass
+class BackendCalibration:
+    """
+    Timing and reliability of a backend's primary strategy over the calibration set.
+    """
+    name: str
+    frames: int = 0
+    decoded: int = 0
+    errors: int = 0
+    total_time: float = 0.0
+
+    @property
+    def success_rate(self) -> float:
+        return self.decoded / self.frames if self.frames else 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        return self.total_time / self.frames if self.frames else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'frames': self.frames,
+            'decoded': self.decoded,
+            'errors': self.errors,
+            'success_rate': self.success_rate,
+            'mean_latency_ms': self.mean_latency * 1000,
+        }
+
+
+def calibrate(
+        frames: Optional[List[Tuple[Any, bytes]]] = None,
+        backends: Optional[Sequence[str]] = None,
+        min_success_rate: float = 0.9,
+        repeat: int = 1) -> Tuple[Optional[str], List[BackendCalibration]]:
+    """
+    Times every available backend on `frames` (the bundled sample frames by
+    default) and returns the name of the fastest one decoding at least
+    `min_success_rate` of them correctly, with the per-backend results.
+
+    If no backend is reliable enough the most reliable one is returned.
+    """
+    frames = sample_frames() if frames is None else frames
+    names = [name for name in (backends or available_backends()) if name in BACKENDS]
+    results = []
+    for name in names:
+        decode = BACKENDS[name]().strategies()[0].decode
+        result = BackendCalibration(name)
+        for i in range(repeat):
+            for image, expected in frames:
+                result.frames += 1
+                start = perf_counter()
+                try:
+                    symbols = decode(image)
+                except Exception as e:
+                    logger.debug('calibration of %s failed on a frame: %s', name, e)
+                    result.errors += 1
+                    symbols = []
+                result.total_time += perf_counter() - start
+                if any(symbol.data == expected for symbol in symbols):
+                    result.decoded += 1
+        logger.info('decoder calibration %s', result.to_dict())
+        results.append(result)
+    if not results:
+        return None, results
+    reliable = [r for r in results if r.success_rate >= min_success_rate]
+    if reliable:
+        best = min(reliable, key=lambda r: r.mean_latency)
+    else:
+        best = max(results, key=lambda r: (r.success_rate, -r.mean_latency))
+    return best.name, results
+
+
+def store_backend(name: Optional[str]) -> None:
+    """
+    Stores the backend `calibrate()` chose in Settings, which DecodeQR reads when
+    a scan session starts; nothing is stored without a backend.
+    """
+    from xmrsigner.models.settings import Settings, SettingsConstants
+    if name:
+        Settings.get_instance().set_value(SettingsConstants.SETTING__QR_DECODER, name)
+
+
+def calibrate_and_store(**kwargs) -> Optional[str]:
+    """
+    Runs `calibrate()` and stores the chosen backend (see `store_backend()`).
+    """
+    name, results = calibrate(**kwargs)
+    store_backend(name)
+    return name
+
+
+class DecoderCalibrationThread(BaseThread):
+    """
+    Calibrates in the background so startup is not delayed; scans started before
+    it finishes use the default backend order.
+    """
+    def run(self):
+        try:
+            name = calibrate_and_store()
+            logger.info('QR decoder backend selected: %s', name)
+        except Exception as e:
+            logger.warning('QR decoder calibration failed: %s', e)
+        self.keep_running = False
@@ -0,0 +1,218 @@
+from dataclasses import dataclass, replace
+from logging import getLogger
+from math import ceil, cos, pi, radians, sin
+from os import makedirs, path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image, ImageFilter
+from qrcode import QRCode
+from qrcode.constants import ERROR_CORRECT_L
+
+from xmrsigner.helpers.scan.recorder import RecordedFrame, save_recording
+from xmrsigner.models.settings import SettingsConstants
+from xmrsigner.models.ur_encoder import UrQrEncoder
+from xmrsigner.urtypes.xmr import XMR_TX_UNSIGNED, XmrTxUnsigned
+
+
+logger = getLogger(__name__)
+
+
+DENSITIES = (SettingsConstants.DENSITY__LOW, SettingsConstants.DENSITY__MEDIUM, SettingsConstants.DENSITY__HIGH)
+# Gray levels of the QR code on the device screen (see UrQrEncoder.next_part_image)
+# and of whatever surrounds the device in the camera's view.
+SCREEN_DARK = 0
+SCREEN_LIGHT = 0xbd
+SURROUNDINGS = 70
+
+
+def synthetic_tx_payload(size: int, seed: int = 0) -> bytearray:
+    """
+    CBOR of an `xmr-txunsigned` UR wrapping `size` random bytes: decodes like an
+    unsigned transaction of that size, without needing a wallet to create one.
+    """
+    return XmrTxUnsigned(np.random.default_rng(seed).bytes(size)).to_cbor()
+
+
+@dataclass(frozen=True)
+class CameraEffects:
+    """
+    How the camera sees the device screen showing the animated QR code.
+
+    `scale` is the size of the QR code relative to the shorter frame side,
+    `perspective` the largest displacement of its corners relative to its size
+    (a tilted device), `blur` a gaussian blur radius in pixels (defocus),
+    `noise` the sigma of the sensor noise, `gamma` the exposure response
+    (above 1 darkens, like low light) and `moire` the depth (0 to 1) of the
+    banding from the screen's pixel grid beating with the sensor's;
+    `moire_pitch` is the screen pixel pitch in sensor pixels, closer to 1
+    gives wider bands.
+    """
+    frame_size: Tuple[int, int] = (480, 480)
+    scale: float = 0.7
+    perspective: float = 0.0
+    blur: float = 0.0
+    noise: float = 0.0
+    gamma: float = 1.0
+    moire: float = 0.0
+    moire_pitch: float = 1.08
+
+
+CAMERA_PRESETS: Dict[str, CameraEffects] = {
+    'clean': CameraEffects(),
+    'far': CameraEffects(scale=0.35, noise=3.0),
+    'handheld': CameraEffects(perspective=0.08, blur=0.8, noise=4.0),
+    'low-light': CameraEffects(gamma=1.8, blur=0.5, noise=8.0),
+    'moire': CameraEffects(scale=0.8, moire=0.35, noise=2.0),
+}
+
+
+def perspective_coefficients(source: Iterable[Tuple[float, float]], target: Iterable[Tuple[float, float]]) -> List[float]:
+    """
+    Coefficients for `Image.transform(..., Image.PERSPECTIVE, ...)` mapping the
+    four `target` corners (output image) back onto the `source` ones.
+    """
+    rows, values = [], []
+    for (x, y), (u, v) in zip(target, source):
+        rows.append([x, y, 1, 0, 0, 0, -u * x, -u * y])
+        rows.append([0, 0, 0, x, y, 1, -v * x, -v * y])
+        values.extend((u, v))
+    return np.linalg.solve(np.array(rows, dtype=np.float64), np.array(values, dtype=np.float64)).tolist()
+
+
+def render_part(part: str, border: int = 3) -> Image.Image:
+    """
+    A UR part as shown on the device screen, one pixel per module.
+    """
+    qr = QRCode(error_correction=ERROR_CORRECT_L, box_size=1, border=border)
+    qr.add_data(part)
+    qr.make(fit=True)
+    code = np.asarray(qr.make_image().convert('L')) > 127
+    return Image.fromarray(np.where(code, SCREEN_LIGHT, SCREEN_DARK).astype(np.uint8), 'L')
+
+
+class CameraSimulator:
+    """
+    Turns rendered QR codes into RGB camera frames under `effects`.
+
+    The tilt (`perspective`) and the moiré pattern are drawn once, the device
+    being held still for the scan; the sensor noise changes every frame. All of
+    it follows `seed`, so a corpus can be regenerated exactly.
+    """
+
+    def __init__(self, effects: CameraEffects = CameraEffects(), seed: int = 0):
+        self.effects = effects
+        self.rng = np.random.default_rng(seed)
+        width, height = effects.frame_size
+        size = int(min(width, height) * effects.scale)
+        left, top = (width - size) // 2, (height - size) // 2
+        self.placement = (left, top, size)
+        corners = [(left, top), (left + size, top), (left + size, top + size), (left, top + size)]
+        shift = effects.perspective * size
+        tilted = [(x + self.rng.uniform(-shift, shift), y + self.rng.uniform(-shift, shift)) for x, y in corners]
+        self.coefficients = perspective_coefficients(corners, tilted) if effects.perspective else None
+        self.moire_pattern = self._moire_pattern() if effects.moire else None
+
+    def _moire_pattern(self) -> np.ndarray:
+        # The screen's pixel grid, slightly rotated, sampled at the sensor's
+        # pixels: a pitch close to one pixel aliases into wide bands.
+        width, height = self.effects.frame_size
+        angle = radians(self.rng.uniform(-5, 5))
+        y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+        u = x * cos(angle) + y * sin(angle)
+        v = y * cos(angle) - x * sin(angle)
+        pitch = self.effects.moire_pitch
+        grid = (0.5 + 0.5 * np.cos(2 * pi * u / pitch)) * (0.5 + 0.5 * np.cos(2 * pi * v / pitch))
+        return 1 - self.effects.moire * (1 - grid)
+
+    def capture(self, code: Image.Image) -> np.ndarray:
+        effects = self.effects
+        left, top, size = self.placement
+        frame = Image.new('L', effects.frame_size, SURROUNDINGS)
+        frame.paste(code.resize((size, size), Image.NEAREST), (left, top))
+        if self.coefficients:
+            frame = frame.transform(effects.frame_size, Image.PERSPECTIVE, self.coefficients, Image.BILINEAR, fillcolor=SURROUNDINGS)
+        if effects.blur:
+            frame = frame.filter(ImageFilter.GaussianBlur(effects.blur))
+        pixels = np.asarray(frame, dtype=np.float32)
+        if self.moire_pattern is not None:
+            pixels = pixels * self.moire_pattern
+        if effects.gamma != 1.0:
+            pixels = 255 * (pixels / 255) ** effects.gamma
+        if effects.noise:
+            pixels = pixels + self.rng.normal(0, effects.noise, pixels.shape)
+        gray = np.clip(pixels, 0, 255).astype(np.uint8)
+        return np.repeat(gray[:, :, None], 3, axis=2)
+
+
+def generate_frames(
+        payload: bytearray,
+        density: str = SettingsConstants.DENSITY__MEDIUM,
+        effects: CameraEffects = CameraEffects(),
+        loops: float = 2.0,
+        display_fps: float = 5.0,
+        camera_fps: float = 10.0,
+        max_frames: Optional[int] = None,
+        ur_type: str = XMR_TX_UNSIGNED.type,
+        seed: int = 0) -> Iterator[RecordedFrame]:
+    """
+    Camera frames of the device showing `payload` as an animated QR code at
+    `density`, as scanned by another device.
+
+    The device shows a new UR part every 1/`display_fps` seconds, the camera
+    captures at `camera_fps`, so parts are seen several times or missed just
+    like on real hardware. Enough frames are captured to see the part sequence
+    `loops` times over (the fountain code usually completes after about one).
+    Timestamps start at 0 seconds.
+    """
+    encoder = UrQrEncoder(ur_type, payload, density)
+    camera = CameraSimulator(effects, seed)
+    count = ceil(max(encoder.seq_len() * loops, 1) * camera_fps / display_fps)
+    if max_frames is not None:
+        count = min(count, max_frames)
+    shown, code = -1, None
+    for i in range(count):
+        timestamp = i / camera_fps
+        on_screen = int(timestamp * display_fps)
+        if on_screen > shown:
+            # Parts shown between two captures are never seen
+            for j in range(on_screen - shown):
+                part = encoder.next_part()
+            shown = on_screen
+            code = render_part(part)
+        yield RecordedFrame(i + 1, timestamp, camera.capture(code))
+
+
+def write_corpus(
+        directory: str,
+        frames: Iterable[RecordedFrame],
+        name: str = 'corpus',
+        chunk_size: int = 50) -> List[str]:
+    """
+    Writes `frames` as a scan recording (`scan-<name>-<chunk>.npz`, see
+    `load_recording()`) and returns the archives written.
+    """
+    makedirs(directory, exist_ok=True)
+    filenames, chunk = [], []
+    for frame in frames:
+        chunk.append(frame)
+        if len(chunk) == chunk_size:
+            filenames.append(_write_chunk(directory, name, len(filenames), chunk))
+            chunk = []
+    if chunk:
+        filenames.append(_write_chunk(directory, name, len(filenames), chunk))
+    return filenames
+
+
+def _write_chunk(directory: str, name: str, index: int, frames: List[RecordedFrame]) -> str:
+    filename = path.join(directory, f'scan-{name}-{index:04d}.npz')
+    save_recording(filename, frames)
+    logger.debug('wrote %d corpus frames to %s', len(frames), filename)
+    return filename
+
+
+def preset(name: str, **overrides) -> CameraEffects:
+    """
+    The named entry of CAMERA_PRESETS with some of its effects changed.
+    """
+    return replace(CAMERA_PRESETS[name], **overrides)
@@ -0,0 +1,120 @@
+from logging import getLogger
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+from xmrsigner.helpers.scan.strategy import Symbol
+from xmrsigner.helpers.scan.triage import TriageResult, luminance
+
+
+logger = getLogger(__name__)
+
+
+def local_mean(gray: np.ndarray, block: int) -> np.ndarray:
+    """
+    Approximate local mean of every pixel: the mean of the 3x3 `block` sized
+    blocks around the block it falls in (as ZXing's hybrid binarizer does).
+    Much cheaper than a per-pixel box filter and smooth enough for thresholding.
+    """
+    height, width = gray.shape
+    rows, cols = -(-height // block), -(-width // block)
+    padded = np.pad(gray, ((0, rows * block - height), (0, cols * block - width)), mode='edge')
+    means = padded.reshape(rows, block, cols, block).mean(axis=(1, 3), dtype=np.float32)
+    around = np.pad(means, 1, mode='edge')
+    smoothed = sum(
+        around[dy:dy + rows, dx:dx + cols]
+        for dy in range(3)
+        for dx in range(3)
+    ) / 9
+    return np.repeat(np.repeat(smoothed, block, axis=0), block, axis=1)[:height, :width]
+
+
+def box_blur(gray: np.ndarray) -> np.ndarray:
+    """
+    3x3 box blur; takes the edge off sensor noise before thresholding.
+    """
+    height, width = gray.shape
+    padded = np.pad(gray, 1, mode='edge').astype(np.uint16)
+    total = sum(padded[dy:dy + height, dx:dx + width] for dy in range(3) for dx in range(3))
+    return (total // 9).astype(np.uint8)
+
+
+def stretch_contrast(gray: np.ndarray, low: float = 1.0, high: float = 99.0) -> np.ndarray:
+    """
+    Linearly maps the `low`..`high` percentile range of `gray` onto 0..255.
+    """
+    lo, hi = np.percentile(gray, (low, high))
+    if hi - lo < 1:
+        return gray
+    stretched = (gray.astype(np.float32) - lo) * (255.0 / (hi - lo))
+    return np.clip(stretched, 0, 255).astype(np.uint8)
+
+
+def adaptive_threshold(gray: np.ndarray, block: int, offset: float = 2.0) -> np.ndarray:
+    """
+    Binarizes `gray` against its local mean: pixels darker than the mean of their
+    neighbourhood by more than `offset` become black (0), all others white (255).
+    Unlike a global threshold this survives a gradient of light across the code.
+    """
+    dark = gray < local_mean(gray, block) - offset
+    return np.where(dark, 0, 255).astype(np.uint8)
+
+
+class ContrastEnhancer:
+    """
+    Second chance for low-contrast or unevenly lit frames.
+
+    Only used after the raw frame failed to decode and triage saw a sharp frame
+    with finder pattern candidates, i.e. there is a QR code that the decoder
+    could not separate from the background. The frame is lightly blurred,
+    contrast stretched and binarized against its local mean; with `invert` a
+    light-on-dark code is tried as well.
+    """
+
+    def __init__(self, window: float = 1 / 24, offset: float = 2.0, invert: bool = True):
+        self.window = window
+        self.offset = offset
+        self.invert = invert
+        self.reset()
+
+    def reset(self) -> None:
+        self.attempts = 0
+        self.hits = 0
+        self.inverted_hits = 0
+        self.skipped = 0
+
+    @staticmethod
+    def is_promising(triage_result: TriageResult) -> bool:
+        """
+        Frames accepted on their own merit; frames rejected by triage or only let
+        through by the forced pass-through are not worth a second pass.
+        """
+        return triage_result is not None and triage_result.accepted and triage_result.reason is None
+
+    def binarize(self, image: Any) -> np.ndarray:
+        gray = stretch_contrast(box_blur(luminance(image)))
+        block = max(4, int(max(gray.shape) * self.window))
+        return adaptive_threshold(gray, block, self.offset)
+
+    def decode(self, image: Any, run: Callable[[Any], List[Symbol]]) -> List[Symbol]:
+        self.attempts += 1
+        binary = self.binarize(image)
+        symbols = run(binary)
+        if symbols:
+            self.hits += 1
+            return symbols
+        if self.invert:
+            symbols = run(255 - binary)
+            if symbols:
+                self.hits += 1
+                self.inverted_hits += 1
+        return symbols
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'attempts': self.attempts,
+            'hits': self.hits,
+            'inverted_hits': self.inverted_hits,
+            'skipped': self.skipped,
+            'hit_rate': self.hits / self.attempts if self.attempts else 0.0,
+        }
@@ -0,0 +1,118 @@
+from logging import getLogger
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from xmrsigner.helpers.scan.roi import crop, image_size
+from xmrsigner.helpers.scan.triage import luminance
+
+
+logger = getLogger(__name__)
+
+
+def frame_signature(image: Any, size: int = 64) -> np.ndarray:
+    """
+    Perceptual fingerprint of a frame: its luminance averaged down to a
+    `size` x `size` thumbnail. Block averaging cancels sensor noise; taken over
+    the QR code at about module resolution, a different QR code changes most
+    blocks.
+    """
+    width, height = image_size(image)
+    size = min(size, width, height)
+    gray = luminance(image, max(1, min(width, height) // (size * 4)))
+    block_height, block_width = gray.shape[0] // size, gray.shape[1] // size
+    blocks = gray[:block_height * size, :block_width * size].reshape(size, block_height, size, block_width)
+    return blocks.mean(axis=(1, 3), dtype=np.float32)
+
+
+def signature_distance(a: np.ndarray, b: np.ndarray) -> float:
+    """
+    Mean absolute difference of two signatures, in grey levels.
+    """
+    return float(np.abs(a - b).mean())
+
+
+class FrameHashCache:
+    """
+    Remembers the signature and decode result of the last decoded frame.
+
+    A QR code held still in front of the camera produces near identical frames;
+    while a new frame stays within `max_distance` grey levels of the decoded one
+    its result (payloads or a miss) is reused instead of running the decoders
+    again. After `max_reuse` reuses in a row the frame is decoded anyway.
+
+    The signature covers only the region the QR code was found in, so the next
+    part of an animated QR never matches the last one however small the code
+    is in the frame; while no QR code is located nothing is reused.
+    """
+
+    def __init__(self, max_distance: float = 3.0, max_reuse: int = 10, size: int = 64):
+        self.max_distance = max_distance
+        self.max_reuse = max_reuse
+        self.size = size
+        self.reset()
+
+    def reset(self) -> None:
+        self.signature = None
+        self.box = None
+        self.result = None
+        self.reused = 0
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.last_distance = None
+        self._pending = None
+
+    def lookup(self, image: Any) -> Optional[List[bytes]]:
+        """
+        Returns the cached payloads (an empty list for a cached miss) when `image`
+        matches the last decoded frame, or None when it has to be decoded; then
+        pass its result to `store()`.
+        """
+        if self.signature is not None:
+            signature = self.region_signature(image, self.box)
+            if signature.shape == self.signature.shape:
+                self.last_distance = signature_distance(signature, self.signature)
+                if self.last_distance <= self.max_distance:
+                    if self.reused < self.max_reuse:
+                        self.reused += 1
+                        self.hits += 1
+                        return list(self.result)
+                    self.expired += 1
+        self.misses += 1
+        self._pending = image
+        return None
+
+    def store(self, payloads: List[bytes], box: Optional[Tuple[int, int, int, int]]) -> None:
+        """
+        Records the decode result of the frame last passed to `lookup()` and `box`
+        (left, top, right, bottom), the region of the frame the QR code is in, to
+        match the next frames on; None when no QR code is located.
+        """
+        if self._pending is None:
+            return
+        image, self._pending = self._pending, None
+        self.reused = 0
+        if box is None:
+            self.signature = None
+            self.box = None
+            self.result = None
+            return
+        self.signature = self.region_signature(image, box)
+        self.box = box
+        self.result = list(payloads)
+
+    def region_signature(self, image: Any, box: Tuple[int, int, int, int]) -> np.ndarray:
+        width, height = image_size(image)
+        left, top, right, bottom = box
+        return frame_signature(crop(image, (max(0, left), max(0, top), min(width, right), min(height, bottom))), self.size)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'expired': self.expired,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'last_distance': self.last_distance,
+        }
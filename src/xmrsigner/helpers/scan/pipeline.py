@@ -0,0 +1,94 @@
+from logging import getLogger
+from typing import Any, Dict, List, Optional, Sequence
+
+from xmrsigner.helpers.scan.enhance import ContrastEnhancer
+from xmrsigner.helpers.scan.framecache import FrameHashCache
+from xmrsigner.helpers.scan.pyramid import PyramidDecoder
+from xmrsigner.helpers.scan.roi import RegionTracker
+from xmrsigner.helpers.scan.strategy import DecodeStrategyScheduler
+from xmrsigner.helpers.scan.triage import FrameTriage
+
+
+logger = getLogger(__name__)
+
+
+class FramePipeline:
+    """
+    Turns camera frames into QR payloads; one instance per scan session (or per
+    decode worker process), as every stage learns from the frames it has seen.
+
+    * A frame whose QR region looks like that of the last decoded one gets
+        that frame's result without being decoded again.
+    * Frames rejected by triage (blurred, no finder pattern) never reach a decoder.
+    * Once a QR code was found only a padded crop around it is decoded.
+    * The crop is decoded coarse-to-fine through the strategy scheduler.
+    * Promising frames that still fail get a second pass with local contrast
+        enhancement.
+    """
+
+    def __init__(
+            self,
+            scheduler: DecodeStrategyScheduler,
+            pyramid_levels: Optional[Sequence[int]] = (2, 1),
+            roi_max_misses: int = 2,
+            enhance: bool = True,
+            frame_cache: bool = True):
+        self.scheduler = scheduler
+        self.triage = FrameTriage()
+        self.roi = RegionTracker(max_misses=roi_max_misses)
+        self.pyramid = PyramidDecoder(pyramid_levels) if pyramid_levels else None
+        self.enhancer = ContrastEnhancer() if enhance else None
+        self.frame_cache = FrameHashCache() if frame_cache else None
+
+    def decode(self, image: Any) -> List[bytes]:
+        """
+        Returns the distinct payloads of all QR codes found in `image`.
+        """
+        if image is None:
+            return []
+        if self.frame_cache:
+            payloads = self.frame_cache.lookup(image)
+            if payloads is not None:
+                return payloads
+        payloads = self._decode(image)
+        if self.frame_cache:
+            self.frame_cache.store(payloads, self.roi.box)
+        return payloads
+
+    def _decode(self, image: Any) -> List[bytes]:
+        if not self.triage.check(image).accepted:
+            return []
+        region, offset = self.roi.region(image)
+        if self.pyramid:
+            symbols = self.pyramid.decode(
+                region,
+                self.scheduler.run,
+                self.scheduler.run_more,
+                lambda: self.scheduler.over_budget
+            )
+        else:
+            symbols = self.scheduler.run(region)
+        if not symbols and self.enhancer:
+            if ContrastEnhancer.is_promising(self.triage.last_result):
+                symbols = self.enhancer.decode(region, self.scheduler.run_best)
+            else:
+                self.enhancer.skipped += 1
+        self.roi.update(symbols, offset)
+        payloads = []
+        for symbol in symbols:
+            if symbol.data not in payloads:
+                payloads.append(symbol.data)
+        return payloads
+
+    def stats(self) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        The statistics of every stage, None for the disabled ones.
+        """
+        return {
+            'decode': self.scheduler.stats(),
+            'triage': self.triage.stats(),
+            'roi': self.roi.stats(),
+            'pyramid': self.pyramid.stats() if self.pyramid else None,
+            'enhance': self.enhancer.stats() if self.enhancer else None,
+            'frame_cache': self.frame_cache.stats() if self.frame_cache else None,
+        }
@@ -0,0 +1,291 @@
+from logging import getLogger
+from multiprocessing import get_context
+from multiprocessing.connection import wait
+from multiprocessing.shared_memory import SharedMemory
+from os import cpu_count
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from xmrsigner.helpers.scan.backends import create_strategies
+from xmrsigner.helpers.scan.pipeline import FramePipeline
+from xmrsigner.helpers.scan.strategy import DecodeStrategyScheduler
+
+
+logger = getLogger(__name__)
+
+
+def default_worker_count() -> int:
+    """
+    One worker per core, leaving one core for the camera, preview and UI.
+    """
+    return max(1, (cpu_count() or 1) - 1)
+
+
+def _attach(name: str) -> SharedMemory:
+    try:
+        # The creating process owns the segment and unlinks it
+        return SharedMemory(name, track=False)
+    except TypeError:
+        # Python < 3.13
+        from multiprocessing import resource_tracker
+        shm = SharedMemory(name)
+        resource_tracker.unregister(shm._name, 'shared_memory')
+        return shm
+
+
+def _worker_main(conn, shm_name: str, shape: tuple, dtype: str, options: Dict[str, Any]) -> None:
+    """
+    Decode worker: waits for the sequence number of a frame written to its
+    shared memory slot, decodes it and sends back (seq, payloads, pipeline
+    stats). `None` stops it.
+    """
+    shm = _attach(shm_name)
+    frame = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+    scheduler = DecodeStrategyScheduler(
+        create_strategies(options['is_binary'], preferred=options['backend']),
+        frame_budget=options['frame_budget'])
+    pipeline = FramePipeline(scheduler, **options['pipeline'])
+    try:
+        while True:
+            seq = conn.recv()
+            if seq is None:
+                break
+            try:
+                payloads = pipeline.decode(frame)
+            except Exception as e:
+                logger.debug('decode worker failed on frame %d: %s', seq, e)
+                payloads = []
+            conn.send((seq, payloads, pipeline.stats()))
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        del frame
+        shm.close()
+
+
+class _Slot:
+    def __init__(self, shm: SharedMemory, conn, process, view: np.ndarray):
+        self.shm = shm
+        self.conn = conn
+        self.process = process
+        self.view = view
+        self.busy = False
+
+
+class ParallelFrameDecoder:
+    """
+    Decodes camera frames in a pool of worker processes.
+
+    Every worker owns a shared memory slot the size of one frame; a frame is
+    copied into the slot of an idle worker and only its sequence number goes
+    through the pipe, so frames are never pickled. When all workers are busy
+    the newest frame waits and replaces any older waiting frame (latest frame
+    wins), so the pool never falls behind the camera.
+
+    Each worker runs its own FramePipeline; the payloads they find are handed
+    back by `collect()` to be merged into the one decoder of the scan session,
+    and the latest statistics of each one by `pipeline_stats()`. Workers are
+    started with the first frame, as its shape sizes the slots.
+
+    A worker that exits is dropped from the pool; once none are left, frames
+    are decoded on the calling thread instead.
+    """
+
+    def __init__(
+            self,
+            workers: Optional[int] = None,
+            backend: Optional[str] = None,
+            is_binary: bool = True,
+            frame_budget: Optional[float] = None,
+            **pipeline_options):
+        self.workers = workers or default_worker_count()
+        self.options = {
+            'backend': backend,
+            'is_binary': is_binary,
+            'frame_budget': frame_budget,
+            'pipeline': pipeline_options,
+        }
+        self._context = get_context('spawn')
+        self._slots: List[_Slot] = []
+        self._shape = None
+        self._dtype = None
+        self._pending = None
+        self._seq = 0
+        # In-process fallback once every worker exited, and its payloads not
+        # yet returned by collect()
+        self._pipeline = None
+        self._ready = []
+        # Latest FramePipeline.stats() of each worker, and of the fallback
+        self._pipeline_stats: Dict[str, Dict[str, Any]] = {}
+        self.workers_lost = 0
+        self.frames_submitted = 0
+        self.frames_dispatched = 0
+        self.frames_dropped = 0
+        self.frames_decoded = 0
+        self.frames_with_payload = 0
+
+    def _start(self, shape: tuple, dtype: np.dtype) -> None:
+        self.close()
+        nbytes = int(np.prod(shape)) * dtype.itemsize
+        for i in range(self.workers):
+            shm = SharedMemory(create=True, size=nbytes)
+            conn, child_conn = self._context.Pipe()
+            process = self._context.Process(
+                target=_worker_main,
+                args=(child_conn, shm.name, shape, dtype.str, self.options),
+                name=f'ParallelFrameDecoder-{i}',
+                daemon=True)
+            process.start()
+            child_conn.close()
+            self._slots.append(_Slot(shm, conn, process, np.ndarray(shape, dtype=dtype, buffer=shm.buf)))
+        self._shape = shape
+        self._dtype = dtype
+        logger.debug('started %d decode workers for %s frames', self.workers, shape)
+
+    def submit(self, image: Any) -> None:
+        """
+        Queues `image` (numpy frame or PIL image) for decoding; never blocks.
+        """
+        frame = image if hasattr(image, 'shape') else np.asarray(image)
+        if frame.shape != self._shape or frame.dtype != self._dtype:
+            self._start(frame.shape, frame.dtype)
+        self.frames_submitted += 1
+        if self._pending is not None:
+            self.frames_dropped += 1
+        self._pending = frame
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        if self._pending is None:
+            return
+        for slot in list(self._slots):
+            if not slot.busy:
+                np.copyto(slot.view, self._pending)
+                self._seq += 1
+                try:
+                    slot.conn.send(self._seq)
+                except (BrokenPipeError, OSError):
+                    self._retire(slot)
+                    continue
+                slot.busy = True
+                self._pending = None
+                self.frames_dispatched += 1
+                return
+        if not self._slots:
+            frame, self._pending = self._pending, None
+            self._decode_locally(frame)
+
+    def _retire(self, slot: _Slot) -> None:
+        self._slots.remove(slot)
+        self.workers_lost += 1
+        logger.warning('decode worker %s exited, %d left', slot.process.name, len(self._slots))
+        self._close_slot(slot)
+
+    def _decode_locally(self, frame: np.ndarray) -> None:
+        if self._pipeline is None:
+            logger.warning('no decode workers left, decoding on the calling thread')
+            scheduler = DecodeStrategyScheduler(
+                create_strategies(self.options['is_binary'], preferred=self.options['backend']),
+                frame_budget=self.options['frame_budget'])
+            self._pipeline = FramePipeline(scheduler, **self.options['pipeline'])
+        payloads = self._pipeline.decode(frame)
+        self._pipeline_stats['local'] = self._pipeline.stats()
+        self.frames_decoded += 1
+        if payloads:
+            self.frames_with_payload += 1
+        for data in payloads:
+            if data not in self._ready:
+                self._ready.append(data)
+
+    def collect(self, timeout: Optional[float] = 0) -> List[bytes]:
+        """
+        Returns the distinct payloads of all frames the workers finished since the
+        last call, waiting up to `timeout` seconds for at least one to finish.
+        """
+        busy = {slot.conn: slot for slot in self._slots if slot.busy}
+        payloads, self._ready = self._ready, []
+        if not busy:
+            return payloads
+        for conn in wait(list(busy), timeout):
+            slot = busy[conn]
+            try:
+                seq, frame_payloads, stats = conn.recv()
+            except (EOFError, OSError):
+                self._retire(slot)
+                continue
+            slot.busy = False
+            self._pipeline_stats[slot.process.name] = stats
+            self.frames_decoded += 1
+            if frame_payloads:
+                self.frames_with_payload += 1
+            for data in frame_payloads:
+                if data not in payloads:
+                    payloads.append(data)
+        self._dispatch()
+        for data in self._ready:
+            if data not in payloads:
+                payloads.append(data)
+        self._ready = []
+        return payloads
+
+    def decode(self, image: Any) -> List[bytes]:
+        """
+        Submits `image` and returns whatever results are ready, without waiting.
+        Results lag a frame or two behind the submitted frames.
+        """
+        self.submit(image)
+        return self.collect()
+
+    @property
+    def idle(self) -> bool:
+        return self._pending is None and not self._ready and not any(slot.busy for slot in self._slots)
+
+    def close(self) -> None:
+        for slot in self._slots:
+            try:
+                slot.conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        for slot in self._slots:
+            self._close_slot(slot)
+        self._slots = []
+        self._shape = None
+        self._dtype = None
+        self._pending = None
+
+    @staticmethod
+    def _close_slot(slot: _Slot) -> None:
+        slot.process.join(timeout=1)
+        if slot.process.is_alive():
+            slot.process.terminate()
+        slot.conn.close()
+        slot.view = None
+        slot.shm.close()
+        slot.shm.unlink()
+
+    def __enter__(self) -> 'ParallelFrameDecoder':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def pipeline_stats(self, stage: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        The latest `stage` statistics (see FramePipeline.stats) of every worker
+        that decoded a frame, including those that exited since, or None when
+        the stage is disabled.
+        """
+        stats = [worker[stage] for worker in self._pipeline_stats.values()]
+        return None if None in stats else stats
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'workers': self.workers,
+            'workers_lost': self.workers_lost,
+            'frames_submitted': self.frames_submitted,
+            'frames_dispatched': self.frames_dispatched,
+            'frames_dropped': self.frames_dropped,
+            'frames_decoded': self.frames_decoded,
+            'frames_with_payload': self.frames_with_payload,
+        }
@@ -0,0 +1,105 @@
+from logging import getLogger
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from xmrsigner.helpers.scan.strategy import Symbol
+from xmrsigner.helpers.scan.triage import count_finder_candidates, luminance
+
+
+logger = getLogger(__name__)
+
+
+def downscale(image: Any, factor: int) -> np.ndarray:
+    """
+    Grayscale copy of `image` reduced by `factor` with a box filter, which keeps
+    QR modules crisp enough for zbar while cutting the pixel count by factor².
+    """
+    if not hasattr(image, 'shape'):
+        return np.asarray(image.convert('L').reduce(factor))
+    gray = luminance(image)
+    height, width = gray.shape[0] // factor, gray.shape[1] // factor
+    blocks = gray[:height * factor, :width * factor].reshape(height, factor, width, factor)
+    return (blocks.sum(axis=(1, 3), dtype=np.uint32) // (factor * factor)).astype(np.uint8)
+
+
+class PyramidDecoder:
+    """
+    Decodes a frame coarse-to-fine.
+
+    Each level in `levels` is a downscale factor; 1 is the frame as captured. The
+    next finer level is only tried when the current one shows QR finder patterns
+    but did not decode (e.g. modules too small), so empty frames cost one cheap
+    coarse pass. A coarse level that keeps losing to a finer one for
+    `demote_after` frames in a row is skipped for the rest of the session.
+
+    `run` decodes the first level tried; the finer ones go to `run_more`, if
+    given, so a strategy scheduler counts the frame once and all levels share
+    its frame budget (see DecodeStrategyScheduler.run_more). A frame the finer
+    levels missed after `over_budget()` reports the budget spent also counts
+    as a loss of the coarse level, which used up the time they needed.
+    """
+
+    def __init__(self, levels: Sequence[int] = (2, 1), demote_after: int = 3):
+        self.levels = tuple(sorted(levels, reverse=True))
+        self.demote_after = demote_after
+        self.reset()
+
+    def reset(self) -> None:
+        self.start = 0
+        self.coarse_losses = 0
+        self.attempts = {factor: 0 for factor in self.levels}
+        self.hits = {factor: 0 for factor in self.levels}
+        self.no_finder = 0
+
+    def decode(
+            self,
+            image: Any,
+            run: Callable[[Any], List[Symbol]],
+            run_more: Optional[Callable[[Any], List[Symbol]]] = None,
+            over_budget: Optional[Callable[[], bool]] = None) -> List[Symbol]:
+        levels = self.levels[self.start:]
+        for i, factor in enumerate(levels):
+            level_image = image if factor == 1 else downscale(image, factor)
+            self.attempts[factor] += 1
+            symbols = (run_more if i and run_more else run)(level_image)
+            if symbols:
+                self.hits[factor] += 1
+                self._record_win(i)
+                if factor == 1:
+                    return symbols
+                return [
+                    Symbol(s.data, tuple(v * factor for v in s.rect) if s.rect else None)
+                    for s in symbols
+                ]
+            if factor == 1:
+                break
+            if count_finder_candidates(level_image < level_image.mean()) == 0:
+                self.no_finder += 1
+                return []
+        if i and over_budget is not None and over_budget():
+            self._record_coarse_loss()
+        return []
+
+    def _record_win(self, level_index: int) -> None:
+        if level_index == 0:
+            self.coarse_losses = 0
+            return
+        self._record_coarse_loss()
+
+    def _record_coarse_loss(self) -> None:
+        self.coarse_losses += 1
+        if self.coarse_losses >= self.demote_after and self.start < len(self.levels) - 1:
+            logger.debug('pyramid level /%d demoted', self.levels[self.start])
+            self.start += 1
+            self.coarse_losses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'levels': [
+                {'factor': factor, 'attempts': self.attempts[factor], 'hits': self.hits[factor]}
+                for factor in self.levels
+            ],
+            'start_factor': self.levels[self.start],
+            'no_finder': self.no_finder,
+        }
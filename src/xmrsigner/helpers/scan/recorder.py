@@ -0,0 +1,169 @@
+from collections import deque
+from glob import glob
+from logging import getLogger
+from os import makedirs, path
+from threading import Condition
+from time import strftime
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+
+import numpy as np
+
+from xmrsigner.models.threads import BaseThread
+
+
+logger = getLogger(__name__)
+
+
+# Recordings hold camera frames of whatever was scanned (possibly a SeedQR), so
+# by default they go to tmpfs and are gone after a power cycle.
+DEFAULT_RECORDING_DIRECTORY = '/tmp/xmrsigner-scans'
+# Status recorded for frames without a decode outcome
+NO_STATUS = -1
+
+
+class RecordedFrame(NamedTuple):
+    """
+    A camera frame of a scan session with its decode outcome: the
+    DecodeQRStatus value (NO_STATUS if none) and the seconds spent decoding it.
+    """
+    seq: int
+    timestamp: float
+    image: np.ndarray
+    status: int = NO_STATUS
+    decode_time: float = 0.0
+
+
+class ScanRecorder(BaseThread):
+    """
+    Records the frames of a scan session for offline replay.
+
+    `record()` only appends to a ring buffer of `capacity` frames, so the scan
+    never waits on storage; a background thread writes them out in chunks of
+    `chunk_size` frames as compressed numpy archives
+    (`scan-<session>-<chunk>.npz`, see `load_recording()`). When the writer
+    falls behind the oldest unwritten frames are dropped.
+
+    Only meant for debugging (`SETTING__DEBUG`): the frames show whatever was
+    scanned.
+    """
+
+    def __init__(
+            self,
+            directory: str = DEFAULT_RECORDING_DIRECTORY,
+            capacity: int = 30,
+            chunk_size: int = 10,
+            session: Optional[str] = None):
+        super().__init__()
+        self.directory = directory
+        self.capacity = capacity
+        self.chunk_size = chunk_size
+        self.session = session or strftime('%Y%m%d-%H%M%S')
+        self.keep_running = False
+        self._frames = deque()
+        self._pending = Condition()
+        self._chunk = 0
+        self.frames_recorded = 0
+        self.frames_written = 0
+        self.frames_dropped = 0
+        self.files: List[str] = []
+
+    def record(
+            self,
+            image: Any,
+            seq: int,
+            timestamp: float,
+            status: Optional[int] = None,
+            decode_time: float = 0.0) -> None:
+        """
+        Queues a frame for writing; never blocks on storage.
+        """
+        frame = RecordedFrame(
+            seq, timestamp, np.array(image, copy=True),
+            NO_STATUS if status is None else int(status), decode_time)
+        with self._pending:
+            if len(self._frames) >= self.capacity:
+                self._frames.popleft()
+                self.frames_dropped += 1
+            self._frames.append(frame)
+            self.frames_recorded += 1
+            if len(self._frames) >= self.chunk_size:
+                self._pending.notify()
+
+    def run(self):
+        while True:
+            with self._pending:
+                while self.keep_running and len(self._frames) < self.chunk_size:
+                    self._pending.wait()
+                frames = [self._frames.popleft() for i in range(min(self.chunk_size, len(self._frames)))]
+                done = not self.keep_running and not self._frames
+            if frames:
+                self._write(frames)
+            if done:
+                break
+
+    def stop(self):
+        """
+        Writes out the frames still buffered and stops.
+        """
+        super().stop()
+        with self._pending:
+            self._pending.notify_all()
+
+    def _write(self, frames: List[RecordedFrame]) -> None:
+        try:
+            makedirs(self.directory, exist_ok=True)
+            # One archive per run of equally sized frames
+            start = 0
+            for end in range(1, len(frames) + 1):
+                if end == len(frames) or frames[end].image.shape != frames[start].image.shape:
+                    self._write_chunk(frames[start:end])
+                    start = end
+        except OSError as e:
+            logger.warning('could not write scan recording to %s: %s', self.directory, e)
+
+    def _write_chunk(self, frames: List[RecordedFrame]) -> None:
+        filename = path.join(self.directory, f'scan-{self.session}-{self._chunk:04d}.npz')
+        self._chunk += 1
+        save_recording(filename, frames)
+        self.frames_written += len(frames)
+        self.files.append(filename)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'frames_recorded': self.frames_recorded,
+            'frames_written': self.frames_written,
+            'frames_dropped': self.frames_dropped,
+            'files': len(self.files),
+        }
+
+
+def save_recording(filename: str, frames: List[RecordedFrame]) -> None:
+    """
+    Writes equally sized frames to one compressed archive as read by
+    `load_recording()`.
+    """
+    np.savez_compressed(
+        filename,
+        images=np.stack([frame.image for frame in frames]),
+        seq=np.array([frame.seq for frame in frames], dtype=np.int64),
+        timestamp=np.array([frame.timestamp for frame in frames], dtype=np.float64),
+        status=np.array([frame.status for frame in frames], dtype=np.int8),
+        decode_time=np.array([frame.decode_time for frame in frames], dtype=np.float64))
+
+
+def load_recording(source: str) -> Iterator[RecordedFrame]:
+    """
+    Yields the frames of a recording in capture order. `source` is one archive
+    or a directory; from a directory all its `scan-*.npz` archives are read, in
+    session and chunk order.
+    """
+    if path.isdir(source):
+        filenames = sorted(glob(path.join(source, 'scan-*.npz')))
+    else:
+        filenames = [source]
+    for filename in filenames:
+        with np.load(filename) as archive:
+            images, seqs, timestamps = archive['images'], archive['seq'], archive['timestamp']
+            statuses, decode_times = archive['status'], archive['decode_time']
+        for i in range(len(seqs)):
+            yield RecordedFrame(int(seqs[i]), float(timestamps[i]), images[i], int(statuses[i]), float(decode_times[i]))
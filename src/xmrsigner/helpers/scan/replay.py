@@ -0,0 +1,179 @@
+from glob import glob
+from logging import getLogger
+from os import path
+from time import perf_counter, sleep
+from tracemalloc import get_traced_memory, is_tracing, start as start_tracing, stop as stop_tracing
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+from PIL import Image
+
+from xmrsigner.helpers.scan.recorder import RecordedFrame, load_recording
+from xmrsigner.helpers.scan.telemetry import percentiles
+
+
+logger = getLogger(__name__)
+
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+
+
+def load_frames(source: str, fps: float = 10.0) -> List[RecordedFrame]:
+    """
+    Loads the frames to replay from a scan recording (`.npz` archive or a
+    directory of them, see ScanRecorder) or from a directory of images, which
+    are taken as captured `fps` frames per second in file name order.
+    """
+    if source.endswith('.npz') or (path.isdir(source) and glob(path.join(source, 'scan-*.npz'))):
+        return list(load_recording(source))
+    if path.isdir(source):
+        filenames = sorted(f for f in glob(path.join(source, '*')) if f.lower().endswith(IMAGE_EXTENSIONS))
+    else:
+        filenames = [source]
+    return [
+        RecordedFrame(seq, seq / fps, np.asarray(Image.open(filename).convert('RGB')))
+        for seq, filename in enumerate(filenames)
+    ]
+
+
+def default_decoder(**options) -> Any:
+    from xmrsigner.models.decode_qr import DecodeQR
+    return DecodeQR(**options)
+
+
+class ScanReplay:
+    """
+    Feeds recorded frames through a DecodeQR, the way ScanScreen's scan engine
+    does, and measures the scan.
+
+    With `realtime` frames are offered at their original capture times and,
+    like from the camera, only the latest captured frame is decoded when the
+    decoder falls behind; otherwise every frame is decoded back to back.
+    With `live` the frames go through LiveQRScanner.scan_frame, else straight
+    through DecodeQR (which also times its stages separately). A frame the
+    decoder raises on (e.g. a stray QR code of another type mid-scan) is
+    counted as an error and the replay goes on.
+    """
+
+    def __init__(
+            self,
+            frames: Sequence[RecordedFrame],
+            realtime: bool = False,
+            live: bool = False,
+            decoder_factory: Callable[..., Any] = default_decoder,
+            trace_memory: bool = False,
+            **decoder_options):
+        self.frames = frames
+        self.realtime = realtime
+        self.live = live
+        self.decoder_factory = decoder_factory
+        self.trace_memory = trace_memory
+        self.decoder_options = decoder_options
+
+    def _offered(self) -> Iterable[tuple]:
+        """
+        Yields (frame, frames skipped before it, seconds it waited since capture).
+        """
+        if not self.realtime:
+            for frame in self.frames:
+                yield frame, 0, 0.0
+            return
+        base = self.frames[0].timestamp
+        start = perf_counter()
+        i = 0
+        while i < len(self.frames):
+            now = perf_counter() - start
+            captured = self.frames[i].timestamp - base
+            if captured > now:
+                # The camera has not captured it yet
+                sleep(captured - now)
+                continue
+            j = i
+            while j + 1 < len(self.frames) and self.frames[j + 1].timestamp - base <= now:
+                j += 1
+            yield self.frames[j], j - i, now - (self.frames[j].timestamp - base)
+            i = j + 1
+
+    def run(self) -> Dict[str, Any]:
+        tracing = self.trace_memory and not is_tracing()
+        if tracing:
+            start_tracing()
+        decoder = self.decoder_factory(**self.decoder_options)
+        scanner = None
+        if self.live:
+            from xmrsigner.helpers.live_qr_scanner import LiveQRScanner
+            scanner = LiveQRScanner(decoder=decoder)
+        frame_times, extract_times, add_times, waits = [], [], [], []
+        decoded = skipped = with_payload = errors = 0
+        start = perf_counter()
+        try:
+            for frame, frames_skipped, waited in self._offered():
+                skipped += frames_skipped
+                waits.append(waited)
+                frame_start = perf_counter()
+                try:
+                    if scanner:
+                        scanner.scan_frame(frame.image)
+                    else:
+                        payloads = decoder.extract_image_payloads(frame.image)
+                        extracted = perf_counter()
+                        extract_times.append(extracted - frame_start)
+                        if payloads:
+                            with_payload += 1
+                            decoder.add_payloads(payloads)
+                            add_times.append(perf_counter() - extracted)
+                except Exception as e:
+                    logger.warning('replay failed on frame %d: %s', frame.seq, e)
+                    errors += 1
+                frame_times.append(perf_counter() - frame_start)
+                decoded += 1
+                if decoder.is_complete or decoder.is_invalid:
+                    break
+            elapsed = perf_counter() - start
+        finally:
+            decoder.close()
+            if tracing:
+                peak = get_traced_memory()[1]
+                stop_tracing()
+        part_stats = decoder.get_part_stats() if hasattr(decoder, 'get_part_stats') else None
+        unique_parts = part_stats['unique'] if part_stats else None
+        result = {
+            'mode': ('realtime' if self.realtime else 'fast') + (' live' if self.live else ''),
+            'frames_available': len(self.frames),
+            'frames_decoded': decoded,
+            'frames_skipped': skipped,
+            'frames_with_payload': with_payload if not scanner else None,
+            'frames_with_error': errors,
+            'complete': bool(decoder.is_complete),
+            'qr_type': decoder.qr_type,
+            'time_to_complete_s': elapsed if decoder.is_complete else None,
+            'elapsed_s': elapsed,
+            'decoded_fps': decoded / elapsed if elapsed else None,
+            'frames_per_ur': decoded if decoder.is_complete and decoder.is_ur else None,
+            'parts_per_s': unique_parts / elapsed if unique_parts is not None and elapsed else None,
+            'parts': part_stats,
+            'latency_ms': {
+                'frame': percentiles(frame_times),
+                'extract': percentiles(extract_times),
+                'add_payloads': percentiles(add_times),
+                'wait': percentiles(waits) if self.realtime else None,
+            },
+            'peak_traced_memory_bytes': peak if tracing else None,
+            'max_rss_kb': max_rss_kb(),
+        }
+        for name in ('decode', 'triage', 'roi', 'pyramid', 'enhance', 'frame_cache', 'pool'):
+            getter = getattr(decoder, f'get_{name}_stats', None)
+            if getter:
+                result[f'{name}_stats'] = getter()
+        return result
+
+
+def max_rss_kb() -> Optional[int]:
+    """
+    Peak resident memory of this process so far (kilobytes), where available.
+    """
+    try:
+        from resource import RUSAGE_SELF, getrusage
+    except ImportError:
+        return None
+    return getrusage(RUSAGE_SELF).ru_maxrss
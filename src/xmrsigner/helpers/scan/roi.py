@@ -0,0 +1,106 @@
+from logging import getLogger
+from typing import Any, Dict, List, Optional, Tuple
+
+from xmrsigner.helpers.scan.strategy import Symbol
+
+
+logger = getLogger(__name__)
+
+
+def image_size(image: Any) -> Tuple[int, int]:
+    if hasattr(image, 'shape'):
+        return image.shape[1], image.shape[0]
+    return image.size
+
+
+def crop(image: Any, box: Tuple[int, int, int, int]) -> Any:
+    """
+    Crops a PIL image or numpy frame to `box` (left, top, right, bottom). Numpy
+    frames are sliced, so no pixels are copied.
+    """
+    left, top, right, bottom = box
+    if hasattr(image, 'shape'):
+        return image[top:bottom, left:right]
+    return image.crop(box)
+
+
+class RegionTracker:
+    """
+    Remembers where the QR code was in the last decoded frame so the next frames
+    can be decoded from a padded crop around it instead of the whole frame.
+
+    Animated QR senders barely move between parts, so the crop usually contains the
+    next part as well. After `max_misses` consecutive misses in the crop the region
+    is dropped and decoding falls back to the full frame.
+    """
+
+    def __init__(self, padding: float = 0.2, max_misses: int = 2):
+        self.padding = padding
+        self.max_misses = max_misses
+        self.reset()
+
+    def reset(self) -> None:
+        self.box = None
+        self.misses = 0
+        self.region_attempts = 0
+        self.region_hits = 0
+        self.full_attempts = 0
+        self.full_hits = 0
+        self.pixels_decoded = 0
+        self.pixels_full_frame = 0
+
+    def region(self, image: Any) -> Tuple[Any, Tuple[int, int]]:
+        """
+        Returns the image to decode next and the offset of its top-left corner in
+        the full frame.
+        """
+        width, height = image_size(image)
+        self.pixels_full_frame += width * height
+        if self.box is None:
+            self.full_attempts += 1
+            self.pixels_decoded += width * height
+            return image, (0, 0)
+        left, top, right, bottom = self.box
+        box = (max(0, left), max(0, top), min(width, right), min(height, bottom))
+        self.region_attempts += 1
+        self.pixels_decoded += (box[2] - box[0]) * (box[3] - box[1])
+        return crop(image, box), (box[0], box[1])
+
+    def update(self, symbols: List[Symbol], offset: Tuple[int, int]) -> None:
+        """
+        Records the outcome of decoding the image returned by `region()`.
+        """
+        rects = [s.rect for s in symbols if s.rect]
+        if symbols:
+            if self.box is not None:
+                self.region_hits += 1
+            else:
+                self.full_hits += 1
+            self.misses = 0
+            if rects:
+                self.box = self._padded_box(rects, offset)
+            return
+        if self.box is None:
+            return
+        self.misses += 1
+        if self.misses >= self.max_misses:
+            logger.debug('region lost after %d misses, back to full frame', self.misses)
+            self.box = None
+            self.misses = 0
+
+    def _padded_box(self, rects: List[Tuple[int, int, int, int]], offset: Tuple[int, int]) -> Tuple[int, int, int, int]:
+        left = min(r[0] for r in rects) + offset[0]
+        top = min(r[1] for r in rects) + offset[1]
+        right = max(r[0] + r[2] for r in rects) + offset[0]
+        bottom = max(r[1] + r[3] for r in rects) + offset[1]
+        pad = int(max(right - left, bottom - top) * self.padding)
+        return (left - pad, top - pad, right + pad, bottom + pad)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'region_attempts': self.region_attempts,
+            'region_hits': self.region_hits,
+            'full_attempts': self.full_attempts,
+            'full_hits': self.full_hits,
+            'pixel_ratio': self.pixels_decoded / self.pixels_full_frame if self.pixels_full_frame else 1.0,
+        }
@@ -0,0 +1,188 @@
+from dataclasses import dataclass, field
+from logging import getLogger
+from time import perf_counter
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+
+logger = getLogger(__name__)
+
+
+class Symbol(NamedTuple):
+    """
+    A decoded QR payload and its bounding box (left, top, width, height) in the
+    coordinates of the image it was decoded from, if the decoder reports one.
+    """
+    data: bytes
+    rect: Optional[Tuple[int, int, int, int]] = None
+
+
+@dataclass
+class DecodeStrategy:
+    """
+    One way of pulling QR payloads out of a camera frame (e.g. a zbar pass with
+    specific density settings, or the OpenCV detector).
+
+    `decode` receives the frame and returns a Symbol for every non-empty payload
+    it found.
+    Statistics are kept per scan session so the scheduler can learn which approach
+    works for the current camera/display combination.
+    """
+    name: str
+    decode: Callable[[Any], List[Symbol]]
+    attempts: int = 0
+    hits: int = 0
+    errors: int = 0
+    total_time: float = 0.0
+    recent_hit_rate: Optional[float] = None
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.attempts if self.attempts else 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        return self.total_time / self.attempts if self.attempts else 0.0
+
+    def record(self, hit: bool, elapsed: float, smoothing: float) -> None:
+        self.attempts += 1
+        self.total_time += elapsed
+        if hit:
+            self.hits += 1
+        sample = 1.0 if hit else 0.0
+        if self.recent_hit_rate is None:
+            self.recent_hit_rate = sample
+        else:
+            self.recent_hit_rate += smoothing * (sample - self.recent_hit_rate)
+
+    def reset(self) -> None:
+        self.attempts = 0
+        self.hits = 0
+        self.errors = 0
+        self.total_time = 0.0
+        self.recent_hit_rate = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'attempts': self.attempts,
+            'hits': self.hits,
+            'errors': self.errors,
+            'hit_rate': self.hit_rate,
+            'recent_hit_rate': self.recent_hit_rate,
+            'mean_latency_ms': self.mean_latency * 1000,
+        }
+
+
+@dataclass
+class DecodeStrategyScheduler:
+    """
+    Runs a list of DecodeStrategy against a frame, most successful first.
+
+    * Strategies are ordered by their recent (exponentially smoothed) hit rate for
+        this scan session; ties and untried strategies keep their declared order.
+    * The cascade stops at the first strategy that returns a payload.
+    * Once `frame_budget` seconds have been spent on a frame no further strategy is
+        started; the first strategy of each pass is always attempted.
+    * Further passes over the same frame (e.g. a finer pyramid level) go through
+        `run_more()`: the frame is counted once and they share its budget.
+    """
+    strategies: List[DecodeStrategy]
+    frame_budget: Optional[float] = None
+    smoothing: float = 0.2
+    frames: int = 0
+    frames_decoded: int = 0
+    frames_over_budget: int = 0
+    _rank: Dict[str, int] = field(default_factory=dict, repr=False)
+    _frame_start: Optional[float] = field(default=None, repr=False)
+    _frame_over_budget: bool = field(default=False, repr=False)
+
+    def __post_init__(self):
+        self._rank = {strategy.name: i for i, strategy in enumerate(self.strategies)}
+
+    def ordered(self) -> List[DecodeStrategy]:
+        # Untried strategies score just below a strategy that hit once so they are
+        # still explored before the ones that keep missing.
+        return sorted(
+            self.strategies,
+            key=lambda s: (
+                -(s.recent_hit_rate if s.recent_hit_rate is not None else self.smoothing),
+                self._rank[s.name]
+            )
+        )
+
+    def run(self, image: Any) -> List[Symbol]:
+        """
+        Decodes `image` as a new frame.
+        """
+        self.frames += 1
+        self._frame_start = perf_counter()
+        self._frame_over_budget = False
+        return self._run(image)
+
+    def run_more(self, image: Any) -> List[Symbol]:
+        """
+        Another pass over the frame of the last `run()`, e.g. a finer pyramid
+        level: not counted as a frame, and past its best ranked strategy only
+        within what is left of the frame budget.
+        """
+        if self._frame_start is None:
+            return self.run(image)
+        return self._run(image)
+
+    @property
+    def over_budget(self) -> bool:
+        """
+        Whether the current frame ran out of its budget.
+        """
+        return self._frame_over_budget
+
+    def _run(self, image: Any) -> List[Symbol]:
+        for i, strategy in enumerate(self.ordered()):
+            if i and self.frame_budget is not None and perf_counter() - self._frame_start >= self.frame_budget:
+                if not self._frame_over_budget:
+                    self._frame_over_budget = True
+                    self.frames_over_budget += 1
+                logger.debug('frame budget exhausted before %s', strategy.name)
+                break
+            strategy_start = perf_counter()
+            try:
+                payloads = strategy.decode(image)
+            except Exception as e:
+                logger.debug('decode strategy %s failed: %s', strategy.name, e)
+                strategy.errors += 1
+                payloads = []
+            strategy.record(bool(payloads), perf_counter() - strategy_start, self.smoothing)
+            if payloads:
+                self.frames_decoded += 1
+                return payloads
+        return []
+
+    def run_best(self, image: Any) -> List[Symbol]:
+        """
+        Runs only the currently best ranked strategy, for extra passes over a
+        preprocessed copy of a frame that already missed. Not counted in the
+        statistics.
+        """
+        strategy = self.ordered()[0]
+        try:
+            return strategy.decode(image)
+        except Exception as e:
+            logger.debug('decode strategy %s failed: %s', strategy.name, e)
+            return []
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'frames': self.frames,
+            'frames_decoded': self.frames_decoded,
+            'frames_over_budget': self.frames_over_budget,
+            'strategies': [strategy.to_dict() for strategy in self.ordered()],
+        }
+
+    def reset(self) -> None:
+        self.frames = 0
+        self.frames_decoded = 0
+        self.frames_over_budget = 0
+        self._frame_start = None
+        self._frame_over_budget = False
+        for strategy in self.strategies:
+            strategy.reset()
@@ -0,0 +1,206 @@
+from collections import deque
+from json import dump
+from logging import getLogger
+from os import makedirs, path
+from threading import Lock
+from time import monotonic
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from xmrsigner.models.base_decoder import DecodeQRStatus
+
+
+logger = getLogger(__name__)
+
+
+PERCENTILES = (50, 90, 99)
+
+
+def percentiles(values: Sequence[float], points: Sequence[int] = PERCENTILES) -> Optional[Dict[str, float]]:
+    """
+    {'p50': ..., 'p90': ..., 'p99': ..., 'max': ...} of `values` in milliseconds,
+    or None without values.
+    """
+    if not len(values):
+        return None
+    ms = np.asarray(values, dtype=np.float64) * 1000
+    result = {f'p{point}': float(np.percentile(ms, point)) for point in points}
+    result['max'] = float(ms.max())
+    return result
+
+
+class ScanTelemetry:
+    """
+    What limits a scan, updated after every decoded frame.
+
+    Counts the camera frames decoded, dropped (captured while the previous one
+    was being decoded) and without a readable QR code, the time from capture to
+    decoded, and for animated URs the fragments recovered, the backlog of mixed
+    parts the fountain code still has to reduce and the repeated parts.
+    `limited_by()` reads them as which of the camera, the decoder, the sender's
+    display or the fountain code held the scan back.
+
+    Written by the decoding thread only; `snapshot()` may be called from any.
+    """
+    # Recent frames kept for the latency percentiles
+    LATENCY_WINDOW = 100
+    # Unique parts per fragment after which a fountain code would usually have
+    # completed (see FountainDecoder.estimated_percent_complete)
+    FOUNTAIN_OVERHEAD = 1.75
+
+    def __init__(self):
+        self._lock = Lock()
+        self.started = monotonic()
+        self.frames_decoded = 0
+        self.frames_dropped = 0
+        self.frames_without_qr = 0
+        self.first_captured: Optional[float] = None
+        self.last_captured: Optional[float] = None
+        self._first_seq = None
+        self._last_seq = None
+        self.latencies = deque(maxlen=ScanTelemetry.LATENCY_WINDOW)
+        self.decode_times = deque(maxlen=ScanTelemetry.LATENCY_WINDOW)
+        self.total_decode_time = 0.0
+        self.fragments_recovered = 0
+        self.fragments_total = 0
+        self.mixed_backlog = 0
+        self.max_mixed_backlog = 0
+        self.parts_unique = 0
+        self.parts_duplicate = 0
+        self.first_part_at: Optional[float] = None
+        self.completed_at: Optional[float] = None
+
+    def record_frame(
+            self,
+            seq: int,
+            captured_at: float,
+            decode_time: float,
+            status: Optional[DecodeQRStatus],
+            ur_decoder: Any = None,
+            now: Optional[float] = None) -> None:
+        """
+        Adds a decoded frame: its `seq` and `captured_at` (`time.monotonic()`) as
+        captured, the seconds spent decoding it, the decode status and the
+        URDecoder of the scan, if scanning an animated UR.
+        """
+        now = monotonic() if now is None else now
+        with self._lock:
+            self.frames_decoded += 1
+            if self._last_seq is not None and seq > self._last_seq:
+                self.frames_dropped += seq - self._last_seq - 1
+            if self._first_seq is None:
+                self._first_seq, self.first_captured = seq, captured_at
+            self._last_seq, self.last_captured = seq, captured_at
+            if status == DecodeQRStatus.FALSE:
+                self.frames_without_qr += 1
+            self.latencies.append(now - captured_at)
+            self.decode_times.append(decode_time)
+            self.total_decode_time += decode_time
+            if ur_decoder is not None:
+                self._record_fountain(ur_decoder, now)
+            if status == DecodeQRStatus.COMPLETE and self.completed_at is None:
+                self.completed_at = now
+
+    def _record_fountain(self, ur_decoder: Any, now: float) -> None:
+        if ur_decoder.fountain_decoder.expected_part_indexes is None:
+            return
+        if self.first_part_at is None:
+            self.first_part_at = now
+        self.fragments_total = ur_decoder.expected_part_count()
+        self.fragments_recovered = len(ur_decoder.received_part_indexes())
+        self.mixed_backlog = ur_decoder.mixed_part_count()
+        self.max_mixed_backlog = max(self.max_mixed_backlog, self.mixed_backlog)
+        stats = ur_decoder.part_stats()
+        self.parts_unique, self.parts_duplicate = stats['unique'], stats['duplicates']
+
+    def capture_fps(self) -> Optional[float]:
+        """
+        Frames per second the camera captured, whether decoded or not.
+        """
+        if self._first_seq is None or self.last_captured <= self.first_captured:
+            return None
+        return (self._last_seq - self._first_seq) / (self.last_captured - self.first_captured)
+
+    def limited_by(self) -> Optional[str]:
+        """
+        'camera' when most frames hold no readable QR code or the decoder sits
+        idle waiting for frames, 'decode' when the decoder misses a third of the
+        frames or more, 'display' when most parts decoded were repeats (the
+        sender animates slower than we decode), 'fountain' when the parts
+        received should have sufficed; None before enough frames were decoded.
+        """
+        if self.frames_decoded < 10:
+            return None
+        captured = self.frames_decoded + self.frames_dropped
+        if self.frames_without_qr >= self.frames_decoded / 2:
+            return 'camera'
+        if self.frames_dropped >= captured / 3:
+            return 'decode'
+        parts = self.parts_unique + self.parts_duplicate
+        if parts and self.parts_duplicate >= parts / 2:
+            return 'display'
+        if self.fragments_total and self.completed_at is None and self.parts_unique > self.fragments_total * ScanTelemetry.FOUNTAIN_OVERHEAD:
+            return 'fountain'
+        capture_fps = self.capture_fps()
+        if capture_fps and self.total_decode_time / self.frames_decoded < 0.5 / capture_fps:
+            return 'camera'
+        return None
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            now = monotonic()
+            end = self.completed_at or now
+            elapsed = end - self.started
+            return {
+                'elapsed_s': elapsed,
+                'frames_decoded': self.frames_decoded,
+                'frames_dropped': self.frames_dropped,
+                'frames_without_qr': self.frames_without_qr,
+                'capture_fps': self.capture_fps(),
+                'decode_fps': self.frames_decoded / elapsed if elapsed > 0 else None,
+                'fragments_recovered': self.fragments_recovered,
+                'fragments_total': self.fragments_total,
+                'mixed_backlog': self.mixed_backlog,
+                'max_mixed_backlog': self.max_mixed_backlog,
+                'parts_unique': self.parts_unique,
+                'parts_duplicate': self.parts_duplicate,
+                'time_to_first_part_s': self.first_part_at - self.started if self.first_part_at is not None else None,
+                'time_to_complete_s': self.completed_at - self.started if self.completed_at is not None else None,
+                'latency_ms': {
+                    'capture_to_decoded': percentiles(self.latencies),
+                    'decode': percentiles(self.decode_times),
+                },
+                'limited_by': self.limited_by(),
+            }
+
+    def overlay_lines(self) -> List[str]:
+        """
+        The telemetry in a few short lines for the live preview.
+        """
+        with self._lock:
+            latency = np.median(self.latencies) * 1000 if self.latencies else 0
+            decode = np.median(self.decode_times) * 1000 if self.decode_times else 0
+            lines = [
+                f'frag {self.fragments_recovered}/{self.fragments_total} mix {self.mixed_backlog}',
+                f'uniq {self.parts_unique} dup {self.parts_duplicate} noqr {self.frames_without_qr}',
+                f'dec {decode:.0f}ms lat {latency:.0f}ms drop {self.frames_dropped}',
+            ]
+        limit = self.limited_by()
+        if limit:
+            lines.append(f'limit: {limit}')
+        return lines
+
+    def export(self, filename: str) -> Optional[str]:
+        """
+        Writes the snapshot as JSON; returns the file name, or None if it could
+        not be written.
+        """
+        try:
+            makedirs(path.dirname(filename) or '.', exist_ok=True)
+            with open(filename, 'w') as f:
+                dump(self.snapshot(), f, indent=4)
+        except OSError as e:
+            logger.warning('could not write scan telemetry to %s: %s', filename, e)
+            return None
+        return filename
@@ -0,0 +1,180 @@
+from dataclasses import dataclass
+from logging import getLogger
+from typing import Any, Dict
+
+import numpy as np
+
+
+logger = getLogger(__name__)
+
+
+def luminance(image: Any, step: int = 1) -> np.ndarray:
+    """
+    Returns a uint8 luminance copy of a PIL image or an RGB/grayscale numpy frame,
+    decimated by `step` in both directions.
+    """
+    if hasattr(image, 'shape'):
+        frame = image[::step, ::step]
+        if frame.ndim == 2:
+            return np.ascontiguousarray(frame, dtype=np.uint8)
+        # ITU-R BT.601 weights in 8 bit fixed point
+        rgb = frame[..., :3].astype(np.uint16)
+        return ((rgb[..., 0] * 77 + rgb[..., 1] * 150 + rgb[..., 2] * 29) >> 8).astype(np.uint8)
+    return np.asarray(image.convert('L'))[::step, ::step]
+
+
+def laplacian_variance(gray: np.ndarray) -> float:
+    """
+    Variance of the 4-neighbour Laplacian; drops sharply on motion blur.
+    """
+    g = gray.astype(np.int16)
+    lap = 4 * g[1:-1, 1:-1] - g[:-2, 1:-1] - g[2:, 1:-1] - g[1:-1, :-2] - g[1:-1, 2:]
+    return float(lap.var())
+
+
+def finder_run_centers(dark: np.ndarray) -> np.ndarray:
+    """
+    Finds 1:1:3:1:1 dark/light/dark/light/dark run sequences along the rows of a
+    binarized image, the signature of a QR finder pattern crossing.
+
+    Returns the flat index of the centre pixel of every match.
+    """
+    height, width = dark.shape
+    if height == 0 or width < 7:
+        return np.empty(0, dtype=np.intp)
+    # A run starts at every colour change and at the beginning of every row
+    change = np.ones(dark.shape, dtype=bool)
+    change[:, 1:] = dark[:, 1:] != dark[:, :-1]
+    starts = np.flatnonzero(change)
+    if len(starts) < 5:
+        return np.empty(0, dtype=np.intp)
+    lengths = np.diff(np.append(starts, dark.size))
+    rows = starts // width
+    values = dark.ravel()[starts]
+
+    # Windows of five consecutive runs within one row, starting on a dark run
+    r = np.lib.stride_tricks.sliding_window_view(lengths, 5)
+    total = r.sum(axis=1)
+    unit = total / 7.0
+    tolerance = np.maximum(unit * 0.5, 0.75)
+    match = (
+        (rows[:-4] == rows[4:])
+        & values[:-4]
+        & (total >= 7)
+        & (np.abs(r[:, [0, 1, 3, 4]] - unit[:, None]) < tolerance[:, None]).all(axis=1)
+        & (np.abs(r[:, 2] - 3 * unit) < 3 * tolerance)
+    )
+    hits = np.flatnonzero(match)
+    return starts[hits + 2] + lengths[hits + 2] // 2
+
+
+def count_finder_candidates(dark: np.ndarray) -> int:
+    """
+    Counts finder pattern candidates: horizontal 1:1:3:1:1 crossings whose centre
+    is confirmed (within a pixel) by a vertical crossing.
+    """
+    height, width = dark.shape
+    horizontal = np.zeros(dark.shape, dtype=bool)
+    horizontal.ravel()[finder_run_centers(dark)] = True
+    vertical = np.zeros((width, height), dtype=bool)
+    vertical.ravel()[finder_run_centers(np.ascontiguousarray(dark.T))] = True
+    vertical = vertical.T
+    # Allow the two centres to be one pixel apart in either direction
+    grown = vertical.copy()
+    grown[1:, :] |= vertical[:-1, :]
+    grown[:-1, :] |= vertical[1:, :]
+    grown[:, 1:] |= grown[:, :-1].copy()
+    grown[:, :-1] |= grown[:, 1:].copy()
+    return int(np.count_nonzero(horizontal & grown))
+
+
+@dataclass
+class TriageResult:
+    accepted: bool
+    sharpness: float = 0.0
+    finder_candidates: int = 0
+    reason: str = None
+
+
+class FrameTriage:
+    """
+    Cheap numpy pre-filter run on a decimated luminance copy of each camera frame
+    before any QR decoder sees it.
+
+    Frames are rejected when they are too blurry (Laplacian variance below
+    `min_sharpness`) or when no QR finder pattern candidate is visible. After
+    `max_consecutive_rejects` rejections a frame is let through anyway so a
+    miscalibrated threshold can slow scanning down but never block it.
+    """
+
+    REASON__BLUR = 'blur'
+    REASON__NO_FINDER = 'no_finder'
+
+    def __init__(
+            self,
+            target_width: int = 160,
+            min_sharpness: float = 25.0,
+            min_finder_candidates: int = 1,
+            max_consecutive_rejects: int = 8):
+        self.target_width = target_width
+        self.min_sharpness = min_sharpness
+        self.min_finder_candidates = min_finder_candidates
+        self.max_consecutive_rejects = max_consecutive_rejects
+        self.reset()
+
+    def reset(self) -> None:
+        self.frames = 0
+        self.rejected_blur = 0
+        self.rejected_no_finder = 0
+        self.forced = 0
+        self.consecutive_rejects = 0
+        self.last_result = None
+
+    @property
+    def rejected(self) -> int:
+        return self.rejected_blur + self.rejected_no_finder
+
+    def analyze(self, image: Any) -> TriageResult:
+        width = image.shape[1] if hasattr(image, 'shape') else image.width
+        gray = luminance(image, max(1, width // self.target_width))
+        sharpness = laplacian_variance(gray)
+        if sharpness < self.min_sharpness:
+            return TriageResult(False, sharpness, 0, FrameTriage.REASON__BLUR)
+        dark = gray < gray.mean()
+        candidates = count_finder_candidates(dark)
+        if candidates < self.min_finder_candidates:
+            return TriageResult(False, sharpness, candidates, FrameTriage.REASON__NO_FINDER)
+        return TriageResult(True, sharpness, candidates)
+
+    def check(self, image: Any) -> TriageResult:
+        """
+        Analyzes `image` and updates the counters; returns the (possibly forced)
+        result.
+        """
+        self.frames += 1
+        result = self.analyze(image)
+        if result.accepted:
+            self.consecutive_rejects = 0
+        elif self.consecutive_rejects >= self.max_consecutive_rejects:
+            self.consecutive_rejects = 0
+            self.forced += 1
+            result.accepted = True
+        else:
+            self.consecutive_rejects += 1
+            if result.reason == FrameTriage.REASON__BLUR:
+                self.rejected_blur += 1
+            else:
+                self.rejected_no_finder += 1
+            logger.debug('frame rejected by triage: %s (sharpness %.1f)', result.reason, result.sharpness)
+        self.last_result = result
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'frames': self.frames,
+            'rejected': self.rejected,
+            'rejected_blur': self.rejected_blur,
+            'rejected_no_finder': self.rejected_no_finder,
+            'forced': self.forced,
+            'reject_rate': self.rejected / self.frames if self.frames else 0.0,
+        }
@@ -0,0 +1,134 @@
+from ctypes import c_void_p, string_at
+from logging import getLogger
+from typing import Any, Iterable, List, Optional
+
+import numpy as np
+
+from pyzbar.pyzbar_error import PyZbarError
+from pyzbar.wrapper import (
+    ZBarConfig, ZBarSymbol,
+    zbar_image_scanner_create, zbar_image_scanner_destroy, zbar_image_scanner_set_config,
+    zbar_image_create, zbar_image_destroy, zbar_image_set_format, zbar_image_set_size,
+    zbar_image_set_data, zbar_scan_image, zbar_image_first_symbol, zbar_symbol_next,
+    zbar_symbol_get_data, zbar_symbol_get_data_length,
+    zbar_symbol_get_loc_size, zbar_symbol_get_loc_x, zbar_symbol_get_loc_y,
+)
+
+from xmrsigner.helpers.scan.strategy import Symbol
+
+
+logger = getLogger(__name__)
+
+
+# zbar's 'Y800' fourcc: 8 bit grayscale, one byte per pixel
+FOURCC_Y800 = 808466521
+# Upstream pyzbar predates zbar 0.23 and does not list the binary QR option;
+# in zbar.h it follows CFG_ASCII.
+CFG_BINARY = getattr(ZBarConfig, 'CFG_BINARY', 4)
+
+
+class ZbarScanner:
+    """
+    A zbar image scanner that is configured once and then fed frame after frame.
+
+    `pyzbar.decode` creates a scanner, re-applies the symbology configuration and
+    creates a zbar image on every call. A scan session instead keeps one
+    ZbarScanner per configuration and copies each frame into a reusable grayscale
+    buffer that zbar reads in place.
+
+    Like pyzbar, colour frames are reduced to their first channel. Not thread
+    safe; a scanner belongs to the thread driving its scan session.
+    """
+
+    def __init__(
+            self,
+            symbols: Optional[Iterable[ZBarSymbol]] = (ZBarSymbol.QRCODE,),
+            binary: bool = False,
+            density: Optional[int] = None):
+        self.symbols = tuple(symbols) if symbols else None
+        self.binary = binary
+        self.density = density
+        self._buffer = None
+        self._scanner = zbar_image_scanner_create()
+        if not self._scanner:
+            raise PyZbarError('Could not create image scanner')
+        self._image = zbar_image_create()
+        if not self._image:
+            zbar_image_scanner_destroy(self._scanner)
+            self._scanner = None
+            raise PyZbarError('Could not create zbar image')
+        zbar_image_set_format(self._image, FOURCC_Y800)
+        self._configure()
+
+    def _configure(self) -> None:
+        if self.symbols:
+            for symbol in ZBarSymbol:
+                zbar_image_scanner_set_config(self._scanner, symbol, ZBarConfig.CFG_ENABLE, int(symbol in self.symbols))
+        if self.binary:
+            zbar_image_scanner_set_config(self._scanner, ZBarSymbol.QRCODE, CFG_BINARY, 1)
+        if self.density:
+            zbar_image_scanner_set_config(self._scanner, ZBarSymbol.NONE, ZBarConfig.CFG_X_DENSITY, self.density)
+            zbar_image_scanner_set_config(self._scanner, ZBarSymbol.NONE, ZBarConfig.CFG_Y_DENSITY, self.density)
+
+    def _load(self, image: Any) -> np.ndarray:
+        """
+        Copies `image` (numpy frame, crop or PIL image) into the grayscale buffer,
+        reallocating it only when the frame size changes.
+        """
+        if not hasattr(image, 'shape'):
+            image = np.asarray(image if image.mode == 'L' else image.convert('L'))
+        elif image.ndim == 3:
+            image = image[:, :, 0]
+        if self._buffer is None or self._buffer.shape != image.shape:
+            self._buffer = np.empty(image.shape, dtype=np.uint8)
+            zbar_image_set_size(self._image, image.shape[1], image.shape[0])
+            zbar_image_set_data(self._image, c_void_p(self._buffer.ctypes.data), self._buffer.nbytes, None)
+        np.copyto(self._buffer, image, casting='unsafe')
+        return self._buffer
+
+    def decode(self, image: Any) -> List[Symbol]:
+        if self._scanner is None:
+            raise PyZbarError('Scanner is closed')
+        self._load(image)
+        if zbar_scan_image(self._scanner, self._image) < 0:
+            raise PyZbarError('Unsupported image format')
+        symbols = []
+        symbol = zbar_image_first_symbol(self._image)
+        while symbol:
+            length = zbar_symbol_get_data_length(symbol)
+            if length:
+                symbols.append(Symbol(string_at(zbar_symbol_get_data(symbol), length), self._rect(symbol)))
+            symbol = zbar_symbol_next(symbol)
+        return symbols
+
+    @staticmethod
+    def _rect(symbol) -> Optional[tuple]:
+        points = range(zbar_symbol_get_loc_size(symbol))
+        xs = [zbar_symbol_get_loc_x(symbol, i) for i in points]
+        ys = [zbar_symbol_get_loc_y(symbol, i) for i in points]
+        if not xs:
+            return None
+        return (min(xs), min(ys), max(xs) - min(xs), max(ys) - min(ys))
+
+    __call__ = decode
+
+    def close(self) -> None:
+        if self._image is not None:
+            zbar_image_destroy(self._image)
+            self._image = None
+        if self._scanner is not None:
+            zbar_image_scanner_destroy(self._scanner)
+            self._scanner = None
+        self._buffer = None
+
+    def __enter__(self) -> 'ZbarScanner':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
@@ -5,6 +5,11 @@
 # Licensed under the "BSD-2-Clause Plus Patent License"
 #
 
+try:
+    from zlib import crc32 as zlib_crc32
+except ImportError:
+    zlib_crc32 = None
+
 from .constants import MAX_UINT32
 
 def bit_length(n):
@@ -12,7 +17,12 @@ def bit_length(n):
 
 TABLE = None
 
-def crc32(buf):
+# CRC-32 of `buf`; pass the CRC of the preceding data as `crc` to checksum a
+# message piece by piece: crc32(b, crc32(a)) == crc32(a + b)
+def crc32(buf, crc=0):
+    if zlib_crc32 is not None:
+        return zlib_crc32(buf, crc)
+
     # Lazily instantiate CRC table
     global TABLE
     if TABLE == None:
@@ -25,7 +35,7 @@ def crc32(buf):
 
             TABLE[i] = c
 
-    crc = MAX_UINT32 & ~0
+    crc = MAX_UINT32 & ~crc
     for byte in buf:
         crc = (crc >> 8) ^ TABLE[(crc ^ byte) & 0xFF]
 
@@ -5,8 +5,10 @@
 # Licensed under the "BSD-2-Clause Plus Patent License"
 #
 
-from .fountain_utils import choose_fragments, contains, is_strict_subset, set_difference
-from .utils import join_lists, join_bytes, crc32_int, xor_with, take_first
+from collections import deque
+from .fountain_utils import choose_fragment_mask, is_single_index, mask_to_indexes
+from .gf2 import GF2Basis
+from .utils import crc32_int, bytes_to_int, int_to_fragment
 
 class InvalidPart(Exception):
     pass
@@ -15,45 +17,73 @@ class InvalidChecksum(Exception):
     pass
 
 class FountainDecoder:
+    # The fragments mixed into a part are an integer bitmask (bit `i` for
+    # fragment `i`) and its data an int (see utils.xor_into), so reducing a
+    # part is one XOR each. Mixed parts are indexed by the fragments they
+    # contain, so solving a fragment only reduces the parts it is mixed into.
+    # Their ids follow the order the original list based decoder kept them in,
+    # and reductions run in that order, so peeling solves the same fragments
+    # after the same parts as it did.
     class Part:
-        def __init__(self, indexes, data):
-            self.indexes = frozenset(indexes)
-            self.data = data
-        
+        __slots__ = ('mask', 'value')
+
+        def __init__(self, mask, value):
+            self.mask = mask
+            self.value = value
+
         @classmethod
         def from_encoder_part(cls, p):
-            return cls(choose_fragments(p.seq_num, p.seq_len, p.checksum), p.data[:])
+            return cls(choose_fragment_mask(p.seq_num, p.seq_len, p.checksum), bytes_to_int(p.data))
 
+        @property
         def indexes(self):
-            return self.indexes
-
-        def data(self):
-            return self.data
+            return frozenset(mask_to_indexes(self.mask))
 
         def is_simple(self):
-            return len(self.indexes) == 1
+            return is_single_index(self.mask)
 
         def index(self):
-            # TODO: Not efficient
-            return list(self.indexes)[0]
+            return self.mask.bit_length() - 1
 
     # FountainDecoder
-    def __init__(self):
+    # Solved fragments are written straight to their offset in `message`, one
+    # buffer of the padded message size allocated with the first part, and the
+    # checksum is advanced over the fragments solved so far in order; the
+    # result is a memoryview of the buffer without the padding.
+    # With `elimination` every part is also added to a GF(2) system; when
+    # peeling stalls but the parts received already determine every fragment,
+    # the message is solved from it instead of waiting for more parts.
+    def __init__(self, elimination=True):
         self.received_part_indexes = set()
+        self.received_mask = 0
         self.last_part_indexes = None
         self.processed_parts_count = 0
         self.result = None
         self.expected_part_indexes = None
+        self.expected_mask = None
         self.expected_fragment_len = None
         self.expected_message_len = None
         self.expected_checksum = None
-        self.simple_parts = {}
+        self.message = None
+        # CRC of the first `checksummed_count` fragments of the message
+        self.message_crc = 0
+        self.checksummed_count = 0
+        # id -> mixed part, mask -> id of the mixed part and
+        # fragment index -> ids of the mixed parts it is mixed into
         self.mixed_parts = {}
-        self.queued_parts = []
+        self.mixed_masks = {}
+        self.mixed_by_fragment = None
+        self.next_mixed_id = 0
+        self.queued_parts = deque()
+        self.elimination = GF2Basis() if elimination else None
+        self.solved_by_elimination = False
 
     def expected_part_count(self):
         return len(self.expected_part_indexes)  # TODO: Handle None?
 
+    def mixed_part_count(self):
+        return len(self.mixed_parts)
+
     def is_success(self):
         result = self.result
         return result if not isinstance(result, Exception) else False
@@ -81,7 +111,7 @@ class FountainDecoder:
 
     def receive_part(self, encoder_part):
         print(f"DEBUG: FountainDecoder receiving part - seq_num: {encoder_part.seq_num}, seq_len: {encoder_part.seq_len}")
-        
+
         # Don't process the part if we're already done
         if self.is_complete():
             print("DEBUG: FountainDecoder already complete, skipping part")
@@ -94,146 +124,187 @@ class FountainDecoder:
 
         # Add this part to the queue
         p = FountainDecoder.Part.from_encoder_part(encoder_part)
-        print(f"DEBUG: Created FountainDecoder part with indexes: {p.indexes}")
         self.last_part_indexes = p.indexes
+        if self.elimination is not None:
+            # Before peeling reduces the part
+            self.elimination.add(p.mask, p.value)
         self.enqueue(p)
 
         # Process the queue until we're done or the queue is empty
-        print(f"DEBUG: Processing queue - items: {len(self.queued_parts)}")
         while not self.is_complete() and len(self.queued_parts) != 0:
             self.process_queue_item()
 
+        # Peeling is stuck but the parts determine every fragment
+        if not self.is_complete() and self.elimination is not None and self.elimination.is_determined(self.expected_mask):
+            self.solve_by_elimination()
+
         # Keep track of how many parts we've processed
         self.processed_parts_count += 1
-        print(f"DEBUG: Processed parts count: {self.processed_parts_count}")
-
-        # self.print_part_end()
+        print(f"DEBUG: Processed parts count: {self.processed_parts_count}, received: {len(self.received_part_indexes)}, mixed: {len(self.mixed_parts)}")
 
         return True
 
-    # Join all the fragments of a message together, throwing away any padding
-    @staticmethod
-    def join_fragments(fragments, message_len):
-        message = join_bytes(fragments)
-        return take_first(message, message_len)
+    def fragment(self, index):
+        start = index * self.expected_fragment_len
+        return memoryview(self.message)[start:start + self.expected_fragment_len]
+
+    def fragment_value(self, index):
+        return bytes_to_int(self.fragment(index))
+
+    def store_fragment(self, index, value):
+        self.fragment(index)[:] = int_to_fragment(value, self.expected_fragment_len)
+        self.received_part_indexes.add(index)
+        self.received_mask |= 1 << index
+
+        # Checksum the fragments now contiguous from the start of the message,
+        # leaving out the padding of the last one
+        while self.checksummed_count in self.received_part_indexes:
+            start = self.checksummed_count * self.expected_fragment_len
+            end = min(start + self.expected_fragment_len, self.expected_message_len)
+            self.message_crc = crc32_int(memoryview(self.message)[start:end], self.message_crc)
+            self.checksummed_count += 1
 
     def enqueue(self, p):
         self.queued_parts.append(p)
 
     def process_queue_item(self):
-        part = self.queued_parts.pop(0)
-        print(f"DEBUG: Processing queue item - part indexes: {part.indexes}")
-        # self.print_part(part)
-
+        part = self.queued_parts.popleft()
         if part.is_simple():
-            print("DEBUG: Processing simple part")
             self.process_simple_part(part)
         else:
-            print("DEBUG: Processing mixed part")
             self.process_mixed_part(part)
-        # self.print_state()
 
-    def reduce_mixed_by(self, p):
-        # Reduce all the current mixed parts by the given part
-        reduced_parts = []
-        for value in self.mixed_parts.values():
-            reduced_parts.append(self.reduce_part_by_part(value, p))
-
-        # Collect all the remaining mixed parts
-        new_mixed = {}
-        for reduced_part in reduced_parts:
-            # If this reduced part is now simple
-            if reduced_part.is_simple():
-                # Add it to the queue
-                self.enqueue(reduced_part)
+    def add_mixed(self, p):
+        mixed_id = self.next_mixed_id
+        self.next_mixed_id += 1
+        self.mixed_parts[mixed_id] = p
+        self.mixed_masks[p.mask] = mixed_id
+        for i in mask_to_indexes(p.mask):
+            self.mixed_by_fragment[i].add(mixed_id)
+
+    def remove_mixed(self, mixed_id, mask):
+        # Unlinks the mixed part from the fragments in `mask`, and drops it
+        # when that leaves it with none
+        p = self.mixed_parts[mixed_id]
+        for i in mask_to_indexes(mask):
+            self.mixed_by_fragment[i].discard(mixed_id)
+        if mask == p.mask:
+            del self.mixed_parts[mixed_id]
+
+    def reduce_mixed_part(self, mixed_id, p):
+        # Reduces the mixed part `mixed_id` by `p`, whose fragments are a strict
+        # subset of its own: the fragments of `p` are XORed out
+        r = self.mixed_parts[mixed_id]
+        del self.mixed_masks[r.mask]
+        self.remove_mixed(mixed_id, p.mask)
+        r.mask ^= p.mask
+        r.value ^= p.value
+        if r.is_simple():
+            # Now a solved fragment
+            self.remove_mixed(mixed_id, r.mask)
+            self.enqueue(r)
+        elif r.mask in self.mixed_masks:
+            # Reduced to a part we already have: the one first in order stays,
+            # with the data of the later one
+            other_id = self.mixed_masks[r.mask]
+            if other_id < mixed_id:
+                self.mixed_parts[other_id].value = r.value
+                self.remove_mixed(mixed_id, r.mask)
             else:
-                # Otherwise, add it to the dict of current mixed parts
-                new_mixed[reduced_part.indexes] = reduced_part
-
-        self.mixed_parts = new_mixed
-
-    def reduce_part_by_part(self, a, b):
-        # If the fragments mixed into `b` are a strict (proper) subset of those in `a`...
-        if is_strict_subset(b.indexes, a.indexes):
-            # The new fragments in the revised part are `a` - `b`.
-            new_indexes = set_difference(a.indexes, b.indexes)
-            # The new data in the revised part are `a` XOR `b`
-            new_data = xor_with(bytearray(a.data), b.data)
-            return self.Part(new_indexes, new_data)
+                r.value = self.mixed_parts[other_id].value
+                self.remove_mixed(other_id, r.mask)
+                self.mixed_masks[r.mask] = mixed_id
         else:
-            # `a` is not reducable by `b`, so return a
-            return a
+            self.mixed_masks[r.mask] = mixed_id
+
+    def reduce_mixed_by(self, p):
+        # Reduce all the mixed parts containing the fragments of `p` by it
+        fragments = mask_to_indexes(p.mask)
+        candidates = min((self.mixed_by_fragment[i] for i in fragments), key=len)
+        for mixed_id in sorted(candidates):
+            r = self.mixed_parts[mixed_id]
+            if r.mask & p.mask == p.mask and r.mask != p.mask:
+                self.reduce_mixed_part(mixed_id, p)
 
     def process_simple_part(self, p):
         # Don't process duplicate parts
         fragment_index = p.index()
-        print(f"DEBUG: Processing simple part - index: {fragment_index}")
-        
-        if contains(self.received_part_indexes, fragment_index):
-            print("DEBUG: Skipping duplicate part")
+        if fragment_index in self.received_part_indexes:
             return
 
         # Record this part
-        self.simple_parts[p.indexes] = p
-        self.received_part_indexes.add(fragment_index)
-        print(f"DEBUG: Recorded part - received indexes: {self.received_part_indexes}")
+        self.store_fragment(fragment_index, p.value)
 
         # If we've received all the parts
-        if self.received_part_indexes == self.expected_part_indexes:
-            print("DEBUG: All parts received, reassembling message")
-            # Reassemble the message from its fragments
-            sorted_parts = []
-            for value in self.simple_parts.values():
-                sorted_parts.append(value)
-
-            sorted_parts.sort(key=lambda a: a.index())
-
-            fragments = []
-            for part in sorted_parts:
-                fragments.append(part.data)
-
-            message = self.join_fragments(fragments, self.expected_message_len)
-            print(f"DEBUG: Reassembled message length: {len(message)}")
-
-            # Verify the message checksum and note success or failure
-            checksum = crc32_int(message)
-            print(f"DEBUG: Message checksum: {checksum}, expected: {self.expected_checksum}")
-            
-            if(checksum == self.expected_checksum):
-                self.result = bytes(message)
-                print("DEBUG: Message checksum verified successfully")
-            else:
-                self.result = InvalidChecksum()
-                print("DEBUG: Message checksum verification failed")
-
+        if self.received_mask == self.expected_mask:
+            self.reassemble()
         else:
-            # Reduce all the mixed parts by this part
-            print("DEBUG: Reducing mixed parts by simple part")
+            # Reduce the mixed parts this fragment is mixed into
             self.reduce_mixed_by(p)
 
-    def process_mixed_part(self, p):
-        # Don't process duplicate parts
-        for r in self.mixed_parts.values():
-            if r == p.indexes:
-                return
-
-        # Reduce this part by all the others
-        p2 = p  # TODO: Does this need to make a copy of p?
-        for r in self.simple_parts.values():
-            p2 = self.reduce_part_by_part(p2, r)
+    def solve_by_elimination(self):
+        for index, value in self.elimination.solve().items():
+            if index not in self.received_part_indexes:
+                self.store_fragment(index, value)
+        self.solved_by_elimination = True
+        self.reassemble()
+
+    def reassemble(self):
+        print("DEBUG: All parts received, reassembling message")
+        # Every fragment is already in place and checksummed; drop the parts
+        # kept to solve them
+        self.mixed_parts.clear()
+        self.mixed_masks.clear()
+        self.mixed_by_fragment = None
+        self.queued_parts.clear()
+        if self.elimination is not None:
+            self.elimination = GF2Basis()
+        message = memoryview(self.message)[:self.expected_message_len]
+        print(f"DEBUG: Reassembled message length: {len(message)}")
+
+        # Verify the message checksum and note success or failure
+        checksum = self.message_crc
+        print(f"DEBUG: Message checksum: {checksum}, expected: {self.expected_checksum}")
+
+        if(checksum == self.expected_checksum):
+            self.result = message
+            print("DEBUG: Message checksum verified successfully")
+        else:
+            self.result = InvalidChecksum()
+            print("DEBUG: Message checksum verification failed")
 
-        for r in self.mixed_parts.values():
-            p2 = self.reduce_part_by_part(p2, r)
+    def process_mixed_part(self, p):
+        # A repeat of a mixed part we have is processed as well: the parts
+        # before it in order may reduce it to something new
+
+        # Reduce this part by the fragments already solved
+        for i in mask_to_indexes(p.mask & self.received_mask):
+            p.value ^= self.fragment_value(i)
+        p.mask &= ~self.received_mask
+
+        # ...and, in order, by the mixed parts whose fragments are all in it
+        candidates = set()
+        for i in mask_to_indexes(p.mask):
+            candidates.update(self.mixed_by_fragment[i])
+        for mixed_id in sorted(candidates):
+            r = self.mixed_parts[mixed_id]
+            if r.mask & p.mask == r.mask:
+                p.mask ^= r.mask
+                p.value ^= r.value
+
+        # Nothing new in it
+        if p.mask == 0:
+            return
 
         # If the part is now simple
-        if p2.is_simple():
+        if p.is_simple():
             # Add it to the queue
-            self.enqueue(p2)
+            self.enqueue(p)
         else:
             # Reduce all the mixed parts by this one
-            self.reduce_mixed_by(p2)
+            self.reduce_mixed_by(p)
             # Record this new mixed part
-            self.mixed_parts[p2.indexes] = p2
+            self.add_mixed(p)
 
     def validate_part(self, p):
         print(f"DEBUG: Validating part - seq_len: {p.seq_len}, message_len: {p.message_len}, checksum: {p.checksum}")
@@ -242,14 +313,15 @@ class FountainDecoder:
         if self.expected_part_indexes == None:
             print("DEBUG: First part received, setting expectations")
             # Record the things that all the other parts we see will have to match to be valid.
-            self.expected_part_indexes = set()
-            for i in range(p.seq_len):
-                self.expected_part_indexes.add(i)
+            self.expected_part_indexes = set(range(p.seq_len))
+            self.expected_mask = (1 << p.seq_len) - 1
+            self.mixed_by_fragment = [set() for i in range(p.seq_len)]
 
             self.expected_message_len = p.message_len
             self.expected_checksum = p.checksum
             self.expected_fragment_len = len(p.data)
-            print(f"DEBUG: Expectations set - parts: {self.expected_part_indexes}, message_len: {self.expected_message_len}, checksum: {self.expected_checksum}")
+            self.message = bytearray(p.seq_len * self.expected_fragment_len)
+            print(f"DEBUG: Expectations set - parts: {p.seq_len}, message_len: {self.expected_message_len}, checksum: {self.expected_checksum}")
         else:
             # If this part's values don't match the first part's values, throw away the part
             if self.expected_part_count() != p.seq_len:
@@ -299,8 +371,8 @@ class FountainDecoder:
         parts = self.expected_part_count() if self.expected_part_indexes != None else 'None'
         received = self.indexes_to_string(self.received_part_indexes)
         mixed = []
-        for indexes, p in self.mixed_parts.items():
-            mixed.append(self.indexes_to_string(indexes))
+        for p in self.mixed_parts.values():
+            mixed.append(self.indexes_to_string(p.indexes))
         
         mixed_s = "[{}]".format(', '.join(mixed))
         queued = len(self.queued_parts)
@@ -7,8 +7,8 @@
 
 import math
 from .cbor_lite import CBORDecoder, CBOREncoder
-from .fountain_utils import choose_fragments
-from .utils import split, crc32_int, xor_into, data_to_hex
+from .fountain_utils import choose_fragment_mask, mask_to_indexes
+from .utils import split, crc32_int, bytes_to_int, int_to_fragment, data_to_hex
 from .constants import MAX_UINT32, MAX_UINT64
 
 class InvalidHeader(Exception):
@@ -89,6 +89,8 @@ class FountainEncoder:
         self.checksum = crc32_int(message)
         self.fragment_len = FountainEncoder.find_nominal_fragment_length(self.message_len, min_fragment_len, max_fragment_len)
         self.fragments = FountainEncoder.partition_message(message, self.fragment_len)
+        # The fragments as ints, for mixing
+        self.fragment_values = [bytes_to_int(fragment) for fragment in self.fragments]
         self.seq_num = first_seq_num
     
     @staticmethod
@@ -140,13 +142,12 @@ class FountainEncoder:
     def next_part(self):
         self.seq_num += 1
         self.seq_num = self.seq_num % MAX_UINT32  # wrap at period 2^32
-        indexes = choose_fragments(self.seq_num, self.seq_len(), self.checksum)
-        mixed = self.mix(indexes)
-        data = bytes(mixed)
+        indexes = mask_to_indexes(choose_fragment_mask(self.seq_num, self.seq_len(), self.checksum))
+        data = self.mix(indexes)
         return Part(self.seq_num, self.seq_len(), self.message_len, self.checksum, data)
 
     def mix(self, indexes):
-        result = [0] * self.fragment_len
+        result = 0
         for index in indexes:
-            xor_into(result, self.fragments[index])
-        return result
+            result ^= self.fragment_values[index]
+        return int_to_fragment(result, self.fragment_len)
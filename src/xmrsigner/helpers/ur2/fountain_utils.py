@@ -5,6 +5,8 @@
 # Licensed under the "BSD-2-Clause Plus Patent License"
 #
 
+from bisect import bisect_right, insort
+from functools import lru_cache
 from .random_sampler import RandomSampler
 from .utils import int_to_bytes
 from .xoshiro256 import Xoshiro256
@@ -20,30 +22,55 @@ def shuffled(items, rng):
 
     return result
 
-def choose_degree(seq_len, rng):
+# The first `count` items `shuffled(list(range(n)), rng)` would return, drawing
+# only `count` random numbers. Instead of popping from the list of remaining
+# items, the item at a remaining position is found from the items taken.
+def shuffled_prefix(n, count, rng):
+    taken = []
+    result = []
+    for remaining in range(n, n - count, -1):
+        index = rng.next_int(0, remaining - 1)
+        # Skip over the items taken at or before it
+        item = index
+        while True:
+            shifted = index + bisect_right(taken, item)
+            if shifted == item:
+                break
+            item = shifted
+        insort(taken, item)
+        result.append(item)
+    return result
+
+# The alias table of the degree distribution depends only on seq_len
+@lru_cache(maxsize=8)
+def degree_sampler(seq_len):
     degree_probabilities = []
     for i in range(1, seq_len + 1):
         degree_probabilities.append(1.0 / i)
 
-    degree_chooser = RandomSampler(degree_probabilities)
-    return degree_chooser.next(lambda: rng.next_double()) + 1
+    return RandomSampler(degree_probabilities)
 
-def choose_fragments(seq_num, seq_len, checksum):
+def choose_degree(seq_len, rng):
+    return degree_sampler(seq_len).next(lambda: rng.next_double()) + 1
+
+# The fragments of a part as a bitmask (see indexes_to_mask). Both the
+# encoder and the decoder ask for the same parts again and again (a sender
+# looping its display, repeated scans), so recent ones are kept.
+@lru_cache(maxsize=1024)
+def choose_fragment_mask(seq_num, seq_len, checksum):
     # The first `seq_len` parts are the "pure" fragments, not mixed with any
     # others. This means that if you only generate the first `seq_len` parts,
     # then you have all the parts you need to decode the message.
     if seq_num <= seq_len:
-        return set([seq_num - 1])
+        return 1 << (seq_num - 1)
     else:
         seed = int_to_bytes(seq_num) + int_to_bytes(checksum)
         rng = Xoshiro256.from_bytes(seed)
         degree = choose_degree(seq_len, rng)
-        indexes = []
+        return indexes_to_mask(shuffled_prefix(seq_len, degree, rng))
 
-        for i in range(seq_len):
-            indexes.append(i)
-        shuffled_indexes = shuffled(indexes, rng)
-        return set(shuffled_indexes[0:degree])
+def choose_fragments(seq_num, seq_len, checksum):
+    return set(mask_to_indexes(choose_fragment_mask(seq_num, seq_len, checksum)))
 
 def contains(set_or_list, el):
     return el in set_or_list
@@ -52,4 +79,22 @@ def is_strict_subset(a, b):
     return a.issubset(b)
 
 def set_difference(a, b):
-    return a.difference(b)
\ No newline at end of file
+    return a.difference(b)
+
+# Fragment index sets as integer bitmasks: bit `i` set when fragment `i` is mixed in
+def indexes_to_mask(indexes):
+    mask = 0
+    for i in indexes:
+        mask |= 1 << i
+    return mask
+
+def mask_to_indexes(mask):
+    indexes = []
+    while mask:
+        low = mask & -mask
+        indexes.append(low.bit_length() - 1)
+        mask ^= low
+    return indexes
+
+def is_single_index(mask):
+    return mask != 0 and mask & (mask - 1) == 0
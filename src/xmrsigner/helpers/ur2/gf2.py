@@ -0,0 +1,68 @@
+#
+# gf2.py
+#
+
+
+class GF2Basis:
+    """
+    Incremental Gaussian elimination over GF(2) for fountain parts.
+
+    Each part is a row: the bitmask of the fragments mixed into it and its data
+    as an int, the XOR of those fragments. Rows are kept in echelon form keyed
+    by their pivot, the lowest fragment in their mask, so adding a part costs
+    at most one XOR per row already held. Once the rows span every fragment the
+    system is determined and `solve()` recovers all of them, even when no part
+    could be peeled down to a single fragment.
+    """
+
+    __slots__ = ('rows', 'pivots')
+
+    def __init__(self):
+        # pivot bit -> (mask, value)
+        self.rows = {}
+        self.pivots = 0
+
+    def add(self, mask, value):
+        """
+        Adds a part; returns True if it was independent of the parts held
+        (raised the rank), False if it carried nothing new.
+        """
+        common = mask & self.pivots
+        while common:
+            pivot = common & -common
+            row_mask, row_value = self.rows[pivot]
+            mask ^= row_mask
+            value ^= row_value
+            # Rows only hold fragments above their pivot, so the pivots left
+            # to eliminate are all above this one
+            common = mask & self.pivots
+        if not mask:
+            return False
+        pivot = mask & -mask
+        self.rows[pivot] = (mask, value)
+        self.pivots |= pivot
+        return True
+
+    def rank(self):
+        return len(self.rows)
+
+    def is_determined(self, expected_mask):
+        return self.pivots == expected_mask
+
+    def solve(self):
+        """
+        The value of every fragment as {fragment index: int}; only valid once
+        the system is determined.
+        """
+        values = {}
+        # Back substitution from the highest pivot down: the other fragments of
+        # a row are all above its pivot, so already solved
+        for pivot in sorted(self.rows, reverse=True):
+            mask, value = self.rows[pivot]
+            rest = mask ^ pivot
+            while rest:
+                low = rest & -rest
+                value ^= values[low]
+                rest ^= low
+            values[pivot] = value
+        return {pivot.bit_length() - 1: value for pivot, value in values.items()}
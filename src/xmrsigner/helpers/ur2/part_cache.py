@@ -0,0 +1,57 @@
+#
+# part_cache.py
+#
+
+from collections import OrderedDict
+
+
+class SeenPartsCache:
+    """
+    Bounded set of the UR part strings a decoder has already been given.
+
+    Animated senders loop over their parts, so most parts are scanned many
+    times; a repeat is recognized by a dict lookup on the raw string instead of
+    being parsed, bytewords and CBOR decoded and validated again. The least
+    recently seen parts are forgotten once `max_size` parts are held.
+    """
+
+    def __init__(self, max_size=1024):
+        self.max_size = max_size
+        self.parts = OrderedDict()
+        self.unique = 0
+        self.duplicates = 0
+
+    def check(self, part):
+        """
+        Records `part` and returns True the first time it is seen, False for a repeat.
+        """
+        if part in self.parts:
+            self.parts.move_to_end(part)
+            self.duplicates += 1
+            return False
+        self.parts[part] = None
+        if len(self.parts) > self.max_size:
+            self.parts.popitem(last=False)
+        self.unique += 1
+        return True
+
+    def __contains__(self, part):
+        return part in self.parts
+
+    def __len__(self):
+        return len(self.parts)
+
+    def clear(self):
+        self.parts.clear()
+        self.unique = 0
+        self.duplicates = 0
+
+    def stats(self):
+        seen = self.unique + self.duplicates
+        return {
+            'unique': self.unique,
+            'duplicates': self.duplicates,
+            'unique_rate': self.unique / seen if seen else 0.0,
+            'duplicate_rate': self.duplicates / seen if seen else 0.0,
+            'size': len(self.parts),
+        }
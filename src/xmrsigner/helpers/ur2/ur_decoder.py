@@ -8,6 +8,7 @@
 from .ur import UR
 from .fountain_encoder import FountainEncoder, Part as FountainEncoderPart
 from .fountain_decoder import FountainDecoder
+from .part_cache import SeenPartsCache
 from .bytewords import *
 from .utils import drop_first, is_ur_type
 
@@ -29,6 +30,7 @@ class InvalidFragment(Exception):
 class URDecoder:
     def __init__(self):
         self.fountain_decoder = FountainDecoder()
+        self.seen_parts = SeenPartsCache()
         self.expected_type = None
         self.result = None
 
@@ -104,6 +106,10 @@ class URDecoder:
                 print("DEBUG: URDecoder already has result, skipping part")
                 return False
 
+            # Don't decode a part we were given before again
+            if not self.seen_parts.check(str):
+                return False
+
             # Don't continue if this part doesn't validate
             (type, components) = URDecoder.parse(str)
             print(f"DEBUG: Parsed UR - type: {type}, components: {components}")
@@ -164,6 +170,22 @@ class URDecoder:
             print(f"DEBUG: Exception in receive_part: {err}")
             return False
 
+    def receive_parts(self, parts):
+        """
+        Receives several parts at once, e.g. all parts decoded from one camera
+        frame. Returns the number of parts accepted.
+        """
+        accepted = 0
+        for part in parts:
+            if self.result != None:
+                break
+            if self.receive_part(part):
+                accepted += 1
+        return accepted
+
+    def part_stats(self):
+        return self.seen_parts.stats()
+
     def expected_type(self):
        return self.expected_type
 
@@ -179,6 +201,9 @@ class URDecoder:
     def processed_parts_count(self):
         return self.fountain_decoder.processed_parts_count
 
+    def mixed_part_count(self):
+        return self.fountain_decoder.mixed_part_count()
+
     def estimated_percent_complete(self):
         return self.fountain_decoder.estimated_percent_complete()
         
@@ -11,8 +11,8 @@ def crc32_bytes(buf):
     checksum = crc32n(buf)
     return checksum
 
-def crc32_int(buf):
-    return crc32(buf)
+def crc32_int(buf, crc=0):
+    return crc32(buf, crc)
 
 def data_to_hex(buf):
     return ''.join('{:02x}'.format(x) for x in buf)
@@ -55,11 +55,16 @@ def join_bytes(list_of_ba):
         out.extend(ba)
     return out
 
+# XOR works on whole fragments as Python ints: one operation on the whole
+# buffer instead of a loop over its bytes. The fountain encoder and decoder
+# keep their fragments as ints and only convert at the ends.
 def xor_into(target, source):
     count = len(target)
     assert(count == len(source)) # Must be the same length
-    for i in range(count):
-        target[i] ^= source[i]
+    target[:] = (bytes_to_int(target) ^ bytes_to_int(source)).to_bytes(count, 'big')
+
+def int_to_fragment(value, fragment_len):
+    return value.to_bytes(fragment_len, 'big')
 
 def xor_with(a, b):
     target = a
@@ -1,25 +1,22 @@
-from re import search, IGNORECASE
 from numpy import array as NumpyArray
 from logging import getLogger
-from binascii import hexlify
-from typing import List, Dict, Optional, Union
-
-from binascii import a2b_base64, b2a_base64
-from monero.address import address as monero_address
-from monero.address import Address
-from pyzbar import pyzbar
-from pyzbar.pyzbar import ZBarSymbol
+from os import cpu_count
+from typing import List, Optional, Tuple, Union
+
 from xmrsigner.urtypes.xmr import XmrOutput, XmrTxUnsigned
 
 from xmrsigner.helpers.ur2.ur_decoder import URDecoder
+from xmrsigner.helpers.scan.strategy import DecodeStrategy, DecodeStrategyScheduler
+from xmrsigner.helpers.scan.backends import create_strategies
+from xmrsigner.helpers.scan.pipeline import FramePipeline
+from xmrsigner.helpers.scan.pool import ParallelFrameDecoder, default_worker_count
 
 from xmrsigner.models.base_decoder import DecodeQRStatus
 from xmrsigner.models.seed_decoder import SeedQrDecoder
 from xmrsigner.models.monero_decoder import MoneroWalletQrDecoder, MoneroAddressQrDecoder
 from xmrsigner.models.qr_type import QRType
-from xmrsigner.models.seed import Seed
-from xmrsigner.models.settings import SettingsConstants
-import numpy as np
+from xmrsigner.models.qr_classifier import PayloadClassifier, classify
+from xmrsigner.models.settings import Settings, SettingsConstants
 
 
 logger = getLogger(__name__)
@@ -30,39 +27,138 @@ class DecodeQR:
     Used to process images or string data from animated qr codes.
     """
 
-    def __init__(self, wordlist_language_code: str = SettingsConstants.WORDLIST_LANGUAGE__ENGLISH):
+    # Seconds spent on one camera frame before the remaining decode strategies
+    # are skipped; roughly one frame interval on a Pi Zero.
+    FRAME_DECODE_BUDGET = 0.2
+    # Consecutive frames without a QR code in the tracked region before the full
+    # frame is decoded again.
+    ROI_MAX_MISSES = 2
+    # Downscale factors tried coarse-to-fine; 1 is the frame as captured. Low and
+    # medium density QRs decode at half resolution for a quarter of the pixels.
+    PYRAMID_LEVELS = (2, 1)
+
+    def __init__(
+            self,
+            wordlist_language_code: str = SettingsConstants.WORDLIST_LANGUAGE__ENGLISH,
+            pyramid_levels: Optional[Tuple[int, ...]] = PYRAMID_LEVELS,
+            enhance: bool = True,
+            frame_cache: bool = True,
+            decode_workers: Optional[int] = None):
         self.wordlist_language_code = wordlist_language_code
         self.complete = False
         self.qr_type = None
         self.decoder = None
+        self.classifier = PayloadClassifier(wordlist_language_code)
+        backend = DecodeQR.preferred_backend()
+        pipeline_options = dict(
+            pyramid_levels=pyramid_levels,
+            roi_max_misses=DecodeQR.ROI_MAX_MISSES,
+            enhance=enhance,
+            frame_cache=frame_cache)
+        if decode_workers is None:
+            decode_workers = DecodeQR.parallel_decode_workers()
+        # Frames go either to the worker pool, which falls back to a pipeline of
+        # its own, or to this session's pipeline; never both
+        self.pool = None
+        self.pipeline = None
+        if decode_workers:
+            self.pool = ParallelFrameDecoder(
+                decode_workers,
+                backend=backend,
+                is_binary=True,
+                frame_budget=DecodeQR.FRAME_DECODE_BUDGET,
+                **pipeline_options)
+        else:
+            self.pipeline = FramePipeline(DecodeQR.create_scheduler(is_binary=True, backend=backend), **pipeline_options)
+
+    def extract_image_payloads(self, image) -> List[bytes]:
+        """
+        Runs a camera frame through this session's FramePipeline and returns the
+        payload of every QR code found in it.
+
+        With decode workers the frame is handed to the pool instead and the
+        payloads of whichever earlier frames the workers finished are returned.
+        """
+        if image is None:
+            return []
+        if self.pool:
+            return self.pool.decode(image)
+        return self.pipeline.decode(image)
+
+    def close(self):
+        """
+        Stops the decode workers, if any. Call when the scan session ends.
+        """
+        if self.pool:
+            self.pool.close()
+
+    def extract_image_data(self, image) -> Optional[bytes]:
+        payloads = self.extract_image_payloads(image)
+        return payloads[0] if payloads else None
 
     def add_image(self, image):
         print("DEBUG: add_image called")
-        data = DecodeQR.extract_qr_data(image, is_binary=True)
-        if data == None:
+        payloads = self.extract_image_payloads(image)
+        if not payloads:
             print("DEBUG: No QR data found in image")
             return DecodeQRStatus.FALSE
-        print(f"DEBUG: Found QR data: {data[:50]}..." if len(data) > 50 else f"DEBUG: Found QR data: {data}")
-        print(f"DEBUG: QR data type: {type(data)}")
-        print(f"DEBUG: QR data length: {len(data)}")
+        print(f"DEBUG: Found {len(payloads)} QR payload(s)")
+        return self.add_payloads(payloads)
+
+    def add_payloads(self, payloads: List[Union[bytes, str]]) -> DecodeQRStatus:
+        """
+        Adds all payloads decoded from one frame. A sender may tile several UR
+        fountain parts on one screen; they are handed to the URDecoder together.
 
-        # Additional check for empty or invalid data
-        if isinstance(data, bytes) and len(data) == 0:
-            print("DEBUG: QR data is empty bytes")
+        Payloads of another QR type than the one being scanned (e.g. a stray code
+        next to it) are dropped instead of aborting the scan.
+        """
+        payloads = [data for data in payloads if data]
+        if not payloads:
             return DecodeQRStatus.FALSE
+        if len(payloads) == 1:
+            return self.add_data(payloads[0])
+        if self.qr_type is None:
+            # The first payload decides the type of this scan
+            status = self.add_data(payloads[0])
+            payloads = payloads[1:]
+            if self.complete or not self.decoder:
+                return status
+        else:
+            status = DecodeQRStatus.FALSE
+        if self.is_ur:
+            # Repeats of parts already given to the decoder skip classification;
+            # the decoder rejects them by a lookup in its seen parts cache.
+            parts = [data.decode(errors='replace') if type(data) == bytes else data for data in payloads]
+            parts = [part for part in parts if part in self.decoder.seen_parts or self._matches_qr_type(part)]
+            if not parts:
+                return status
+            self.decoder.receive_parts(parts)
+            if self.decoder.is_complete():
+                self.complete = True
+                return DecodeQRStatus.COMPLETE
+            return DecodeQRStatus.PART_COMPLETE
+        payloads = [data for data in payloads if self._matches_qr_type(data)]
+        for data in payloads:
+            if self.complete:
+                break
+            status = self.add_data(data)
+        return status
 
-        return self.add_data(data)
+    def _matches_qr_type(self, data: Union[bytes, str]) -> bool:
+        return self.classifier.classify(data) == self.qr_type
 
     def add_data(self, data) -> DecodeQRStatus:
         if data == None:
             print("DEBUG: No data to process")
             return DecodeQRStatus.FALSE
 
-        qr_type = DecodeQR.detect_segment_type(data, wordlist_language_code=self.wordlist_language_code)
+        qr_type = self.classifier.classify(data)
         print(f'DEBUG: Detected QR type: {qr_type}')
 
         if self.qr_type == None:
             self.qr_type = qr_type
+            self.classifier.expect(qr_type)
             print(f'DEBUG: Setting QR type to: {self.qr_type}')
 
             if self.qr_type in [
@@ -198,6 +294,64 @@ class DecodeQR:
         if self.is_address:
             return self.decoder.get_address_type()
 
+    def _stage_stats(self, stage: str):
+        # With decode workers every worker has its own pipeline: a list with
+        # the latest statistics of each
+        if self.pool:
+            return self.pool.pipeline_stats(stage)
+        return self.pipeline.stats()[stage]
+
+    def get_decode_stats(self) -> Union[dict, List[dict]]:
+        """
+        Per-strategy attempts, hits and latency for the frames decoded so far.
+        """
+        return self._stage_stats('decode')
+
+    def get_triage_stats(self) -> Union[dict, List[dict]]:
+        """
+        How many frames the triage stage rejected before decoding, and why.
+        """
+        return self._stage_stats('triage')
+
+    def get_roi_stats(self) -> Union[dict, List[dict]]:
+        """
+        Region vs. full-frame decode attempts and the share of pixels decoded.
+        """
+        return self._stage_stats('roi')
+
+    def get_pyramid_stats(self) -> Union[dict, List[dict], None]:
+        """
+        Attempts and hits per pyramid level, or None when decoding full frames only.
+        """
+        return self._stage_stats('pyramid')
+
+    def get_enhance_stats(self) -> Union[dict, List[dict], None]:
+        """
+        Contrast enhancement passes and their hits, or None when disabled.
+        """
+        return self._stage_stats('enhance')
+
+    def get_frame_cache_stats(self) -> Union[dict, List[dict], None]:
+        """
+        Frames answered from the frame hash cache (hits) vs. decoded (misses), or
+        None when the cache is disabled.
+        """
+        return self._stage_stats('frame_cache')
+
+    def get_pool_stats(self) -> dict:
+        """
+        Frames submitted to, dropped by and decoded in the worker pool, or None
+        when decoding on the calling thread.
+        """
+        return self.pool.stats() if self.pool else None
+
+    def get_part_stats(self) -> dict:
+        """
+        Unique vs. repeated UR parts handed to the URDecoder, or None when not
+        scanning an animated UR.
+        """
+        return self.decoder.part_stats() if self.is_ur and self.decoder else None
+
     def get_percent_complete(self) -> int:
         if not self.decoder:
             print("DEBUG: get_percent_complete - no decoder")
@@ -264,208 +418,63 @@ class DecodeQR:
         return self.qr_type == QRType.SETTINGS
 
     @staticmethod
-    def extract_qr_data(image: NumpyArray, is_binary:bool = False) -> str:
-        if image is None:
-            print("DEBUG: No image data to process")
-            return None
+    def preferred_backend() -> Optional[str]:
+        """
+        The decoder backend picked by calibration, or None before the device has
+        been calibrated.
+        """
+        backend = Settings.get_instance().get_value(SettingsConstants.SETTING__QR_DECODER)
+        return None if backend == SettingsConstants.QR_DECODER__AUTO else backend
+
+    @staticmethod
+    def parallel_decode_workers() -> int:
+        """
+        Number of decode worker processes: one per spare core when multi-core
+        decoding is enabled, 0 (decode on the calling thread) otherwise.
+        """
+        if Settings.get_instance().get_value(SettingsConstants.SETTING__PARALLEL_QR_DECODING) != SettingsConstants.OPTION__ENABLED:
+            return 0
+        if (cpu_count() or 1) < 2:
+            return 0
+        return default_worker_count()
 
-        print(f"DEBUG: Extracting QR data from image - shape: {image.shape if hasattr(image, 'shape') else 'unknown'}")
+    @staticmethod
+    def decode_strategies(is_binary: bool = False, backend: Optional[str] = None) -> List[DecodeStrategy]:
+        """
+        The decoding approaches tried on a frame: those of the `backend` first, then
+        those of every other available backend as fallbacks. The scheduler reorders
+        them per scan session.
 
-        # List of decoding approaches to try, in order of likelihood to succeed
-        decoding_approaches = [
-            ("default", {"symbols": [ZBarSymbol.QRCODE], "binary": is_binary}),
-            ("density=2", {"symbols": [ZBarSymbol.QRCODE], "binary": is_binary, "x_density": 2, "y_density": 2}),
-            ("density=3", {"symbols": [ZBarSymbol.QRCODE], "binary": is_binary, "x_density": 3, "y_density": 3}),
-            ("binary=False", {"symbols": [ZBarSymbol.QRCODE], "binary": False}),
-            ("binary=False, density=2", {"symbols": [ZBarSymbol.QRCODE], "binary": False, "x_density": 2, "y_density": 2}),
-            ("no symbols", {"binary": is_binary}),
-        ]
+        Backends set up their scanners and detectors once, so these live as long as
+        the scheduler of the scan session.
+        """
+        return create_strategies(is_binary, preferred=backend or SettingsConstants.QR_DECODER__ZBAR)
 
-        # Try each approach
-        for approach_name, params in decoding_approaches:
-            try:
-                print(f"DEBUG: Trying decoding approach: {approach_name}")
-                barcodes = pyzbar.decode(image, **params)
-                print(f"DEBUG: Found {len(barcodes)} barcodes with {approach_name}")
-
-                if barcodes:
-                    # Check each barcode
-                    for i, barcode in enumerate(barcodes):
-                        print(f"DEBUG: Barcode {i} data type: {type(barcode.data)}")
-                        print(f"DEBUG: Barcode {i} data length: {len(barcode.data)}")
-                        print(f"DEBUG: Barcode {i} data repr: {repr(barcode.data)}")
-
-                        # Check if data is valid
-                        if barcode.data is None:
-                            print(f"DEBUG: Barcode {i} has None data")
-                            continue
-
-                        if len(barcode.data) == 0:
-                            print(f"DEBUG: Barcode {i} has empty data")
-                            continue
-
-                        # Successfully decoded at least one barcode with valid data
-                        print(f"DEBUG: Successfully decoded QR code with approach: {approach_name}")
-                        return barcode.data
-            except Exception as e:
-                print(f"DEBUG: Error with {approach_name}: {e}")
-                import traceback
-                traceback.print_exc()
-                continue
-
-        # Try OpenCV as a fallback
-        print("DEBUG: Trying OpenCV as fallback")
-        try:
-            import cv2
-            # Convert PIL image to OpenCV format if needed
-            if hasattr(image, 'shape'):
-                # Already a numpy array
-                cv_image = image
-            else:
-                # Convert PIL Image to numpy array
-                cv_image = np.array(image)
-                # Convert RGB to BGR
-                cv_image = cv2.cvtColor(cv_image, cv2.COLOR_RGB2BGR)
-
-            # Create QR detector
-            qr_detector = cv2.QRCodeDetector()
-
-            # Detect and decode
-            data, bbox, straight_qrcode = qr_detector.detectAndDecode(cv_image)
-
-            if data:
-                print(f"DEBUG: OpenCV successfully decoded QR code: {data}")
-                return data.encode('utf-8')
-            else:
-                print("DEBUG: OpenCV failed to decode QR code")
-        except Exception as e:
-            print(f"DEBUG: Error with OpenCV approach: {e}")
-            import traceback
-            traceback.print_exc()
-
-        print("DEBUG: No QR codes found with any approach")
-        return None
+    @staticmethod
+    def create_scheduler(
+            is_binary: bool = False,
+            frame_budget: Optional[float] = FRAME_DECODE_BUDGET,
+            backend: Optional[str] = None) -> DecodeStrategyScheduler:
+        return DecodeStrategyScheduler(DecodeQR.decode_strategies(is_binary, backend), frame_budget=frame_budget)
+
+    @staticmethod
+    def extract_qr_data(image: NumpyArray, is_binary: bool = False, scheduler: Optional[DecodeStrategyScheduler] = None) -> Optional[bytes]:
+        """
+        Returns the first QR payload found in `image`, or None.
+
+        Pass the `scheduler` of a scan session to reuse its learned strategy order
+        and frame budget; without one every strategy is tried in default order.
+        """
+        if image is None:
+            return None
+        if scheduler is None:
+            scheduler = DecodeQR.create_scheduler(is_binary, frame_budget=None)
+        symbols = scheduler.run(image)
+        if not symbols:
+            logger.debug('No QR codes found with any approach')
+            return None
+        return symbols[0].data
 
     @staticmethod
     def detect_segment_type(segment: Union[bytes, str], wordlist_language_code: Optional[str] = None):
-        print("-------------- DecodeQR.detect_segment_type --------------")
-        print(f"Input type: {type(segment)}")
-        print(f"Input length: {len(segment) if segment else 0}")
-        print(f"Input value: {repr(segment)[:100]}{'...' if segment and len(repr(segment)) > 100 else ''}")
-
-        # Handle empty or None input
-        if not segment:
-            print("DEBUG: Empty or None segment, returning INVALID")
-            return QRType.INVALID
-
-        if len(segment) == 0:
-            print("DEBUG: Empty segment, returning INVALID")
-            return QRType.INVALID
-
-        try:
-            s = segment if type(segment) == str else segment.decode()
-
-            UR_XMR_OUTPUT = 'xmr-output'
-            UR_XMR_KEY_IMAGE = 'xmr-keyimage'
-            UR_XMR_TX_UNSIGNED = 'xmr-txunsigned'
-            UR_XMR_TX_SIGNED = 'xmr-txsigned'
-            # XMR UR
-            if search(f"^UR:{UR_XMR_OUTPUT}/", s, IGNORECASE):
-                return QRType.XMR_OUTPUT_UR
-            if search(f'^UR:{UR_XMR_KEY_IMAGE}/', s, IGNORECASE):
-                return QRType.XMR_KEYIMAGE_UR
-            if search(f'^UR:{UR_XMR_TX_UNSIGNED}/', s, IGNORECASE):
-                return QRType.XMR_TX_UNSIGNED_UR
-            if search(f'^UR:{UR_XMR_TX_SIGNED}/', s, IGNORECASE):
-                return QRType.XMR_TX_SIGNED_UR
-            if s.startswith('monero_wallet:'):
-                return QRType.MONERO_WALLET
-            # Seed
-            print(f'search: ({len(s)}){s}')
-            if (decimals := search(r'(\d{52,100})', s)) and len(decimals.group(1)) in (52, 64, 100):
-                return QRType.SEED__SEEDQR
-            # Monero Address
-            if MoneroAddressQrDecoder.is_monero_address(s):
-                return QRType.MONERO_ADDRESS
-            # config data
-            if s.startswith("settings::"):
-                return QRType.SETTINGS
-            # Seed
-            # create 4 letter wordlist only if not PSBT (performance gain)
-            wordlist = Seed.get_wordlist(wordlist_language_code)
-            if all(x in wordlist for x in s.strip().split(" ")):
-                # checks if all words in list are in bip39 word list
-                return QRType.SEED__MNEMONIC
-            try:
-                _4LETTER_WORDLIST = [word[:4].strip() for word in wordlist]
-            except:
-                _4LETTER_WORDLIST = []
-            if all(x in _4LETTER_WORDLIST for x in s.strip().split(" ")):
-                # checks if all 4 letter words are in list are in 4 letter bip39 word list
-                return QRType.SEED__FOUR_LETTER_MNEMONIC
-        except UnicodeDecodeError:
-            # Probably this isn't meant to be string data; check if it's valid byte data
-            # below.
-            pass
-        except Exception as e:
-            print(f"DEBUG: Exception in detect_segment_type: {e}")
-            return QRType.INVALID
-
-        # Handle the case where s might not be defined due to early return
-        if 's' not in locals():
-            print("DEBUG: s not defined, returning INVALID")
-            return QRType.INVALID
-
-        # TODO: 2024-08-26, check and write tests
-        print(f'byte({len(s)})<{type(s)}>? {s}')
-        # Is it byte data?
-        # 32 bytes for 24-word CompactSeedQR; 16 bytes for 12-word CompactSeedQR, 22 for polyseed
-        if len(s) in (33, 17, 22):
-            # TODO: Fix this return statmenmets because you can't really structurally reach the bottom part. Something might be wrong
-            try:
-                bitstream = ''
-                for b in s:
-                    bitstream += bin(b).lstrip('0b').zfill(8)
-                return QRType.SEED__COMPACTSEEDQR
-            except Exception as e:
-                # Couldn't extract byte data; assume it's not a byte format
-                print(f'exception: {e}')
-                return QRType.INVALID
-            # Seed
-            print(f'search: ({len(s)}){s}')
-            if (decimals := search(r'(\d{52,100})', s)) and len(decimals.group(1)) in (52, 64, 100):
-                return QRType.SEED__SEEDQR
-            # Monero Address
-            if MoneroAddressQrDecoder.is_monero_address(s):
-                return QRType.MONERO_ADDRESS
-            # config data
-            if s.startswith("settings::"):
-                return QRType.SETTINGS
-            # Seed
-            # create 4 letter wordlist only if not PSBT (performance gain)
-            wordlist = Seed.get_wordlist(wordlist_language_code)
-            if all(x in wordlist for x in s.strip().split(" ")):
-                # checks if all words in list are in bip39 word list
-                return QRType.SEED__MNEMONIC
-            try:
-                _4LETTER_WORDLIST = [word[:4].strip() for word in wordlist]
-            except:
-                _4LETTER_WORDLIST = []
-            if all(x in _4LETTER_WORDLIST for x in s.strip().split(" ")):
-                # checks if all 4 letter words are in list are in 4 letter bip39 word list
-                return QRType.SEED__FOUR_LETTER_MNEMONIC
-
-        # TODO: 2024-08-26, check and write tests
-        print(f'byte({len(s)})<{type(s)}>? {s}')
-        # Is it byte data?
-        # 32 bytes for 24-word CompactSeedQR; 16 bytes for 12-word CompactSeedQR, 22 for polyseed
-        if type(segment) == bytes and len(segment) in (33, 17, 22):
-            try:
-                bitstream = ''
-                for b in segment:
-                    bitstream += bin(b).lstrip('0b').zfill(8)
-                return QRType.SEED__COMPACTSEEDQR
-            except Exception as e:
-                # Couldn't extract byte data; assume it's not a byte format
-                print(f'exception: {e}')
-        return QRType.INVALID
+        return classify(segment, wordlist_language_code)
@@ -0,0 +1,119 @@
+from functools import lru_cache
+from logging import getLogger
+from re import compile as re_compile
+from typing import FrozenSet, Optional, Tuple, Union
+
+from xmrsigner.models.monero_decoder import MoneroAddressQrDecoder
+from xmrsigner.models.qr_type import QRType
+from xmrsigner.models.seed import Seed
+
+
+logger = getLogger(__name__)
+
+
+UR_TYPES = {
+    'xmr-output': QRType.XMR_OUTPUT_UR,
+    'xmr-keyimage': QRType.XMR_KEYIMAGE_UR,
+    'xmr-txunsigned': QRType.XMR_TX_UNSIGNED_UR,
+    'xmr-txsigned': QRType.XMR_TX_SIGNED_UR,
+}
+UR_TYPE_PREFIXES = {qr_type: f'ur:{name}/' for name, qr_type in UR_TYPES.items()}
+
+SEEDQR_DIGITS = re_compile(r'\d{52,100}')
+SEEDQR_LENGTHS = (52, 64, 100)
+# Same alphabet and lengths (standard/subaddress, integrated) the monero package
+# accepts; anything else cannot parse, so the base58 + checksum work is skipped.
+MONERO_ADDRESS = re_compile(r'^(?:monero:)?[1-9A-HJ-NP-Za-km-z]{95}(?:[1-9A-HJ-NP-Za-km-z]{11})?$')
+# 32 bytes for 24-word CompactSeedQR; 16 bytes for 12-word CompactSeedQR, 22 for polyseed
+COMPACT_SEEDQR_LENGTHS = (33, 17, 22)
+
+
+@lru_cache(maxsize=None)
+def word_sets(wordlist_language_code: str) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+    """
+    The words of a seed wordlist and their 4 letter prefixes, as sets.
+    """
+    wordlist = Seed.get_wordlist(wordlist_language_code)
+    return frozenset(wordlist), frozenset(word[:4].strip() for word in wordlist)
+
+
+def classify_text(s: str, wordlist_language_code: Optional[str]) -> str:
+    lowered = s[:20].lower()
+    if lowered.startswith('ur:'):
+        return UR_TYPES.get(lowered[3:].split('/', 1)[0], QRType.INVALID) if '/' in lowered[3:] else QRType.INVALID
+    if s.startswith('monero_wallet:'):
+        return QRType.MONERO_WALLET
+    if s.startswith('settings::'):
+        return QRType.SETTINGS
+    if (decimals := SEEDQR_DIGITS.search(s)) and len(decimals.group(0)) in SEEDQR_LENGTHS:
+        return QRType.SEED__SEEDQR
+    if MONERO_ADDRESS.match(s) and MoneroAddressQrDecoder.is_monero_address(s):
+        return QRType.MONERO_ADDRESS
+    words, prefixes = word_sets(wordlist_language_code)
+    tokens = s.strip().split(' ')
+    if words.issuperset(tokens):
+        return QRType.SEED__MNEMONIC
+    if prefixes.issuperset(tokens):
+        return QRType.SEED__FOUR_LETTER_MNEMONIC
+    return QRType.INVALID
+
+
+def classify(segment: Union[bytes, str], wordlist_language_code: Optional[str] = None) -> str:
+    """
+    Returns the QRType of a decoded QR payload in a single pass: UR, wallet and
+    settings payloads are told apart by their prefix before any of the more
+    expensive checks (SeedQR digits, address parse, wordlist lookups) run.
+    """
+    if not segment:
+        return QRType.INVALID
+    try:
+        s = segment if type(segment) == str else segment.decode()
+    except UnicodeDecodeError:
+        s = None
+    try:
+        if s is not None:
+            qr_type = classify_text(s, wordlist_language_code)
+            if qr_type != QRType.INVALID or s[:3].lower() == 'ur:':
+                return qr_type
+    except Exception as e:
+        logger.debug('payload classification failed: %s', e)
+        return QRType.INVALID
+    # Binary payloads
+    if type(segment) == bytes and len(segment) in COMPACT_SEEDQR_LENGTHS:
+        return QRType.SEED__COMPACTSEEDQR
+    return QRType.INVALID
+
+
+class PayloadClassifier:
+    """
+    Classifies the payloads of one scan session.
+
+    Once the session's QR type is known (`expect()`), payloads of that type are
+    recognized by the cheapest check that tells them apart, e.g. the UR prefix
+    for animated QRs, and only anything else goes through the full `classify()`.
+    """
+
+    def __init__(self, wordlist_language_code: Optional[str] = None):
+        self.wordlist_language_code = wordlist_language_code
+        self.expected = None
+        self.fast_hits = 0
+        self.full_checks = 0
+
+    def expect(self, qr_type: Optional[str]) -> None:
+        self.expected = qr_type
+
+    def _is_expected(self, segment: Union[bytes, str]) -> bool:
+        prefix = UR_TYPE_PREFIXES.get(self.expected)
+        if prefix is None:
+            return False
+        head = segment[:len(prefix)]
+        if type(head) == bytes:
+            head = head.decode('ascii', errors='replace')
+        return head.lower() == prefix
+
+    def classify(self, segment: Union[bytes, str]) -> str:
+        if segment and self.expected is not None and self._is_expected(segment):
+            self.fast_hits += 1
+            return self.expected
+        self.full_checks += 1
+        return classify(segment, self.wordlist_language_code)
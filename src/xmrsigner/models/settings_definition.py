@@ -71,6 +71,18 @@ class SettingsConstants:
         (DENSITY__HIGH, 'High'),
     ]
 
+    # QR decoder backend, chosen by calibration on the device
+    QR_DECODER__AUTO = 'auto'
+    QR_DECODER__ZBAR = 'zbar'
+    QR_DECODER__OPENCV = 'opencv'
+    QR_DECODER__ZXING = 'zxing'
+    ALL_QR_DECODERS = [
+        (QR_DECODER__AUTO, 'Not calibrated'),
+        (QR_DECODER__ZBAR, 'ZBar'),
+        (QR_DECODER__OPENCV, 'OpenCV'),
+        (QR_DECODER__ZXING, 'zxing-cpp'),
+    ]
+
     # View Only Wallet QR Code Format
     VIEW_ONLY_WALLET_FORMAT_URI = 'U'
     VIEW_ONLY_WALLET_FORMAT_JSON = 'J'
@@ -211,11 +223,13 @@ class SettingsConstants:
     SETTING__DIRE_WARNINGS = "dire_warnings"
     SETTING__QR_BRIGHTNESS_TIPS = "qr_brightness_tips"
     SETTING__PARTNER_LOGOS = "partner_logos"
+    SETTING__PARALLEL_QR_DECODING = "parallel_qr_decoding"
 
     SETTING__DEBUG = "debug"
 
     # Hidden settings
     SETTING__QR_BRIGHTNESS = "qr_background_color"
+    SETTING__QR_DECODER = "qr_decoder"
 
 
     # Structural constants
@@ -511,6 +525,13 @@ class SettingsDefinition:
                       display_name="Show partner logos",
                       visibility=SettingsConstants.VISIBILITY__ADVANCED,
                       default_value=SettingsConstants.OPTION__DISABLED),
+
+        SettingsEntry(category=SettingsConstants.CATEGORY__FEATURES,
+                      attr_name=SettingsConstants.SETTING__PARALLEL_QR_DECODING,
+                      abbreviated_name="par_qr",
+                      display_name="Multi-core QR decoding",
+                      visibility=SettingsConstants.VISIBILITY__ADVANCED,
+                      default_value=SettingsConstants.OPTION__DISABLED),
         
         # "Hidden" settings with no UI interaction
         SettingsEntry(category=SettingsConstants.CATEGORY__SYSTEM,
@@ -520,6 +541,21 @@ class SettingsDefinition:
                       type=SettingsConstants.TYPE__FREE_ENTRY,
                       visibility=SettingsConstants.VISIBILITY__HIDDEN,
                       default_value=62),
+
+        SettingsEntry(category=SettingsConstants.CATEGORY__SYSTEM,
+                      attr_name=SettingsConstants.SETTING__DEBUG,
+                      display_name="Debug",
+                      visibility=SettingsConstants.VISIBILITY__HIDDEN,
+                      default_value=SettingsConstants.OPTION__DISABLED),
+
+        SettingsEntry(category=SettingsConstants.CATEGORY__SYSTEM,
+                      attr_name=SettingsConstants.SETTING__QR_DECODER,
+                      abbreviated_name="qr_decoder",
+                      display_name="QR decoder",
+                      type=SettingsConstants.TYPE__SELECT_1,
+                      visibility=SettingsConstants.VISIBILITY__HIDDEN,
+                      selection_options=SettingsConstants.ALL_QR_DECODERS,
+                      default_value=SettingsConstants.QR_DECODER__AUTO),
     ]
 
 
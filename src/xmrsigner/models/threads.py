@@ -1,5 +1,7 @@
 import logging
+from collections import deque
 from threading import Thread, Lock
+from time import monotonic
 
 logger = logging.getLogger(__name__)
 
@@ -44,3 +46,31 @@ class ThreadsafeCounter:
             self.count = value
 
 
+class RateMeter:
+    """
+    Measures how many times per second something happens (e.g. frames decoded
+    or shown) over the last `window` seconds. Safe to read from other threads.
+    """
+    def __init__(self, window: float = 2.0):
+        self.window = window
+        self.count = 0
+        self._times = deque()
+        self._lock = Lock()
+
+    def tick(self, now: float = None):
+        now = monotonic() if now is None else now
+        with self._lock:
+            self.count += 1
+            self._times.append(now)
+            while now - self._times[0] > self.window:
+                self._times.popleft()
+
+    def rate(self, now: float = None) -> float:
+        now = monotonic() if now is None else now
+        with self._lock:
+            while self._times and now - self._times[0] > self.window:
+                self._times.popleft()
+            if len(self._times) < 2:
+                return 0.0
+            elapsed = self._times[-1] - self._times[0]
+            return (len(self._times) - 1) / elapsed if elapsed > 0 else 0.0
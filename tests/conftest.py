@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+from PIL import Image
+from qrcode import QRCode
+
+
+def make_qr_frame(
+        data: str = 'ur:xmr-output/1-3/lpadaxcfaxdscyhhprbaolrt',
+        size: int = 300,
+        border: int = 4,
+        frame_size: int = 480,
+        noise: float = 0.0,
+        seed: int = 0) -> np.ndarray:
+    """
+    A `frame_size` square RGB camera frame with the QR code of `data`, `size`
+    pixels wide, centered on a grey background; `noise` adds gaussian sensor
+    noise of that many grey levels.
+    """
+    qr = QRCode(border=border)
+    qr.add_data(data)
+    qr.make(fit=True)
+    code = qr.make_image().convert('L').resize((size, size), Image.NEAREST)
+    frame = Image.new('L', (frame_size, frame_size), 128)
+    frame.paste(code, ((frame_size - size) // 2, (frame_size - size) // 2))
+    pixels = np.asarray(frame)
+    if noise:
+        pixels = np.clip(pixels + np.random.default_rng(seed).normal(0, noise, pixels.shape), 0, 255).astype(np.uint8)
+    return np.repeat(pixels[:, :, None], 3, axis=2)
+
+
+@pytest.fixture
+def qr_frame():
+    return make_qr_frame
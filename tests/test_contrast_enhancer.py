@@ -0,0 +1,45 @@
+import numpy as np
+
+from xmrsigner.helpers.scan.enhance import ContrastEnhancer, adaptive_threshold, local_mean
+from xmrsigner.helpers.scan.strategy import Symbol
+from xmrsigner.helpers.scan.triage import TriageResult
+
+
+
+def checkerboard_under_gradient() -> np.ndarray:
+    squares = (np.indices((240, 240)) // 20).sum(axis=0) % 2
+    light = np.linspace(0.2, 1.0, 240)[None, :]
+    return ((squares * 30 + 60) * light).astype(np.uint8)
+
+
+def test_local_mean_of_flat_image():
+    flat = np.full((50, 70), 90, dtype=np.uint8)
+    assert np.allclose(local_mean(flat, 8), 90)
+
+
+def test_adaptive_threshold_survives_light_gradient():
+    image = checkerboard_under_gradient()
+    squares = (np.indices((240, 240)) // 20).sum(axis=0) % 2
+    binary = adaptive_threshold(image, 40, offset=1)
+    # A global threshold loses the dark side completely
+    assert ((image < image.mean()) == (squares == 0)).mean() < 0.8
+    assert ((binary == 0) == (squares == 0)).mean() > 0.9
+
+
+def test_tries_inverted_image_and_counts_hits():
+    seen = []
+    def run(image):
+        seen.append(image)
+        # Only the inverted pass "decodes"
+        return [Symbol(b'x')] if len(seen) == 2 else []
+    enhancer = ContrastEnhancer()
+    assert enhancer.decode(checkerboard_under_gradient(), run) == [Symbol(b'x')]
+    assert np.array_equal(seen[1], 255 - seen[0])
+    assert enhancer.stats()['inverted_hits'] == 1
+
+
+def test_only_promising_frames():
+    assert ContrastEnhancer.is_promising(TriageResult(True, 100.0, 2))
+    assert not ContrastEnhancer.is_promising(TriageResult(False, 1.0, 0, 'blur'))
+    # Let through by the forced pass-through only
+    assert not ContrastEnhancer.is_promising(TriageResult(True, 1.0, 0, 'blur'))
@@ -0,0 +1,89 @@
+from xmrsigner.helpers.scan.strategy import DecodeStrategy, DecodeStrategyScheduler
+
+
+
+def make_strategy(name: str, results: list, calls: list):
+    def decode(image):
+        calls.append(name)
+        return results.pop(0) if results else []
+    return DecodeStrategy(name, decode)
+
+
+def test_stops_at_first_hit():
+    calls = []
+    scheduler = DecodeStrategyScheduler([
+        make_strategy('a', [[]], calls),
+        make_strategy('b', [[b'payload']], calls),
+        make_strategy('c', [[b'never']], calls),
+    ])
+    assert scheduler.run(None) == [b'payload']
+    assert calls == ['a', 'b']
+    assert scheduler.frames == 1
+    assert scheduler.frames_decoded == 1
+
+
+def test_reorders_by_recent_hit_rate():
+    calls = []
+    scheduler = DecodeStrategyScheduler([
+        make_strategy('a', [], calls),
+        make_strategy('b', [[b'1'], [b'2']], calls),
+    ])
+    scheduler.run(None)
+    assert [s.name for s in scheduler.ordered()] == ['b', 'a']
+
+    calls.clear()
+    assert scheduler.run(None) == [b'2']
+    assert calls == ['b']
+
+    stats = scheduler.stats()
+    assert stats['strategies'][0]['name'] == 'b'
+    assert stats['strategies'][0]['hits'] == 2
+    assert stats['strategies'][1]['attempts'] == 1
+
+
+def test_frame_budget_skips_remaining_strategies():
+    calls = []
+    scheduler = DecodeStrategyScheduler([
+        make_strategy('a', [], calls),
+        make_strategy('b', [[b'hit']], calls),
+    ], frame_budget=0)
+    assert scheduler.run(None) == []
+    assert calls == ['a']
+    assert scheduler.frames_over_budget == 1
+
+
+def test_run_more_shares_the_frame_budget():
+    calls = []
+    scheduler = DecodeStrategyScheduler([
+        make_strategy('a', [], calls),
+        make_strategy('b', [], calls),
+        make_strategy('c', [], calls),
+    ], frame_budget=0)
+    assert scheduler.run(None) == []
+    assert scheduler.run_more(None) == []
+    assert calls == ['a', 'b']
+    assert scheduler.frames == 1
+    assert scheduler.frames_over_budget == 1
+    assert scheduler.over_budget
+
+
+def test_failing_strategy_is_counted_not_raised():
+    def broken(image):
+        raise ValueError('boom')
+    scheduler = DecodeStrategyScheduler([DecodeStrategy('broken', broken)])
+    assert scheduler.run(None) == []
+    assert scheduler.strategies[0].errors == 1
+    assert scheduler.strategies[0].attempts == 1
+
+
+def test_run_best_uses_top_strategy_without_stats():
+    calls = []
+    scheduler = DecodeStrategyScheduler([
+        make_strategy('a', [], calls),
+        make_strategy('b', [[b'1'], [b'2']], calls),
+    ])
+    scheduler.run(None)
+    calls.clear()
+    assert scheduler.run_best(None) == [b'2']
+    assert calls == ['b']
+    assert scheduler.strategies[1].attempts == 1
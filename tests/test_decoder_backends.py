@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from xmrsigner.helpers.scan import backends
+from xmrsigner.helpers.scan.backends import DecoderBackend, available_backends, create_strategies
+from xmrsigner.helpers.scan.calibration import calibrate, sample_frames
+from xmrsigner.helpers.scan.strategy import DecodeStrategy, Symbol
+
+
+
+def fake_backend(name: str, decodes: bool = True, available: bool = True):
+    class Backend(DecoderBackend):
+        @classmethod
+        def is_available(cls):
+            return available
+
+        def strategies(self, is_binary=False):
+            def decode(image):
+                return [Symbol(image[1])] if decodes else []
+            return [DecodeStrategy(name, decode)]
+    Backend.name = name
+    return Backend
+
+
+@pytest.fixture
+def registry():
+    registered = dict(backends.BACKENDS)
+    backends.BACKENDS.clear()
+    yield backends.BACKENDS
+    backends.BACKENDS.clear()
+    backends.BACKENDS.update(registered)
+
+
+def test_preferred_backend_first_and_unavailable_skipped(registry):
+    for backend in (fake_backend('a'), fake_backend('b'), fake_backend('c', available=False)):
+        registry[backend.name] = backend
+    assert available_backends() == ['a', 'b']
+    assert [s.name for s in create_strategies(preferred='b')] == ['b', 'a']
+    assert [s.name for s in create_strategies(preferred='c')] == ['a', 'b']
+
+
+def test_calibration_prefers_reliable_backend(registry):
+    registry['broken'] = fake_backend('broken', decodes=False)
+    registry['working'] = fake_backend('working')
+    frames = [((None, b'payload'), b'payload')] * 3
+    chosen, results = calibrate(frames, backends=['broken', 'working'])
+    assert chosen == 'working'
+    assert [r.success_rate for r in results] == [0.0, 1.0]
+
+
+def test_opencv_decodes_sample_frame():
+    if 'opencv' not in available_backends():
+        pytest.skip('OpenCV not installed')
+    image, expected = sample_frames()[0]
+    assert image.shape == (480, 480, 3)
+    assert backends.OpenCVBackend().decode(image)[0].data == expected
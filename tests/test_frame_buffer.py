@@ -0,0 +1,44 @@
+from threading import Thread
+from time import monotonic, sleep
+
+import pytest
+
+from xmrsigner.hardware.frames import FrameBuffer
+
+
+def test_frames_are_numbered_in_capture_order():
+    frames = FrameBuffer()
+    assert frames.read() is None
+    first = frames.put('a')
+    second = frames.put('b', timestamp=first.timestamp + 0.1)
+    assert (first.seq, second.seq) == (1, 2)
+    assert frames.read() == second
+    assert second.timestamp - first.timestamp == pytest.approx(0.1)
+
+
+def test_read_next_returns_only_newer_frames():
+    frames = FrameBuffer()
+    frames.put('a')
+    assert frames.read_next(0, timeout=0).image == 'a'
+    # Nothing newer than frame 1 yet
+    assert frames.read_next(1, timeout=0.01) is None
+    # Frames 2 and 3 were captured meanwhile: the reader gets 3 and dropped 2
+    frames.put('b')
+    frames.put('c')
+    frame = frames.read_next(1, timeout=0)
+    assert (frame.seq, frame.image) == (3, 'c')
+
+
+def test_read_next_wakes_up_on_a_new_frame():
+    frames = FrameBuffer()
+    Thread(target=lambda: (sleep(0.05), frames.put('a')), daemon=True).start()
+    start = monotonic()
+    frame = frames.read_next(0, timeout=5)
+    assert frame.image == 'a'
+    assert monotonic() - start < 1
+
+
+def test_close_wakes_up_readers():
+    frames = FrameBuffer()
+    Thread(target=lambda: (sleep(0.05), frames.close()), daemon=True).start()
+    assert frames.read_next(0, timeout=5) is None
@@ -0,0 +1,57 @@
+from xmrsigner.helpers.scan.framecache import FrameHashCache
+from xmrsigner.helpers.ur2.ur import UR
+from xmrsigner.helpers.ur2.ur_encoder import UREncoder
+
+
+
+def qr_box(size: int, frame_size: int = 480) -> tuple:
+    """ The region around a code centered by qr_frame, padded like RegionTracker """
+    left = (frame_size - size) // 2
+    pad = size // 5
+    return (left - pad, left - pad, left + size + pad, left + size + pad)
+
+
+def test_reuses_result_for_noisy_copy_of_same_frame(qr_frame):
+    cache = FrameHashCache()
+    assert cache.lookup(qr_frame('ur:xmr-output/1-3/lpadaxcfaxdscyhhprbaolrt')) is None
+    cache.store([b'part 1'], qr_box(300))
+    assert cache.lookup(qr_frame('ur:xmr-output/1-3/lpadaxcfaxdscyhhprbaolrt', noise=6, seed=1)) == [b'part 1']
+    # The next part of an animated QR is decoded again
+    assert cache.lookup(qr_frame('ur:xmr-output/2-3/lpaoaxcfaxdscyhhprbaolrt')) is None
+    cache.store([], qr_box(300))
+    assert cache.lookup(qr_frame('ur:xmr-output/2-3/lpaoaxcfaxdscyhhprbaolrt', noise=6, seed=2)) == []
+    assert cache.stats()['hits'] == 2
+    assert cache.stats()['misses'] == 2
+
+
+def test_nothing_reused_without_qr_region(qr_frame):
+    cache = FrameHashCache()
+    frame = qr_frame('static')
+    assert cache.lookup(frame) is None
+    cache.store([], None)
+    assert cache.lookup(frame) is None
+
+
+def test_every_part_of_small_animated_qr_is_decoded(qr_frame):
+    # A code a third of the frame wide barely changes a whole frame thumbnail
+    # from one part to the next
+    size = 168
+    for fragment_len in (20, 60, 150):
+        encoder = UREncoder(UR('bytes', bytearray(range(256)) * 8), fragment_len, 0, 10)
+        cache = FrameHashCache()
+        for i in range(20):
+            frame = qr_frame(encoder.next_part(), size=size, noise=4, seed=i)
+            assert cache.lookup(frame) is None
+            cache.store([b'part'], qr_box(size))
+        assert cache.stats()['hits'] == 0
+
+
+def test_reuse_expires(qr_frame):
+    cache = FrameHashCache(max_reuse=2)
+    frame = qr_frame('static')
+    assert cache.lookup(frame) is None
+    cache.store([b'static'], qr_box(300))
+    assert cache.lookup(frame) == [b'static']
+    assert cache.lookup(frame) == [b'static']
+    assert cache.lookup(frame) is None
+    assert cache.stats()['expired'] == 1
@@ -0,0 +1,39 @@
+import numpy as np
+from PIL import Image, ImageFilter
+
+from xmrsigner.helpers.scan.triage import FrameTriage
+
+
+PART = 'ur:xmr-txunsigned/1-3/lpadaxcfaxhdcx'
+
+
+
+def test_sharp_qr_frame_is_accepted(qr_frame):
+    triage = FrameTriage()
+    result = triage.check(Image.fromarray(qr_frame(PART, size=360)))
+    assert result.accepted
+    assert result.finder_candidates >= 3
+    assert triage.rejected == 0
+
+
+def test_numpy_and_pil_frames_agree(qr_frame):
+    frame = Image.fromarray(qr_frame(PART, size=360))
+    triage = FrameTriage()
+    assert triage.analyze(frame).finder_candidates == triage.analyze(np.asarray(frame)).finder_candidates
+
+
+def test_blurred_and_empty_frames_are_rejected(qr_frame):
+    triage = FrameTriage()
+    assert triage.check(Image.fromarray(qr_frame(PART, size=360)).filter(ImageFilter.GaussianBlur(12))).reason == FrameTriage.REASON__BLUR
+    assert not triage.check(Image.new('RGB', (480, 480), (90, 90, 90))).accepted
+    stats = triage.stats()
+    assert stats['frames'] == 2
+    assert stats['rejected'] == 2
+    assert stats['rejected_blur'] == 2
+
+
+def test_consecutive_rejects_are_eventually_forced_through():
+    triage = FrameTriage(max_consecutive_rejects=2)
+    empty = Image.new('RGB', (480, 480), (90, 90, 90))
+    assert [triage.check(empty).accepted for i in range(3)] == [False, False, True]
+    assert triage.forced == 1
@@ -0,0 +1,154 @@
+from queue import Queue
+from threading import Event
+
+import pytest
+
+from xmrsigner.hardware.frames import FrameBuffer
+
+live_qr_scanner = pytest.importorskip('xmrsigner.helpers.live_qr_scanner')
+LiveQRScanEngine = live_qr_scanner.LiveQRScanEngine
+ScanProgress = live_qr_scanner.ScanProgress
+
+
+class FakeScanner:
+    """
+    Completes the scan on the frame `complete_on`.
+    """
+    ur_decoder = None
+
+    def __init__(self, complete_on):
+        self.complete_on = complete_on
+        self.frames = 0
+        self.scanned = []
+        self.closed = False
+        self.release = Event()
+
+    def scan_frame(self, frame):
+        self.release.wait(timeout=5)
+        self.frames += 1
+        self.scanned.append(frame)
+        done = frame == self.complete_on
+        return ScanProgress(done, 1.0 if done else 0.5, "Complete" if done else "Scanning...", None, self.frames)
+
+    def close(self):
+        self.closed = True
+
+
+def test_engine_decodes_fed_frames_until_complete():
+    scanner = FakeScanner(complete_on=3)
+    progress = Queue()
+    engine = LiveQRScanEngine(scanner, progress_queue=progress)
+    engine.start()
+    scanner.release.set()
+    for frame in (1, 2, 3):
+        engine.feed(frame)
+        update = progress.get(timeout=5)
+        assert update.frames == frame
+    engine.join(timeout=5)
+    assert not engine.is_alive()
+    assert update.is_complete and engine.is_complete
+    assert scanner.scanned == [1, 2, 3]
+    assert scanner.closed
+
+
+def test_engine_keeps_only_the_newest_waiting_frame():
+    scanner = FakeScanner(complete_on=None)
+    updates = []
+    engine = LiveQRScanEngine(scanner, callback=updates.append)
+    engine.start()
+    engine.feed(1)
+    # Frame 1 is being decoded; 2 is replaced by 3 before the engine gets to it
+    engine.feed(2)
+    engine.feed(3)
+    scanner.release.set()
+    engine.stop()
+    engine.join(timeout=5)
+    assert not engine.is_alive()
+    assert 2 not in scanner.scanned
+    assert engine.stats()['frames_dropped'] >= 1
+
+
+class FakeCamera:
+
+    def __init__(self):
+        self.frames = FrameBuffer()
+
+    def read_next_video_frame(self, after_seq=0, timeout=None, as_image=False):
+        if self.frames.closed:
+            raise Exception("Must call start_video_stream first.")
+        return self.frames.read_next(after_seq, timeout)
+
+
+def test_engine_reads_camera_frames_itself():
+    scanner = FakeScanner(complete_on=3)
+    scanner.release.set()
+    camera = FakeCamera()
+    progress = Queue()
+    engine = LiveQRScanEngine(scanner, progress_queue=progress, camera=camera, frame_wait_timeout=0.01)
+    engine.start()
+    for frame in (1, 2, 3):
+        camera.frames.put(frame)
+        progress.get(timeout=5)
+    engine.join(timeout=5)
+    assert scanner.scanned == [1, 2, 3]
+    assert engine.is_complete
+
+
+def test_engine_stops_with_the_camera_stream():
+    scanner = FakeScanner(complete_on=None)
+    camera = FakeCamera()
+    engine = LiveQRScanEngine(scanner, camera=camera, frame_wait_timeout=0.01)
+    engine.start()
+    camera.frames.close()
+    engine.join(timeout=5)
+    assert not engine.is_alive()
+    assert scanner.closed
+
+
+def test_bus_hands_every_update_to_all_subscribers():
+    bus = live_qr_scanner.ScanProgressBus()
+    seen = []
+    bus.subscribe(seen.append)
+    first, second = bus.subscribe(), bus.subscribe()
+    update = ScanProgress(False, 0.5, "Scanning... 1/2")
+    bus.publish(update)
+    assert seen == [update]
+    assert first.get_nowait() == second.get_nowait() == update
+    assert bus.latest == update
+
+
+def test_engine_stops_and_reports_a_failed_decode():
+    class FailingScanner(FakeScanner):
+        def scan_frame(self, frame):
+            raise ValueError('QR Fragment Unexpected Type Change')
+
+    scanner = FailingScanner(complete_on=None)
+    engine = LiveQRScanEngine(scanner)
+    updates = engine.bus.subscribe()
+    engine.start()
+    engine.feed(1)
+    update = updates.get(timeout=5)
+    engine.join(timeout=5)
+    assert not engine.is_alive()
+    assert update.is_final and isinstance(update.error, ValueError)
+
+
+def test_engine_records_decoded_frames():
+    class ListRecorder:
+        def __init__(self):
+            self.frames = []
+
+        def record(self, image, seq, timestamp, status=None, decode_time=0.0):
+            self.frames.append((image, seq))
+
+    scanner = FakeScanner(complete_on=2)
+    scanner.release.set()
+    recorder = ListRecorder()
+    engine = LiveQRScanEngine(scanner, recorder=recorder)
+    updates = engine.bus.subscribe()
+    engine.start()
+    for frame in (1, 2):
+        engine.feed(frame)
+        updates.get(timeout=5)
+    engine.join(timeout=5)
+    assert recorder.frames == [(1, 1), (2, 2)]
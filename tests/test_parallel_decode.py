@@ -0,0 +1,72 @@
+from xmrsigner.helpers.scan.backends import available_backends
+from xmrsigner.helpers.scan.pool import ParallelFrameDecoder
+
+
+
+def collect_all(pool: ParallelFrameDecoder, payloads: list) -> None:
+    while not pool.idle:
+        payloads.extend(pool.collect(timeout=30))
+
+
+def test_workers_decode_frames_from_shared_memory(qr_frame):
+    assert available_backends()
+    frames = [qr_frame(f'ur:xmr-output/{i}-4/lpadaxcfaxdscyhhprbaolrt') for i in range(1, 5)]
+    payloads = []
+    with ParallelFrameDecoder(workers=2) as pool:
+        for frame in frames:
+            pool.submit(frame)
+            collect_all(pool, payloads)
+        assert pool.stats()['frames_decoded'] == 4
+        assert sum(worker['frames'] for worker in pool.pipeline_stats('decode')) == 4
+        assert pool.pipeline_stats('pyramid')
+    assert sorted(payloads) == sorted(f'ur:xmr-output/{i}-4/lpadaxcfaxdscyhhprbaolrt'.encode() for i in range(1, 5))
+
+
+def test_latest_frame_wins_when_workers_are_busy(qr_frame):
+    with ParallelFrameDecoder(workers=1) as pool:
+        for i in range(1, 5):
+            pool.submit(qr_frame(f'frame {i}'))
+        payloads = []
+        collect_all(pool, payloads)
+        stats = pool.stats()
+    # The first frame went to the worker, 2 and 3 were replaced by 4
+    assert payloads == [b'frame 1', b'frame 4']
+    assert stats['frames_dropped'] == 2
+
+
+
+def test_dead_workers_are_dropped_then_frames_decoded_in_process(qr_frame):
+    payloads = []
+    with ParallelFrameDecoder(workers=2) as pool:
+        pool.submit(qr_frame('frame 1'))
+        collect_all(pool, payloads)
+        # A worker killed while decoding a frame (unless it just finished)
+        pool.submit(qr_frame('frame 2'))
+        busy = next(slot for slot in pool._slots if slot.busy)
+        busy.process.kill()
+        busy.process.join()
+        collect_all(pool, payloads)
+        for i in range(3, 5):
+            pool.submit(qr_frame(f'frame {i}'))
+            collect_all(pool, payloads)
+        assert pool.stats()['workers_lost'] == 1
+
+        # ...and an idle one, the last
+        pool._slots[0].process.kill()
+        pool._slots[0].process.join()
+        for i in range(5, 7):
+            pool.submit(qr_frame(f'frame {i}'))
+            collect_all(pool, payloads)
+        assert pool.stats()['workers_lost'] == 2
+        assert pool.idle
+    assert set(payloads) - {b'frame 2'} == {f'frame {i}'.encode() for i in (1, 3, 4, 5, 6)}
+
+
+def test_disabled_stage_has_no_worker_stats(qr_frame):
+    payloads = []
+    with ParallelFrameDecoder(workers=1, enhance=False) as pool:
+        pool.submit(qr_frame('frame 1'))
+        collect_all(pool, payloads)
+        assert pool.pipeline_stats('enhance') is None
+        assert len(pool.pipeline_stats('triage')) == 1
+    assert payloads == [b'frame 1']
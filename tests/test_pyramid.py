@@ -0,0 +1,99 @@
+import numpy as np
+from PIL import Image
+
+from xmrsigner.helpers.scan.pyramid import PyramidDecoder, downscale
+from xmrsigner.helpers.scan.strategy import DecodeStrategy, DecodeStrategyScheduler, Symbol
+
+
+PART = 'ur:xmr-output/1-9/lpadascfadaxcywenbpljkhdcahkadaemejtswhhylkepmykhhtsytsnoyoyaxaedsuttydmmhhpktpmsrjtdkgslpgh'
+
+
+
+def decoder_needing_width(min_width: int, calls: list):
+    """ Fake decode strategy that only succeeds once the image is wide enough """
+    def run(image):
+        width = image.shape[1]
+        calls.append(width)
+        return [Symbol(b'payload', (10, 10, 100, 100))] if width >= min_width else []
+    return run
+
+
+def test_downscale_matches_pil_reduce(qr_frame):
+    frame = qr_frame(PART, size=400)
+    from_numpy = downscale(frame, 2)
+    from_pil = downscale(Image.fromarray(frame), 2)
+    assert from_numpy.shape == (240, 240)
+    assert np.abs(from_numpy.astype(int) - from_pil.astype(int)).max() <= 2
+
+
+def test_coarse_hit_scales_rect_back(qr_frame):
+    calls = []
+    pyramid = PyramidDecoder(levels=(2, 1))
+    symbols = pyramid.decode(qr_frame(PART, size=400), decoder_needing_width(200, calls))
+    assert calls == [240]
+    assert symbols == [Symbol(b'payload', (20, 20, 200, 200))]
+
+
+def test_finer_level_only_when_finder_patterns_visible(qr_frame):
+    calls = []
+    pyramid = PyramidDecoder(levels=(2, 1))
+    assert pyramid.decode(qr_frame(PART, size=400), decoder_needing_width(480, calls))
+    assert calls == [240, 480]
+
+    calls.clear()
+    empty = np.full((480, 480, 3), 100, dtype=np.uint8)
+    assert pyramid.decode(empty, decoder_needing_width(480, calls)) == []
+    assert calls == [240]
+    assert pyramid.no_finder == 1
+
+
+def test_losing_coarse_level_is_demoted(qr_frame):
+    calls = []
+    pyramid = PyramidDecoder(levels=(2, 1), demote_after=2)
+    for i in range(2):
+        pyramid.decode(qr_frame(PART, size=400), decoder_needing_width(480, calls))
+    calls.clear()
+    pyramid.decode(qr_frame(PART, size=400), decoder_needing_width(480, calls))
+    assert calls == [480]
+    assert pyramid.stats()['start_factor'] == 1
+
+
+def test_levels_of_a_frame_count_once(qr_frame):
+    calls = []
+    scheduler = DecodeStrategyScheduler([DecodeStrategy('fake', decoder_needing_width(480, calls))])
+    pyramid = PyramidDecoder()
+    assert pyramid.decode(qr_frame(PART, size=400), scheduler.run, scheduler.run_more)
+    assert calls == [240, 480]
+    assert scheduler.frames == 1
+    assert scheduler.frames_decoded == 1
+
+
+def test_finer_level_tried_after_coarse_level_spent_the_budget(qr_frame):
+    calls = []
+
+    def slow(image):
+        calls.append('slow')
+        return []
+    scheduler = DecodeStrategyScheduler([
+        DecodeStrategy('slow', slow),
+        DecodeStrategy('fake', decoder_needing_width(480, calls)),
+    ], frame_budget=0)
+    pyramid = PyramidDecoder(levels=(2, 1), demote_after=2)
+    for i in range(2):
+        assert pyramid.decode(qr_frame(PART, size=400), scheduler.run, scheduler.run_more)
+    assert calls == ['slow', 480, 240, 480]
+    assert pyramid.stats()['start_factor'] == 1
+
+
+def test_coarse_level_demoted_when_finer_level_runs_out_of_budget(qr_frame):
+    calls = []
+    scheduler = DecodeStrategyScheduler([
+        DecodeStrategy('a', decoder_needing_width(10000, calls)),
+        DecodeStrategy('b', decoder_needing_width(10000, calls)),
+    ], frame_budget=0)
+    pyramid = PyramidDecoder(levels=(2, 1), demote_after=2)
+    for i in range(2):
+        args = (scheduler.run, scheduler.run_more, lambda: scheduler.over_budget)
+        assert pyramid.decode(qr_frame(PART, size=400), *args) == []
+    assert calls == [240, 480, 240, 480]
+    assert pyramid.stats()['start_factor'] == 1
@@ -0,0 +1,46 @@
+from xmrsigner.models.qr_classifier import PayloadClassifier, classify
+from xmrsigner.models.qr_type import QRType
+from xmrsigner.models.seed import Seed
+
+
+ADDRESS = '4AdUndXHHZ6cfufTMvppY6JwXNouMBzSkbLYfpAV5Usx3skxNgYeYTRj5UzqtReoS44qo9mtmXCqY45DJ852K5Jv2684Rge'
+
+
+def test_prefix_dispatch():
+    assert classify(b'ur:xmr-output/1-3/lpadaxcf') == QRType.XMR_OUTPUT_UR
+    assert classify('UR:XMR-TXUNSIGNED/2-9/lpaoaxcf') == QRType.XMR_TX_UNSIGNED_UR
+    assert classify(b'ur:xmr-keyimage/lpadaxcf') == QRType.XMR_KEYIMAGE_UR
+    assert classify(b'ur:xmr-txsigned/1-2/lpadaxcf') == QRType.XMR_TX_SIGNED_UR
+    assert classify(b'ur:crypto-psbt/1-2/lpadaxcf', 'en') == QRType.INVALID
+    assert classify(b'monero_wallet:' + ADDRESS.encode()) == QRType.MONERO_WALLET
+    assert classify(b'settings::v1 name=x') == QRType.SETTINGS
+
+
+def test_seed_and_address_payloads():
+    assert classify('1234' * 13, 'en') == QRType.SEED__SEEDQR
+    assert classify('1234' * 14, 'en') == QRType.INVALID
+    assert classify(ADDRESS, 'en') == QRType.MONERO_ADDRESS
+    assert classify('monero:' + ADDRESS, 'en') == QRType.MONERO_ADDRESS
+    # Right alphabet and length, bad checksum
+    assert classify(ADDRESS[:-1] + '1', 'en') == QRType.INVALID
+    words = Seed.get_wordlist('en')[:25]
+    assert classify(' '.join(words), 'en') == QRType.SEED__MNEMONIC
+    assert classify(' '.join(word[:4] for word in words), 'en') == QRType.SEED__FOUR_LETTER_MNEMONIC
+    assert classify('hello world', 'en') == QRType.INVALID
+
+
+def test_binary_compact_seedqr():
+    assert classify(bytes(range(200, 217)), 'en') == QRType.SEED__COMPACTSEEDQR
+    assert classify(bytes(range(200, 218)), 'en') == QRType.INVALID
+    assert classify(b'', 'en') == QRType.INVALID
+
+
+def test_sticky_fast_path():
+    classifier = PayloadClassifier('en')
+    assert classifier.classify(b'ur:xmr-txunsigned/1-9/lpadaxcf') == QRType.XMR_TX_UNSIGNED_UR
+    classifier.expect(QRType.XMR_TX_UNSIGNED_UR)
+    assert classifier.classify(b'ur:xmr-txunsigned/2-9/lpaoaxcf') == QRType.XMR_TX_UNSIGNED_UR
+    # Anything else still gets the full check
+    assert classifier.classify(ADDRESS) == QRType.MONERO_ADDRESS
+    assert classifier.fast_hits == 1
+    assert classifier.full_checks == 2
@@ -0,0 +1,20 @@
+import pytest
+
+from xmrsigner.models.threads import RateMeter
+
+
+def test_rate_over_window():
+    meter = RateMeter(window=2.0)
+    for i in range(11):
+        meter.tick(now=10 + i * 0.1)
+    assert meter.count == 11
+    assert meter.rate(now=11.0) == pytest.approx(10.0)
+
+
+def test_rate_drops_when_ticks_stop():
+    meter = RateMeter(window=2.0)
+    assert meter.rate(now=0) == 0.0
+    meter.tick(now=1.0)
+    meter.tick(now=1.5)
+    assert meter.rate(now=1.5) == pytest.approx(2.0)
+    assert meter.rate(now=10.0) == 0.0
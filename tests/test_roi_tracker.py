@@ -0,0 +1,37 @@
+import numpy as np
+
+from xmrsigner.helpers.scan.roi import RegionTracker
+from xmrsigner.helpers.scan.strategy import Symbol
+
+
+
+def test_full_frame_until_first_hit_then_padded_region():
+    frame = np.zeros((480, 480, 3), dtype=np.uint8)
+    tracker = RegionTracker(padding=0.1, max_misses=2)
+
+    region, offset = tracker.region(frame)
+    assert region.shape == frame.shape and offset == (0, 0)
+    tracker.update([Symbol(b'ur:xmr-output/1-2/x', (100, 120, 200, 200))], offset)
+
+    region, offset = tracker.region(frame)
+    assert offset == (80, 100)
+    assert region.shape[:2] == (240, 240)
+    # A hit inside the crop is translated back to frame coordinates
+    tracker.update([Symbol(b'ur:xmr-output/2-2/x', (30, 20, 200, 200))], offset)
+    assert tracker.box == (90, 100, 330, 340)
+    assert tracker.stats()['region_hits'] == 1
+
+
+def test_falls_back_to_full_frame_after_misses():
+    frame = np.zeros((480, 480), dtype=np.uint8)
+    tracker = RegionTracker(max_misses=2)
+    tracker.update([Symbol(b'x', (10, 10, 50, 50))], (0, 0))
+
+    for i in range(2):
+        region, offset = tracker.region(frame)
+        assert offset != (0, 0) or region.shape != frame.shape
+        tracker.update([], offset)
+
+    region, offset = tracker.region(frame)
+    assert region.shape == frame.shape
+    assert tracker.stats()['pixel_ratio'] < 1.0
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from xmrsigner.helpers.scan.recorder import load_recording
+
+corpus = pytest.importorskip('xmrsigner.helpers.scan.corpus')
+
+
+def test_frames_follow_display_and_camera_rates():
+    payload = corpus.synthetic_tx_payload(300)
+    frames = list(corpus.generate_frames(payload, 'H', loops=1.0, display_fps=5, camera_fps=10))
+    assert [frame.seq for frame in frames] == list(range(1, len(frames) + 1))
+    assert frames[1].timestamp == pytest.approx(0.1)
+    # Each part stays on screen for two captures
+    assert np.array_equal(frames[0].image, frames[1].image)
+    assert not np.array_equal(frames[1].image, frames[2].image)
+
+
+def test_effects_are_reproducible():
+    payload = corpus.synthetic_tx_payload(300)
+    effects = corpus.preset('handheld', moire=0.3, gamma=1.5, frame_size=(160, 120))
+    first = list(corpus.generate_frames(payload, 'M', effects, max_frames=3, seed=7))
+    second = list(corpus.generate_frames(payload, 'M', effects, max_frames=3, seed=7))
+    assert first[0].image.shape == (120, 160, 3)
+    assert all(np.array_equal(a.image, b.image) for a, b in zip(first, second))
+
+
+def test_written_corpus_loads_as_recording(tmp_path):
+    payload = corpus.synthetic_tx_payload(300)
+    frames = corpus.generate_frames(payload, 'H', corpus.CameraEffects(frame_size=(96, 96)), max_frames=7)
+    files = corpus.write_corpus(str(tmp_path), frames, 'test', chunk_size=3)
+    assert len(files) == 3
+    assert [frame.seq for frame in load_recording(str(tmp_path))] == list(range(1, 8))
@@ -0,0 +1,49 @@
+import numpy as np
+
+from xmrsigner.helpers.scan.recorder import NO_STATUS, ScanRecorder, load_recording
+
+
+def frames(count, shape=(48, 64, 3)):
+    rng = np.random.default_rng(0)
+    return [rng.integers(0, 256, shape, dtype=np.uint8) for i in range(count)]
+
+
+def test_recording_replays_frames_in_order(tmp_path):
+    images = frames(25)
+    recorder = ScanRecorder(str(tmp_path), capacity=30, chunk_size=10, session='test')
+    recorder.start()
+    for seq, image in enumerate(images, 1):
+        recorder.record(image, seq, 100 + seq / 10, status=4 if seq % 2 else None, decode_time=0.01)
+    recorder.stop()
+    recorder.join(timeout=10)
+    assert not recorder.is_alive()
+    assert recorder.stats()['frames_written'] == 25
+    assert len(list(tmp_path.glob('scan-test-*.npz'))) == 3
+
+    replayed = list(load_recording(str(tmp_path)))
+    assert [frame.seq for frame in replayed] == list(range(1, 26))
+    assert all(np.array_equal(frame.image, image) for frame, image in zip(replayed, images))
+    assert replayed[0].status == 4 and replayed[1].status == NO_STATUS
+    assert replayed[2].timestamp == 100.3
+    assert replayed[0].decode_time == 0.01
+
+
+def test_recorder_drops_oldest_frames_when_full(tmp_path):
+    # Not started: nothing is written and the ring buffer fills up
+    recorder = ScanRecorder(str(tmp_path), capacity=5, chunk_size=5)
+    for seq, image in enumerate(frames(8), 1):
+        recorder.record(image, seq, seq)
+    assert recorder.frames_dropped == 3
+    recorder.stop()
+    recorder.run()
+    assert [frame.seq for frame in load_recording(str(tmp_path))] == [4, 5, 6, 7, 8]
+
+
+def test_frames_of_another_size_go_to_their_own_archive(tmp_path):
+    recorder = ScanRecorder(str(tmp_path), chunk_size=4, session='test')
+    for seq, image in enumerate(frames(2) + frames(2, (32, 32)), 1):
+        recorder.record(image, seq, seq)
+    recorder.stop()
+    recorder.run()
+    assert len(recorder.files) == 2
+    assert [frame.image.shape for frame in load_recording(str(tmp_path))] == [(48, 64, 3)] * 2 + [(32, 32)] * 2
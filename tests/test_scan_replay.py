@@ -0,0 +1,98 @@
+import numpy as np
+from PIL import Image
+
+from xmrsigner.helpers.scan.recorder import RecordedFrame, ScanRecorder
+from xmrsigner.helpers.scan.replay import ScanReplay, load_frames
+
+
+class FakeDecoder:
+    """
+    Completes after `parts` frames carrying a payload (first pixel 255); a
+    stray QR code of another type (first pixel 1) raises.
+    """
+
+    def __init__(self, parts=3):
+        self.parts = parts
+        self.received = 0
+        self.is_invalid = False
+        self.is_ur = True
+        self.qr_type = None
+        self.closed = False
+
+    @property
+    def is_complete(self):
+        return self.received >= self.parts
+
+    def extract_image_payloads(self, image):
+        if not image[0, 0, 0]:
+            return []
+        return [b'part' if image[0, 0, 0] == 255 else b'stray']
+
+    def add_payloads(self, payloads):
+        if payloads == [b'stray']:
+            raise Exception('QR Fragment Unexpected Type Change')
+        self.received += 1
+
+    def get_part_stats(self):
+        return {'unique': self.received, 'duplicates': 0}
+
+    def close(self):
+        self.closed = True
+
+
+def frame(seq, timestamp, payload=True):
+    return RecordedFrame(seq, timestamp, np.full((4, 4, 3), 255 if payload else 0, dtype=np.uint8))
+
+
+def test_replay_decodes_every_frame_until_complete():
+    decoders = []
+
+    def factory(**options):
+        decoders.append(FakeDecoder(**options))
+        return decoders[-1]
+
+    frames = [frame(seq, seq / 10, payload=seq % 2 == 0) for seq in range(10)]
+    result = ScanReplay(frames, decoder_factory=factory, parts=3).run()
+    assert result['complete']
+    assert result['frames_decoded'] == 5
+    assert result['frames_with_payload'] == 3
+    assert result['frames_per_ur'] == 5
+    assert result['parts']['unique'] == 3
+    assert result['latency_ms']['wait'] is None
+    assert decoders[0].closed
+
+
+def test_replay_counts_a_failing_frame_and_goes_on():
+    frames = [frame(seq, seq / 10) for seq in range(4)]
+    frames[1].image[:] = 1
+    result = ScanReplay(frames, decoder_factory=FakeDecoder, parts=3).run()
+    assert result['complete']
+    assert result['frames_decoded'] == 4
+    assert result['frames_with_error'] == 1
+
+
+def test_realtime_replay_decodes_only_the_latest_frame():
+    # All frames were captured at once: only the last one is ever offered
+    frames = [frame(seq, 0.0) for seq in range(5)]
+    result = ScanReplay(frames, realtime=True, decoder_factory=FakeDecoder, parts=10).run()
+    assert not result['complete']
+    assert result['frames_decoded'] == 1
+    assert result['frames_skipped'] == 4
+    assert result['time_to_complete_s'] is None
+
+
+def test_load_frames_from_images_and_recordings(tmp_path):
+    images = tmp_path / 'images'
+    images.mkdir()
+    for i in range(3):
+        Image.new('RGB', (8, 6), (i, i, i)).save(images / f'frame_{i:03d}.png')
+    frames = load_frames(str(images), fps=5)
+    assert [f.timestamp for f in frames] == [0.0, 0.2, 0.4]
+    assert frames[2].image.shape == (6, 8, 3) and frames[2].image[0, 0, 0] == 2
+
+    recorder = ScanRecorder(str(tmp_path / 'recording'), chunk_size=2, session='test')
+    for f in frames:
+        recorder.record(f.image, f.seq, f.timestamp)
+    recorder.stop()
+    recorder.run()
+    assert [f.seq for f in load_frames(str(tmp_path / 'recording'))] == [0, 1, 2]
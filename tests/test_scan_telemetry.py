@@ -0,0 +1,86 @@
+import json
+from types import SimpleNamespace
+
+from xmrsigner.helpers.scan.telemetry import ScanTelemetry, percentiles
+from xmrsigner.models.base_decoder import DecodeQRStatus
+
+
+class FakeURDecoder:
+
+    def __init__(self, total):
+        self.fountain_decoder = SimpleNamespace(expected_part_indexes=set(range(total)))
+        self.total = total
+        self.received = set()
+        self.mixed = 0
+        self.unique = 0
+        self.duplicates = 0
+
+    def expected_part_count(self):
+        return self.total
+
+    def received_part_indexes(self):
+        return self.received
+
+    def mixed_part_count(self):
+        return self.mixed
+
+    def part_stats(self):
+        return {'unique': self.unique, 'duplicates': self.duplicates}
+
+
+def test_percentiles():
+    assert percentiles([]) is None
+    result = percentiles([0.001] * 99 + [0.1])
+    assert result['p50'] == 1.0
+    assert result['max'] == 100.0
+
+
+def test_counts_frames_fragments_and_latency():
+    telemetry = ScanTelemetry()
+    ur_decoder = FakeURDecoder(total=10)
+    start = telemetry.started
+    # Frames 1, 2, 4 and 5 decoded (3 dropped), frame 2 without a QR code
+    for seq, status in ((1, DecodeQRStatus.PART_COMPLETE), (2, DecodeQRStatus.FALSE), (4, DecodeQRStatus.PART_COMPLETE), (5, DecodeQRStatus.COMPLETE)):
+        if status != DecodeQRStatus.FALSE:
+            ur_decoder.unique += 1
+            ur_decoder.received.add(seq)
+        ur_decoder.mixed = seq % 3
+        telemetry.record_frame(seq, start + seq / 10, 0.02, status, ur_decoder, now=start + seq / 10 + 0.05)
+
+    snapshot = telemetry.snapshot()
+    assert snapshot['frames_decoded'] == 4
+    assert snapshot['frames_dropped'] == 1
+    assert snapshot['frames_without_qr'] == 1
+    assert (snapshot['fragments_recovered'], snapshot['fragments_total']) == (3, 10)
+    assert snapshot['max_mixed_backlog'] == 2
+    assert snapshot['parts_unique'] == 3
+    assert abs(snapshot['capture_fps'] - 10) < 1e-6
+    assert abs(snapshot['time_to_complete_s'] - 0.55) < 1e-6
+    assert abs(snapshot['latency_ms']['capture_to_decoded']['p50'] - 50) < 1e-6
+    assert telemetry.overlay_lines()[0] == 'frag 3/10 mix 2'
+
+
+def test_limited_by():
+    def run(frames, status=DecodeQRStatus.PART_COMPLETE, step=1, decode_time=0.05, duplicates=0):
+        telemetry = ScanTelemetry()
+        ur_decoder = FakeURDecoder(total=10)
+        for i in range(frames):
+            ur_decoder.unique = i + 1 - min(i, duplicates)
+            ur_decoder.duplicates = min(i, duplicates)
+            telemetry.record_frame(i * step, i * step / 10, decode_time, status, ur_decoder, now=i * step / 10)
+        return telemetry.limited_by()
+
+    assert run(5) is None
+    assert run(20, status=DecodeQRStatus.FALSE) == 'camera'
+    assert run(20, step=3) == 'decode'
+    assert run(20, duplicates=15) == 'display'
+    assert run(20) == 'fountain'
+    assert run(15, decode_time=0.01) == 'camera'
+
+
+def test_export(tmp_path):
+    telemetry = ScanTelemetry()
+    telemetry.record_frame(1, telemetry.started, 0.01, DecodeQRStatus.FALSE)
+    filename = telemetry.export(str(tmp_path / 'scans' / 'telemetry.json'))
+    with open(filename) as f:
+        assert json.load(f)['frames_without_qr'] == 1
@@ -0,0 +1,244 @@
+from random import Random
+
+from xmrsigner.helpers.ur2.crc32 import crc32
+from xmrsigner.helpers.ur2.fountain_decoder import FountainDecoder, InvalidChecksum
+from xmrsigner.helpers.ur2.fountain_encoder import FountainEncoder
+from xmrsigner.helpers.ur2.fountain_utils import choose_fragment_mask, choose_fragments, indexes_to_mask, is_single_index, mask_to_indexes, shuffled
+from xmrsigner.helpers.ur2.gf2 import GF2Basis
+from xmrsigner.helpers.ur2.part_cache import SeenPartsCache
+from xmrsigner.helpers.ur2.random_sampler import RandomSampler
+from xmrsigner.helpers.ur2.ur import UR
+from xmrsigner.helpers.ur2.ur_decoder import URDecoder
+from xmrsigner.helpers.ur2.ur_encoder import UREncoder
+from xmrsigner.helpers.ur2.utils import bytes_to_int, int_to_bytes, int_to_fragment, xor_into
+from xmrsigner.helpers.ur2.xoshiro256 import Xoshiro256
+
+
+def test_receive_parts_from_one_frame():
+    message = bytearray(range(200))
+    encoder = UREncoder(UR('bytes', message), 30, 0, 10)
+    parts = [encoder.next_part() for i in range(encoder.fountain_encoder.seq_len())]
+
+    decoder = URDecoder()
+    # Two frames with several tiled parts each
+    assert decoder.receive_parts(parts[:4]) == 4
+    assert not decoder.is_complete()
+    assert decoder.receive_parts(parts[4:] + parts[:1]) == len(parts) - 4
+    assert decoder.is_success()
+    assert decoder.result_message().cbor == message
+
+
+def test_repeated_parts_are_rejected_before_decoding():
+    message = bytearray(range(200))
+    encoder = UREncoder(UR('bytes', message), 30, 0, 10)
+    parts = [encoder.next_part() for i in range(encoder.fountain_encoder.seq_len())]
+
+    decoder = URDecoder()
+    assert decoder.receive_part(parts[0])
+    # The sender loops: the same part scanned again is dropped as a repeat
+    assert not decoder.receive_part(parts[0])
+    assert decoder.processed_parts_count() == 1
+    decoder.receive_parts(parts[1:])
+    assert decoder.is_success()
+    stats = decoder.part_stats()
+    assert stats['unique'] == len(parts)
+    assert stats['duplicates'] == 1
+    assert stats['duplicate_rate'] == 1 / (len(parts) + 1)
+
+
+def test_seen_parts_cache_is_bounded():
+    cache = SeenPartsCache(max_size=2)
+    assert cache.check('a')
+    assert cache.check('b')
+    assert not cache.check('a')
+    # 'b' is the least recently seen and goes first
+    assert cache.check('c')
+    assert 'b' not in cache
+    assert 'a' in cache and 'c' in cache
+    assert len(cache) == 2
+
+
+def test_fountain_decoder_solves_mixed_parts_only():
+    message = bytearray(range(256)) * 4
+    encoder = FountainEncoder(message, 40, 0, 10)
+    seq_len = encoder.seq_len()
+    # Skip the pure fragments and every third mixed part
+    encoder.seq_num = seq_len
+    parts = [encoder.next_part() for i in range(6 * seq_len)]
+    parts = [part for i, part in enumerate(parts) if i % 3]
+
+    decoder = FountainDecoder()
+    backlog = 0
+    for part in parts:
+        decoder.receive_part(part)
+        backlog = max(backlog, decoder.mixed_part_count())
+        if decoder.is_complete():
+            break
+    assert decoder.is_success() == bytes(message)
+    assert backlog > 0
+    assert decoder.received_part_indexes == set(range(seq_len))
+
+
+class ListPeelingDecoder:
+    """
+    The peeling of the original list based FountainDecoder: fragments as
+    frozensets in insertion ordered dicts, reduced in that order.
+    """
+
+    def __init__(self):
+        self.solved = {}
+        self.mixed = {}
+        self.queue = []
+
+    def receive_part(self, part):
+        self.queue.append((frozenset(choose_fragments(part.seq_num, part.seq_len, part.checksum)), bytes_to_int(part.data)))
+        while self.queue and len(self.solved) < part.seq_len:
+            indexes, value = self.queue.pop(0)
+            if len(indexes) == 1:
+                self.process_simple(indexes, value, part.seq_len)
+            else:
+                self.process_mixed(indexes, value)
+        return len(self.solved) == part.seq_len
+
+    def reduce_mixed_by(self, indexes, value):
+        mixed = {}
+        for r_indexes, r_value in self.mixed.values():
+            if indexes <= r_indexes:
+                r_indexes, r_value = r_indexes - indexes, r_value ^ value
+            if len(r_indexes) == 1:
+                self.queue.append((r_indexes, r_value))
+            else:
+                mixed[r_indexes] = (r_indexes, r_value)
+        self.mixed = mixed
+
+    def process_simple(self, indexes, value, seq_len):
+        index, = indexes
+        if index in self.solved:
+            return
+        self.solved[index] = value
+        if len(self.solved) < seq_len:
+            self.reduce_mixed_by(indexes, value)
+
+    def process_mixed(self, indexes, value):
+        for index, solved in self.solved.items():
+            if index in indexes:
+                indexes, value = indexes - {index}, value ^ solved
+        for r_indexes, r_value in self.mixed.values():
+            if r_indexes <= indexes:
+                indexes, value = indexes - r_indexes, value ^ r_value
+        if len(indexes) == 1:
+            self.queue.append((indexes, value))
+        else:
+            self.reduce_mixed_by(indexes, value)
+            self.mixed[indexes] = (indexes, value)
+
+
+def test_peeling_completes_after_the_same_part_as_the_list_decoder():
+    rng = Random(0)
+    for trial in range(40):
+        message = bytearray(rng.getrandbits(8) for i in range(rng.choice([800, 2304])))
+        encoder = FountainEncoder(message, rng.choice([60, 100]), 0, 10)
+        seq_len = encoder.seq_len()
+        encoder.seq_num = rng.randrange(0, 3 * seq_len)
+        # Lost, repeated and reordered parts
+        parts = [encoder.next_part() for i in range(4 * seq_len + 20)]
+        parts = [part for part in parts if rng.random() >= 0.3]
+        parts += rng.sample(parts, len(parts) // 5)
+        rng.shuffle(parts)
+
+        reference = ListPeelingDecoder()
+        expected = next(count for count, part in enumerate(parts, 1) if reference.receive_part(part))
+        decoder = FountainDecoder(elimination=False)
+        for count, part in enumerate(parts, 1):
+            decoder.receive_part(part)
+            if decoder.is_complete():
+                break
+        assert count == expected
+        assert decoder.is_success() == bytes(message)
+
+
+def test_fragment_masks():
+    assert indexes_to_mask({0, 3, 5}) == 0b101001
+    assert mask_to_indexes(0b101001) == [0, 3, 5]
+    assert is_single_index(0b1000) and not is_single_index(0b1010) and not is_single_index(0)
+
+
+def test_elimination_completes_with_fewer_parts():
+    message = bytearray(range(256)) * 8
+    encoder = FountainEncoder(message, 30, 0, 10)
+    seq_len = encoder.seq_len()
+    encoder.seq_num = seq_len
+    parts = [encoder.next_part() for i in range(6 * seq_len)]
+
+    def decode(elimination):
+        decoder = FountainDecoder(elimination=elimination)
+        for count, part in enumerate(parts, 1):
+            decoder.receive_part(part)
+            if decoder.is_complete():
+                return decoder, count
+
+    peeled, peeled_count = decode(False)
+    eliminated, eliminated_count = decode(True)
+    assert peeled.is_success() == eliminated.is_success() == bytes(message)
+    assert eliminated.solved_by_elimination
+    assert eliminated_count < peeled_count
+
+
+def test_gf2_basis_solves_mixed_rows():
+    basis = GF2Basis()
+    values = {0: 5, 1: 9, 2: 12}
+    for mask in (0b011, 0b110, 0b011, 0b111):
+        value = 0
+        for i in mask_to_indexes(mask):
+            value ^= values[i]
+        basis.add(mask, value)
+    assert basis.rank() == 3
+    assert basis.is_determined(0b111)
+    assert basis.solve() == values
+
+
+def test_xor_into_whole_buffer():
+    target = bytearray(b'\x00\xff\x0f\xf0')
+    xor_into(target, b'\xff\xff\x00\x0f')
+    assert target == bytearray(b'\xff\x00\x0f\xff')
+    assert int_to_fragment(0x0102, 4) == b'\x00\x00\x01\x02'
+
+
+def test_fragment_selection_matches_full_shuffle():
+    for seq_len in (1, 2, 17, 60, 301):
+        for seq_num in range(seq_len - 2, seq_len + 40):
+            if seq_num < 1:
+                continue
+            expected = {seq_num - 1}
+            if seq_num > seq_len:
+                # As selected before the partial shuffle and the caches
+                rng = Xoshiro256.from_bytes(int_to_bytes(seq_num) + int_to_bytes(0x1234abcd))
+                degree = RandomSampler([1.0 / i for i in range(1, seq_len + 1)]).next(rng.next_double) + 1
+                expected = set(shuffled(list(range(seq_len)), rng)[:degree])
+            assert choose_fragments(seq_num, seq_len, 0x1234abcd) == expected
+            assert choose_fragment_mask(seq_num, seq_len, 0x1234abcd) == indexes_to_mask(expected)
+
+
+def test_fountain_decoder_reassembles_in_place():
+    message = bytearray(range(256)) * 3 + bytearray(7)
+    encoder = FountainEncoder(message, 50, 0, 10)
+    seq_len = encoder.seq_len()
+    parts = [encoder.next_part() for i in range(seq_len)]
+
+    # The pure fragments, last first: checksummed only once the first arrives
+    decoder = FountainDecoder()
+    for part in reversed(parts):
+        decoder.receive_part(part)
+        assert decoder.checksummed_count == (seq_len if decoder.is_complete() else 0)
+    result = decoder.result_message()
+    assert isinstance(result, memoryview)
+    assert result.obj is decoder.message
+    assert result == bytes(message)
+
+    assert crc32(message[100:], crc32(message[:100])) == crc32(message)
+
+    decoder = FountainDecoder()
+    parts[1].data = bytes(len(parts[1].data))
+    for part in parts:
+        decoder.receive_part(part)
+    assert isinstance(decoder.is_failure(), InvalidChecksum)
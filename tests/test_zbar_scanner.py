@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+pyzbar = pytest.importorskip('pyzbar.pyzbar', reason='libzbar not available', exc_type=ImportError)
+
+from xmrsigner.helpers.scan.zbar import ZbarScanner
+
+
+
+def test_scanner_is_reused_across_frames_and_sizes(qr_frame):
+    with ZbarScanner() as scanner:
+        for i in range(3):
+            data = f'ur:xmr-output/{i + 1}-3/lpadascfadaxcywenbpljkhd'
+            assert [s.data for s in scanner.decode(qr_frame(data))] == [data.encode()]
+        # Crops and PIL images go through the same buffer
+        assert scanner.decode(qr_frame('crop')[60:420, 60:420])[0].data == b'crop'
+        assert scanner.decode(Image.fromarray(qr_frame('pil')))[0].data == b'pil'
+        assert scanner.decode(np.zeros((480, 480, 3), dtype=np.uint8)) == []
+
+
+def test_matches_pyzbar_rect(qr_frame):
+    frame = qr_frame('rect')
+    with ZbarScanner() as scanner:
+        symbol = scanner.decode(frame)[0]
+    expected = pyzbar.decode(frame, symbols=[pyzbar.ZBarSymbol.QRCODE])[0]
+    assert symbol.rect == tuple(expected.rect)
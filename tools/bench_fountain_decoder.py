@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Measures how many fountain parts an animated UR needs before it decodes, with
+the GF(2) elimination fallback of FountainDecoder off (peeling only) and on.
+
+The scan starts at a random point of the sender's part sequence and a share of
+the parts is lost, as when the camera misses frames; both decoders see exactly
+the same parts.
+"""
+from argparse import ArgumentParser
+from contextlib import redirect_stdout
+from json import dumps
+from os import devnull
+from random import Random
+from time import perf_counter
+
+from xmrsigner.helpers.ur2.fountain_decoder import FountainDecoder
+from xmrsigner.helpers.ur2.fountain_encoder import FountainEncoder
+
+
+def parts_to_complete(parts, elimination: bool):
+    decoder = FountainDecoder(elimination=elimination)
+    start = perf_counter()
+    for count, part in enumerate(parts, 1):
+        decoder.receive_part(part)
+        if decoder.is_complete():
+            return count, perf_counter() - start, decoder.solved_by_elimination
+    return None, perf_counter() - start, False
+
+
+def bench(message_len: int, fragment_len: int, trials: int, loss: float, rng: Random) -> dict:
+    runs = {False: [], True: []}
+    times = {False: 0.0, True: 0.0}
+    solved_by_elimination = 0
+    seq_len = None
+    for trial in range(trials):
+        encoder = FountainEncoder(bytearray(rng.getrandbits(8) for i in range(message_len)), fragment_len, 0, 10)
+        seq_len = encoder.seq_len()
+        encoder.seq_num = rng.randrange(0, 4 * seq_len)
+        parts = [encoder.next_part() for i in range(6 * seq_len + 20)]
+        parts = [part for part in parts if rng.random() >= loss]
+        for elimination in (False, True):
+            count, elapsed, eliminated = parts_to_complete(parts, elimination)
+            runs[elimination].append(count)
+            times[elimination] += elapsed
+            solved_by_elimination += eliminated
+    result = {'message_len': message_len, 'fragment_len': fragment_len, 'seq_len': seq_len, 'trials': trials, 'loss': loss}
+    for elimination, name in ((False, 'peeling'), (True, 'elimination')):
+        counts = [count for count in runs[elimination] if count is not None]
+        result[name] = {
+            'completed': len(counts),
+            'avg_parts_to_complete': sum(counts) / len(counts) if counts else None,
+            'avg_parts_per_fragment': sum(counts) / len(counts) / seq_len if counts else None,
+            'avg_decode_ms': times[elimination] / trials * 1000,
+        }
+    result['solved_by_elimination'] = solved_by_elimination
+    before, after = result['peeling']['avg_parts_to_complete'], result['elimination']['avg_parts_to_complete']
+    result['parts_saved'] = 1 - after / before if before and after else None
+    return result
+
+
+def main():
+    parser = ArgumentParser(description='Fountain parts to complete with and without GF(2) elimination')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[500, 2000, 5000], help='message lengths in bytes')
+    parser.add_argument('--fragment-lens', type=int, nargs='+', default=[30, 120], help='max fragment lengths (QR density)')
+    parser.add_argument('--trials', type=int, default=20)
+    parser.add_argument('--loss', type=float, default=0.2, help='share of the parts the camera misses')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = Random(args.seed)
+    results = []
+    # The decoder's debug output would dominate the timings
+    with open(devnull, 'w') as quiet, redirect_stdout(quiet):
+        for size in args.sizes:
+            for fragment_len in args.fragment_lens:
+                results.append(bench(size, fragment_len, args.trials, args.loss, rng))
+    print(dumps({'runs': results}, indent=4))
+
+
+if __name__ == '__main__':
+    main()
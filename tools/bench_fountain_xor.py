@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark of the XOR used to mix and reduce fountain parts, per fragment
+size: the former per byte loop, `utils.xor_into` on a bytearray, the int XOR
+the fountain encoder and decoder run on the fragments they hold, and numpy
+`bitwise_xor` into a preallocated buffer. Also times `FountainEncoder.mix` for
+a part of degree 3.
+"""
+from argparse import ArgumentParser
+from json import dumps
+from os import urandom
+from timeit import timeit
+
+import numpy as np
+
+from xmrsigner.helpers.ur2.fountain_encoder import FountainEncoder
+from xmrsigner.helpers.ur2.utils import bytes_to_int, xor_into
+
+
+def xor_bytewise(target, source):
+    for i in range(len(target)):
+        target[i] ^= source[i]
+
+
+def bench(fragment_len: int, number: int) -> dict:
+    target, source = bytearray(urandom(fragment_len)), bytes(urandom(fragment_len))
+    target_value, source_value = bytes_to_int(target), bytes_to_int(source)
+    target_array, source_array = np.frombuffer(bytearray(target), dtype=np.uint8), np.frombuffer(source, dtype=np.uint8)
+    encoder = FountainEncoder(bytearray(urandom(fragment_len * 10)), fragment_len, 0, min(10, fragment_len))
+
+    def us(stmt):
+        return timeit(stmt, number=number) / number * 1e6
+
+    return {
+        'fragment_len': fragment_len,
+        'bytewise_us': us(lambda: xor_bytewise(target, source)),
+        'xor_into_us': us(lambda: xor_into(target, source)),
+        'int_us': us(lambda: target_value ^ source_value),
+        'numpy_us': us(lambda: np.bitwise_xor(target_array, source_array, out=target_array)),
+        'encoder_mix_us': us(lambda: encoder.mix((0, 3, 7))),
+    }
+
+
+def main():
+    parser = ArgumentParser(description='XOR kernels for fountain fragments')
+    parser.add_argument('--fragment-lens', type=int, nargs='+', default=[10, 30, 100, 200, 500])
+    parser.add_argument('--number', type=int, default=20000, help='repetitions per measurement')
+    args = parser.parse_args()
+    print(dumps({'runs': [bench(fragment_len, args.number) for fragment_len in args.fragment_lens]}, indent=4))
+
+
+if __name__ == '__main__':
+    main()
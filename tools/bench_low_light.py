@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Measures how many camera frames an animated UR scan needs to complete under
+low, uneven light, with the contrast enhancement stage of DecodeQR on and off.
+
+The animated QR is rendered with a brightness gradient across the frame, a
+reduced contrast and sensor noise; both runs see exactly the same frames.
+"""
+from argparse import ArgumentParser
+from json import dumps
+from os import urandom
+
+import numpy as np
+from PIL import Image
+from qrcode import QRCode
+from qrcode.constants import ERROR_CORRECT_L
+
+from xmrsigner.helpers.ur2.ur import UR
+from xmrsigner.helpers.ur2.ur_encoder import UREncoder
+from xmrsigner.models.decode_qr import DecodeQR
+
+
+def low_light_frames(parts, size: int, contrast: float, darkest: float, noise: float, seed: int):
+    rng = np.random.default_rng(seed)
+    light = np.linspace(darkest, 1.0, size, dtype=np.float32)[None, :]
+    for part in parts:
+        qr = QRCode(error_correction=ERROR_CORRECT_L, border=2)
+        qr.add_data(part)
+        qr.make(fit=True)
+        code = qr.make_image().convert('L').resize((size * 3 // 4, size * 3 // 4), Image.NEAREST)
+        screen = Image.new('L', (size, size), 128)
+        screen.paste(code, (size // 8, size // 8))
+        pixels = (np.asarray(screen, dtype=np.float32) * contrast + 60) * light + 40
+        pixels += rng.normal(0, noise, pixels.shape)
+        gray = np.clip(pixels, 0, 255).astype(np.uint8)
+        yield np.repeat(gray[:, :, None], 3, axis=2)
+
+
+def frames_to_completion(frames, enhance: bool, max_frames: int) -> dict:
+    decoder = DecodeQR(enhance=enhance)
+    for i, frame in enumerate(frames):
+        if i >= max_frames:
+            break
+        decoder.add_image(frame)
+        if decoder.is_complete:
+            return {'enhance': enhance, 'complete': True, 'frames': i + 1, 'enhance_stats': decoder.get_enhance_stats()}
+    return {'enhance': enhance, 'complete': False, 'frames': max_frames, 'enhance_stats': decoder.get_enhance_stats()}
+
+
+def main():
+    parser = ArgumentParser(description='Frames to completion with contrast enhancement on and off')
+    parser.add_argument('--payload-size', type=int, default=2000, help='bytes in the animated UR')
+    parser.add_argument('--fragment-size', type=int, default=100)
+    parser.add_argument('--size', type=int, default=480, help='frame width and height')
+    parser.add_argument('--contrast', type=float, default=0.15, help='screen contrast, 1.0 is full')
+    parser.add_argument('--darkest', type=float, default=0.2, help='light level at the dark edge, 1.0 is even light')
+    parser.add_argument('--noise', type=float, default=3.0, help='sensor noise sigma')
+    parser.add_argument('--max-frames', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    encoder = UREncoder(UR('xmr-txunsigned', bytearray(urandom(args.payload_size))), args.fragment_size, 0, 10)
+    parts = [encoder.next_part() for i in range(args.max_frames)]
+    results = []
+    for enhance in (False, True):
+        frames = low_light_frames(parts, args.size, args.contrast, args.darkest, args.noise, args.seed)
+        results.append(frames_to_completion(frames, enhance, args.max_frames))
+    print(dumps({'parts_needed': encoder.fountain_encoder.seq_len(), 'runs': results}, indent=4))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Replays a large animated xmr-txunsigned UR at camera speed through DecodeQR with
+0 (decode on the calling thread) up to N decode worker processes and reports
+frames decoded per second and time to complete for each.
+"""
+from argparse import ArgumentParser
+from json import dumps
+from os import cpu_count, urandom
+from time import perf_counter, sleep
+
+import numpy as np
+from PIL import Image
+from qrcode import QRCode
+from qrcode.constants import ERROR_CORRECT_L
+
+from xmrsigner.helpers.ur2.ur import UR
+from xmrsigner.helpers.ur2.ur_encoder import UREncoder
+from xmrsigner.models.decode_qr import DecodeQR
+
+
+def render(part: str, size: int) -> np.ndarray:
+    qr = QRCode(error_correction=ERROR_CORRECT_L, border=2)
+    qr.add_data(part)
+    qr.make(fit=True)
+    code = qr.make_image().convert('L').resize((size * 3 // 4, size * 3 // 4), Image.NEAREST)
+    # Grayscale keeps hundreds of pre-rendered frames affordable in memory
+    frame = Image.new('L', (size, size), 128)
+    frame.paste(code, (size // 8, size // 8))
+    return np.asarray(frame)
+
+
+def run(frames, workers: int, fps: float) -> dict:
+    decoder = DecodeQR(decode_workers=workers)
+    interval = 1 / fps if fps else 0
+    start = perf_counter()
+    submitted = 0
+    try:
+        for frame in frames:
+            frame_start = perf_counter()
+            decoder.add_image(frame)
+            submitted += 1
+            if decoder.is_complete:
+                break
+            # The camera does not wait for the decoder
+            sleep(max(0.0, interval - (perf_counter() - frame_start)))
+        elapsed = perf_counter() - start
+        pool = decoder.get_pool_stats()
+    finally:
+        decoder.close()
+    decoded = pool['frames_decoded'] if pool else submitted
+    return {
+        'workers': workers,
+        'complete': decoder.is_complete,
+        'frames_submitted': submitted,
+        'frames_decoded': decoded,
+        'decoded_fps': decoded / elapsed,
+        'time_to_complete_s': elapsed if decoder.is_complete else None,
+        'pool': pool,
+    }
+
+
+def main():
+    parser = ArgumentParser(description='Decode throughput with 0..N decode worker processes')
+    parser.add_argument('--payload-size', type=int, default=10000, help='bytes in the animated UR')
+    parser.add_argument('--fragment-size', type=int, default=150)
+    parser.add_argument('--size', type=int, default=480, help='frame width and height')
+    parser.add_argument('--fps', type=float, default=30, help='camera frame rate; 0 feeds frames as fast as possible')
+    parser.add_argument('--max-workers', type=int, default=cpu_count() or 1)
+    parser.add_argument('--max-frames', type=int, default=600)
+    args = parser.parse_args()
+
+    encoder = UREncoder(UR('xmr-txunsigned', bytearray(urandom(args.payload_size))), args.fragment_size, 0, 10)
+    frames = [render(encoder.next_part(), args.size) for i in range(args.max_frames)]
+    results = [run(frames, workers, args.fps) for workers in range(args.max_workers + 1)]
+    print(dumps({'parts': encoder.fountain_encoder.seq_len(), 'runs': results}, indent=4))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Cost per classification of decoded QR payloads, per payload kind, for the full
+classifier and for the sticky fast path a scan session takes once its QR type
+is known.
+"""
+from argparse import ArgumentParser
+from os import urandom
+from time import perf_counter
+
+from xmrsigner.helpers.ur2.ur import UR
+from xmrsigner.helpers.ur2.ur_encoder import UREncoder
+from xmrsigner.models.qr_classifier import PayloadClassifier, classify, word_sets
+from xmrsigner.models.seed import Seed
+
+
+ADDRESS = '4AdUndXHHZ6cfufTMvppY6JwXNouMBzSkbLYfpAV5Usx3skxNgYeYTRj5UzqtReoS44qo9mtmXCqY45DJ852K5Jv2684Rge'
+
+
+def corpus(language: str) -> dict:
+    encoder = UREncoder(UR('xmr-txunsigned', bytearray(urandom(2000))), 100, 0, 10)
+    words = Seed.get_wordlist(language)[:25]
+    return {
+        'ur part': [encoder.next_part().encode() for i in range(50)],
+        'seedqr': [b'0123' * 13],
+        'address': [ADDRESS.encode()],
+        'mnemonic': [' '.join(words).encode()],
+        '4 letter mnemonic': [' '.join(w[:4] for w in words).encode()],
+        'wallet': [b'monero_wallet:' + ADDRESS.encode() + b'?view_key=00'],
+        'compact seedqr': [urandom(17)],
+        'garbage': [b'https://example.com/not-a-seed'],
+    }
+
+
+def per_call_us(fn, payloads, iterations: int) -> float:
+    start = perf_counter()
+    for i in range(iterations):
+        for payload in payloads:
+            fn(payload)
+    return (perf_counter() - start) / (iterations * len(payloads)) * 1e6
+
+
+def main():
+    parser = ArgumentParser(description='QR payload classification cost')
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--language', default='en')
+    args = parser.parse_args()
+
+    word_sets(args.language)  # wordlist sets are built once per language
+    for kind, payloads in corpus(args.language).items():
+        full = per_call_us(lambda p: classify(p, args.language), payloads, args.iterations)
+        session = PayloadClassifier(args.language)
+        session.expect(classify(payloads[0], args.language))
+        sticky = per_call_us(session.classify, payloads, args.iterations)
+        print(f'{kind:18} {session.expected:28} classify {full:8.2f} us  in session {sticky:8.2f} us')
+
+
+if __name__ == '__main__':
+    main()
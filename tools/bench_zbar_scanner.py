@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Compares per-frame decode time of `pyzbar.decode` against the persistent
+ZbarScanner used by scan sessions, on a frame with a QR code and an empty one
+(where the per-call scanner setup is most of the cost).
+"""
+from argparse import ArgumentParser
+from time import perf_counter
+
+import numpy as np
+from PIL import Image
+from qrcode import QRCode
+from pyzbar import pyzbar
+from pyzbar.pyzbar import ZBarSymbol
+
+from xmrsigner.helpers.scan.zbar import ZbarScanner
+
+
+def qr_frame(size: int, data: str) -> np.ndarray:
+    qr = QRCode(border=4)
+    qr.add_data(data)
+    qr.make(fit=True)
+    code = qr.make_image().convert('RGB').resize((size * 3 // 4, size * 3 // 4), Image.NEAREST)
+    frame = Image.new('RGB', (size, size), (128, 128, 128))
+    frame.paste(code, (size // 8, size // 8))
+    return np.asarray(frame)
+
+
+def per_frame_ms(decode, frame: np.ndarray, iterations: int) -> float:
+    decode(frame)
+    start = perf_counter()
+    for i in range(iterations):
+        decode(frame)
+    return (perf_counter() - start) / iterations * 1000
+
+
+def main():
+    parser = ArgumentParser(description='pyzbar.decode vs persistent ZbarScanner')
+    parser.add_argument('--size', type=int, default=480, help='frame width and height in pixels')
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--data', default='ur:xmr-txunsigned/1-9/' + 'lpadascfadaxcywenbpljkhdcahkadaemejtswhhylkepmykhhtsytsnoyoyaxaedsuttydmmhhpktpmsrjtdkgslpgh' * 2)
+    args = parser.parse_args()
+
+    frames = {
+        'qr': qr_frame(args.size, args.data),
+        'empty': np.full((args.size, args.size, 3), 128, dtype=np.uint8),
+    }
+    with ZbarScanner() as scanner:
+        for name, frame in frames.items():
+            per_call = per_frame_ms(lambda f: pyzbar.decode(f, symbols=[ZBarSymbol.QRCODE]), frame, args.iterations)
+            persistent = per_frame_ms(scanner.decode, frame, args.iterations)
+            print(f'{name:6} pyzbar.decode {per_call:8.3f} ms  ZbarScanner {persistent:8.3f} ms  saved {per_call - persistent:8.3f} ms/frame')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Times every available QR decoder backend on the bundled calibration frames and
+prints the results as JSON. With --store the chosen backend is written to the
+settings like the calibration run at startup.
+"""
+from argparse import ArgumentParser
+from json import dumps
+
+from xmrsigner.helpers.scan.backends import available_backends
+from xmrsigner.helpers.scan.calibration import calibrate, store_backend
+
+
+def main():
+    parser = ArgumentParser(description='Benchmark QR decoder backends on the calibration frames')
+    parser.add_argument('--backend', action='append', help='limit to this backend (repeatable)')
+    parser.add_argument('--repeat', type=int, default=3, help='passes over the calibration frames')
+    parser.add_argument('--min-success-rate', type=float, default=0.9)
+    parser.add_argument('--store', action='store_true', help='store the chosen backend in the settings')
+    args = parser.parse_args()
+
+    chosen, results = calibrate(backends=args.backend, repeat=args.repeat, min_success_rate=args.min_success_rate)
+    print(dumps({
+        'available': available_backends(),
+        'chosen': chosen,
+        'results': [result.to_dict() for result in results],
+    }, indent=4))
+    if args.store:
+        store_backend(chosen)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Generates a synthetic corpus of animated QR scans for benchmarking the scanner
+without a second device.
+
+A random `xmr-txunsigned` payload of each size is encoded as the device would
+show it at each QR density and captured through a simulated camera (scale,
+perspective, blur, noise, gamma, moiré). Every combination is written as a scan
+recording to its own directory, `<output>/<size>-<density>-<preset>`, ready for
+`tools/replay_scan.py`. The same arguments and seed always give the same frames.
+"""
+from argparse import ArgumentParser
+from json import dumps
+from os import path
+
+from xmrsigner.helpers.scan.corpus import CAMERA_PRESETS, DENSITIES, generate_frames, preset, synthetic_tx_payload, write_corpus
+
+
+def main():
+    parser = ArgumentParser(description='Generate synthetic animated QR scan recordings')
+    parser.add_argument('output', help='directory to write the recordings to')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[5000], help='payload sizes in bytes')
+    parser.add_argument('--densities', nargs='+', choices=DENSITIES, default=list(DENSITIES))
+    parser.add_argument('--presets', nargs='+', choices=sorted(CAMERA_PRESETS), default=['clean'], help='camera effect presets')
+    parser.add_argument('--frame-size', type=int, nargs=2, metavar=('WIDTH', 'HEIGHT'), help='camera frame size')
+    parser.add_argument('--scale', type=float, help='QR code size relative to the shorter frame side')
+    parser.add_argument('--perspective', type=float, help='largest corner displacement relative to the QR code size')
+    parser.add_argument('--blur', type=float, help='gaussian blur radius in pixels')
+    parser.add_argument('--noise', type=float, help='sensor noise sigma')
+    parser.add_argument('--gamma', type=float)
+    parser.add_argument('--moire', type=float, help='depth of the moiré banding, 0 to 1')
+    parser.add_argument('--loops', type=float, default=2.0, help='times the part sequence is captured over')
+    parser.add_argument('--display-fps', type=float, default=5.0, help='UR parts shown per second')
+    parser.add_argument('--camera-fps', type=float, default=10.0, help='frames captured per second')
+    parser.add_argument('--max-frames', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    overrides = {
+        name: getattr(args, name)
+        for name in ('scale', 'perspective', 'blur', 'noise', 'gamma', 'moire')
+        if getattr(args, name) is not None
+    }
+    if args.frame_size:
+        overrides['frame_size'] = tuple(args.frame_size)
+    corpus = []
+    for size in args.sizes:
+        payload = synthetic_tx_payload(size, args.seed)
+        for density in args.densities:
+            for name in args.presets:
+                effects = preset(name, **overrides)
+                label = f'{size}-{density}-{name}'
+                frames = generate_frames(
+                    payload,
+                    density,
+                    effects,
+                    loops=args.loops,
+                    display_fps=args.display_fps,
+                    camera_fps=args.camera_fps,
+                    max_frames=args.max_frames,
+                    seed=args.seed)
+                files = write_corpus(path.join(args.output, label), frames, label)
+                corpus.append({'recording': path.join(args.output, label), 'payload_size': size, 'density': density, 'preset': name, 'files': len(files)})
+    print(dumps({'effects': overrides, 'corpus': corpus}, indent=4))
+
+
+if __name__ == '__main__':
+    main()
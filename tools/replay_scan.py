@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Replays recorded scan frames through DecodeQR and reports the scan as JSON:
+decoded UR parts per second, frames per completed UR, time to complete,
+per-stage latency percentiles and peak memory.
+
+Frames come from a scan recording (an `.npz` archive or a directory of them,
+written with the debug setting enabled) or a directory of images. Pass several
+sources to compare them; write the JSON to a file to compare runs across
+changes.
+"""
+from argparse import ArgumentParser
+from json import dumps
+
+from xmrsigner.helpers.scan.replay import ScanReplay, load_frames
+
+
+def main():
+    parser = ArgumentParser(description='Replay recorded scan frames through DecodeQR')
+    parser.add_argument('sources', nargs='+', help='.npz recording, directory of recordings or directory of images')
+    parser.add_argument('--realtime', action='store_true', help='replay at the original capture times, dropping frames the decoder cannot keep up with')
+    parser.add_argument('--live', action='store_true', help='decode through LiveQRScanner.scan_frame, as the scan screen does')
+    parser.add_argument('--fps', type=float, default=10, help='capture rate assumed for directories of images')
+    parser.add_argument('--workers', type=int, default=0, help='decode worker processes')
+    parser.add_argument('--max-frames', type=int, default=None)
+    parser.add_argument('--trace-memory', action='store_true', help='measure peak Python allocations (slows decoding)')
+    parser.add_argument('--output', help='write the JSON report to this file')
+    args = parser.parse_args()
+
+    runs = []
+    for source in args.sources:
+        frames = load_frames(source, args.fps)[:args.max_frames]
+        if not frames:
+            parser.error(f'no frames in {source}')
+        replay = ScanReplay(
+            frames,
+            realtime=args.realtime,
+            live=args.live,
+            trace_memory=args.trace_memory,
+            decode_workers=args.workers)
+        result = replay.run()
+        result['source'] = source
+        runs.append(result)
+    report = dumps({'runs': runs}, indent=4, default=str)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(report)
+    print(report)
+
+
+if __name__ == '__main__':
+    main()